@@ -1,5 +1,14 @@
 import frappe
 from frappe import _
+from frappe.utils import cint, get_datetime, now_datetime
+
+from qr_suite.utils.image_route import get_image_url_for_file
+
+# Tokens accepted per resolve_tokens call
+MAX_RESOLVE_TOKENS = 5000
+
+# generate_qr_code options that change the image but not what the link encodes
+RENDER_OPTIONS = ("qr_size", "error_correction", "image_format", "include_label", "label_text")
 
 @frappe.whitelist()
 def get_enabled_doctypes():
@@ -71,6 +80,7 @@ def generate_qr_code(doctype, docname, qr_type="Document QR", qr_template=None,
             frappe.throw(_("You don't have permission to generate QR codes for {0}. Required role: QR User or QR Manager").format(doctype))
         
         # Create QR Link document
+        existing = None
         qr_link = frappe.new_doc("QR Link")
         qr_link.target_doctype = doctype
         qr_link.target_name = docname
@@ -78,10 +88,12 @@ def generate_qr_code(doctype, docname, qr_type="Document QR", qr_template=None,
         qr_link.qr_template = qr_template
         
         # Handle template settings if provided
+        template = None
         if qr_template:
-            template = frappe.get_cached_doc("QR Template", qr_template)
+            from qr_suite.utils.template_options import get_template_options
+            template = get_template_options(qr_template)
             # Apply template's url_mode if not overridden
-            if qr_type == "Document QR" and hasattr(template, 'url_mode') and 'url_mode' not in kwargs:
+            if template and qr_type == "Document QR" and 'url_mode' not in kwargs:
                 kwargs['url_mode'] = template.url_mode
         
         # Handle Document QR specific fields
@@ -107,8 +119,8 @@ def generate_qr_code(doctype, docname, qr_type="Document QR", qr_template=None,
                 qr_link.qr_content = str(kwargs.get('custom_value'))
             elif kwargs.get('value_field'):
                 # Get value from specified field
-                doc = frappe.get_doc(doctype, docname)
-                field_value = doc.get(kwargs.get('value_field'))
+                from qr_suite.utils.field_values import get_field_value
+                field_value = get_field_value(doctype, docname, kwargs.get('value_field'))
                 if field_value:
                     qr_link.qr_content = str(field_value)
                 else:
@@ -117,19 +129,47 @@ def generate_qr_code(doctype, docname, qr_type="Document QR", qr_template=None,
                 # Default to document name
                 qr_link.qr_content = docname
         
-        # Save with elevated permissions
-        qr_link.insert(ignore_permissions=True)
+        # Repeat requests with identical options reuse the existing active link
+        from qr_suite.qr_suite.doctype.qr_link.qr_link import make_idempotency_key
+        reuse = not cint(kwargs.get('force_new'))
+        if reuse:
+            existing = get_active_qr_link(make_idempotency_key(qr_link))
+            # Expiry is not part of the key: an active link with another expiry does not
+            # satisfy a request for a specific one, so a separate link without a key is made
+            if existing and qr_link.expires_on and get_datetime(qr_link.expires_on) != existing.expires_on:
+                existing = None
+                reuse = False
+        
+        if reuse:
+            # Size, error correction, format and label are not part of the key, so a
+            # request that sets any of them redraws the existing link's image
+            render_options = [k for k in RENDER_OPTIONS if kwargs.get(k)]
+            if existing and existing.qr_code_image and not render_options:
+                return {
+                    "success": True,
+                    "qr_link": existing.name,
+                    "file_url": existing.qr_code_image,
+                    "image_url": get_image_url_for_file(existing.qr_code_image),
+                    "status": existing.status,
+                    "existing": True,
+                    "message": _("QR Code already exists")
+                }
+            
+            qr_link = get_or_insert_qr_link(qr_link, existing)
+        else:
+            # Save with elevated permissions
+            qr_link.insert(ignore_permissions=True)
         frappe.db.commit()
         
         # Generate QR image with options
         try:
             from qr_suite.utils.qr_code_generator import generate_qr_image
             
-            # Pass all relevant options to generator
+            # Pass all relevant options to generator; the template fills in anything not given
             generator_kwargs = {
-                'qr_size': kwargs.get('qr_size', 'Medium'),
-                'error_correction': kwargs.get('error_correction', 'M'),
-                'image_format': kwargs.get('image_format', 'PNG')
+                'qr_size': kwargs.get('qr_size', template.qr_size if template else 'Medium'),
+                'error_correction': kwargs.get('error_correction', template.error_correction if template else 'M'),
+                'image_format': kwargs.get('image_format', template.image_format if template else 'PNG')
             }
             
             # Pass label options to generator
@@ -156,7 +196,9 @@ def generate_qr_code(doctype, docname, qr_type="Document QR", qr_template=None,
             "success": True,
             "qr_link": qr_link.name,
             "file_url": qr_link.qr_code_image,
+            "image_url": get_image_url_for_file(qr_link.qr_code_image),
             "status": qr_link.status,
+            "existing": bool(existing),
             "message": _("QR Code generated successfully")
         }
         
@@ -167,6 +209,47 @@ def generate_qr_code(doctype, docname, qr_type="Document QR", qr_template=None,
             "message": str(e)
         }
 
+def get_active_qr_link(idempotency_key):
+    """Look up the active QR Link for an idempotency key (unique index)"""
+    return frappe.db.get_value("QR Link",
+        {"idempotency_key": idempotency_key, "status": "Active"},
+        ["name", "qr_code_image", "status", "expires_on"],
+        as_dict=True
+    )
+
+def get_or_insert_qr_link(qr_link, existing=None):
+    """
+    Return the active QR Link for qr_link's idempotency key, inserting qr_link if there is none.
+    A short Redis lock serialises concurrent requests for the same key; the unique index
+    on idempotency_key is the backstop if the lock is lost.
+    """
+    from qr_suite.qr_suite.doctype.qr_link.qr_link import make_idempotency_key
+    
+    if existing:
+        return frappe.get_doc("QR Link", existing.name)
+    
+    key = make_idempotency_key(qr_link)
+    qr_link.flags.idempotent = True
+    lock_key = frappe.cache().make_key(f"qr_suite_link_lock:{key}")
+    with frappe.cache().lock(lock_key, timeout=30, blocking_timeout=10):
+        existing = get_active_qr_link(key)
+        if existing:
+            return frappe.get_doc("QR Link", existing.name)
+        
+        # Only the failed insert is undone, not what the caller already wrote
+        frappe.db.savepoint("qr_link_get_or_insert")
+        try:
+            # Save with elevated permissions
+            qr_link.insert(ignore_permissions=True)
+        except frappe.DuplicateEntryError:
+            frappe.db.rollback(save_point="qr_link_get_or_insert")
+            existing = get_active_qr_link(key)
+            if not existing:
+                raise
+            return frappe.get_doc("QR Link", existing.name)
+    
+    return qr_link
+
 def get_default_action(doctype):
     """Get default action for a doctype from settings or fallback"""
     try:
@@ -202,27 +285,202 @@ def get_default_action(doctype):
 def get_doctype_fields(doctype):
     """Get fields suitable for QR encoding from a doctype"""
     try:
-        meta = frappe.get_meta(doctype)
-        fields = []
-        
-        # Get fields that make sense to encode in QR
-        suitable_fieldtypes = ['Data', 'Link', 'Select', 'Int', 'Float', 'Currency', 'Barcode']
-        
-        for field in meta.fields:
-            if field.fieldtype in suitable_fieldtypes and not field.hidden:
-                fields.append({
-                    'label': field.label,
-                    'fieldname': field.fieldname,
-                    'fieldtype': field.fieldtype
-                })
-        
-        return fields
+        from qr_suite.utils.field_catalogue import get_doctype_fields as get_catalogue_fields
+        return get_catalogue_fields(doctype)
     except Exception as e:
         frappe.log_error(f"Error getting fields: {str(e)}")
         return []
 
+@frappe.whitelist()
+def get_field_catalogue(doctypes=None):
+    """Get QR-encodable fields for several doctypes in one call (default: all enabled)"""
+    try:
+        from qr_suite.utils.field_catalogue import get_field_catalogue as get_catalogue
+        if isinstance(doctypes, str):
+            doctypes = frappe.parse_json(doctypes)
+        return get_catalogue(doctypes)
+    except Exception as e:
+        frappe.log_error(f"Error getting field catalogue: {e!s}")
+        return {}
+
 @frappe.whitelist()
 def check_qr_permission(doctype):
     """Check if current user can generate QR for doctype"""
     from qr_suite.qr_suite.doctype.qr_settings.qr_settings import can_generate_qr
     return can_generate_qr(doctype)
+
+@frappe.whitelist()
+def export_scan_logs(from_date, to_date, qr_link=None, target_doctype=None, format="csv", gzip=0):
+    """
+    Export QR Scan Logs for a date range as CSV or JSONL (optionally gzipped)
+    The export runs in the background and the user is sent a link to the private file.
+    """
+    from qr_suite.utils.scan_export import enqueue_scan_export
+    
+    frappe.only_for(["System Manager", "QR Manager"])
+    
+    if format not in ("csv", "jsonl"):
+        frappe.throw(_("Format must be csv or jsonl"))
+    
+    return enqueue_scan_export(from_date, to_date, qr_link=qr_link, target_doctype=target_doctype,
+        fmt=format, compress=cint(gzip))
+
+@frappe.whitelist()
+def get_hot_qr_links(window="5m", limit=20):
+    """Most scanned QR Links in the last 5m / 1h / 24h (approximate counts)"""
+    from qr_suite.utils.hot_links import WINDOWS, get_hot_links
+    
+    frappe.only_for(["System Manager", "QR Manager"])
+    
+    if window not in WINDOWS:
+        frappe.throw(_("Window must be one of {0}").format(", ".join(WINDOWS)))
+    
+    hot = get_hot_links(window, min(cint(limit) or 20, 200))
+    if not hot:
+        return []
+    
+    details = {
+        d.name: d for d in frappe.get_all("QR Link",
+            filters={"name": ["in", [name for name, _count in hot]]},
+            fields=["name", "target_doctype", "target_name", "status", "scan_count"]
+        )
+    }
+    
+    return [
+        {
+            "qr_link": name,
+            "scans": count,
+            "target_doctype": details.get(name, {}).get("target_doctype"),
+            "target_name": details.get(name, {}).get("target_name"),
+            "status": details.get(name, {}).get("status"),
+            "total_scans": details.get(name, {}).get("scan_count")
+        }
+        for name, count in hot
+    ]
+
+@frappe.whitelist()
+def collect_qr_garbage(action="Report Only", dry_run=1, background=0):
+    """
+    Find QR Links whose target document was deleted and QR images no link uses
+    With dry_run (the default) only the report of reclaimable rows and bytes is returned.
+    """
+    from qr_suite.utils.orphan_gc import ORPHAN_ACTIONS, collect_garbage
+    
+    frappe.only_for(["System Manager", "QR Manager"])
+    
+    if action not in ORPHAN_ACTIONS:
+        frappe.throw(_("Action must be one of {0}").format(", ".join(ORPHAN_ACTIONS)))
+    
+    if cint(background):
+        frappe.enqueue(
+            "qr_suite.utils.orphan_gc.run_garbage_collection",
+            queue="long",
+            job_id="qr_suite_orphan_gc",
+            deduplicate=True,
+            action=action,
+            dry_run=cint(dry_run),
+            notify_user=frappe.session.user
+        )
+        return {"queued": True}
+    
+    return collect_garbage(action, cint(dry_run))
+
+@frappe.whitelist()
+def bulk_revoke_qr_links(filters):
+    """Revoke every Active QR Link matching filters in a background job"""
+    return _enqueue_bulk_operation("Revoke", filters)
+
+@frappe.whitelist()
+def bulk_reissue_qr_links(filters):
+    """Revoke the matching Active QR Links and create new links (new tokens and images) in their place"""
+    return _enqueue_bulk_operation("Reissue", filters)
+
+@frappe.whitelist()
+def bulk_rotate_qr_tokens(filters):
+    """Give the matching token-mode QR Links new tokens, keeping the links themselves"""
+    return _enqueue_bulk_operation("Rotate Tokens", filters)
+
+def _enqueue_bulk_operation(operation, filters):
+    from qr_suite.utils.bulk_operations import enqueue_bulk_operation
+    
+    frappe.only_for(["System Manager", "QR Manager"])
+    return enqueue_bulk_operation(operation, filters)
+
+@frappe.whitelist(methods=["POST"])
+def ingest_scans(batch):
+    """
+    Upload scans recorded offline by handheld scanners
+    batch: JSON list of {event_id, token, timestamp, user, device}, optionally gzip-compressed
+    and base64-encoded. Returns a status per record (accepted, duplicate, unknown_token,
+    revoked, inactive, expired or invalid); re-sending a batch is safe.
+    """
+    from qr_suite.utils.scan_ingest import ingest_scans as ingest
+    
+    frappe.only_for(["System Manager", "QR Manager", "QR User"])
+    return ingest(batch)
+
+@frappe.whitelist()
+def resolve_tokens(tokens):
+    """
+    Resolve scanned QR tokens to their targets
+    Returns one entry per token, in order, with state valid / expired / revoked / disabled /
+    not_found / not_permitted. Status and expiry rules are the same as the /qr page;
+    targets are only returned for DocTypes the user can read.
+    """
+    from qr_suite.utils.resolution_cache import check_link, get_resolutions
+    
+    if frappe.session.user == "Guest":
+        frappe.throw(_("Login required"), frappe.PermissionError)
+    
+    tokens = frappe.parse_json(tokens) if isinstance(tokens, str) else tokens
+    if not isinstance(tokens, list):
+        frappe.throw(_("Tokens must be a list"))
+    if len(tokens) > MAX_RESOLVE_TOKENS:
+        frappe.throw(_("At most {0} tokens can be resolved per call").format(MAX_RESOLVE_TOKENS))
+    
+    resolutions = get_resolutions(tokens)
+    now = now_datetime()
+    readable = {}
+    results = []
+    for token in tokens:
+        link = resolutions.get(token)
+        if not link:
+            results.append({"token": token, "state": "not_found"})
+            continue
+        
+        doctype = link.target_doctype
+        if doctype not in readable:
+            readable[doctype] = bool(doctype) and frappe.has_permission(doctype, "read")
+        if not readable[doctype]:
+            results.append({"token": token, "state": "not_permitted"})
+            continue
+        
+        state, message = check_link(link, now)
+        results.append({
+            "token": token,
+            "state": state,
+            "message": message,
+            "qr_link": link.name,
+            "status": link.status,
+            "target_doctype": doctype,
+            "target_name": link.target_name,
+            "action": link.action
+        })
+    
+    return results
+
+@frappe.whitelist()
+def download_qr_label_sheet(qr_links, columns=3, qr_size="Medium"):
+    """PNG sheet of labelled QR codes for the given QR Links, drawn from cached matrices"""
+    from qr_suite.utils.qr_code_generator import render_label_sheet
+    
+    qr_links = frappe.parse_json(qr_links) if isinstance(qr_links, str) else qr_links
+    docs = []
+    for name in qr_links or []:
+        doc = frappe.get_doc("QR Link", name)
+        doc.check_permission("read")
+        docs.append(doc)
+    
+    frappe.local.response.filename = "qr-label-sheet.png"
+    frappe.local.response.filecontent = render_label_sheet(docs, cint(columns) or 3, qr_size)
+    frappe.local.response.type = "download"
@@ -102,10 +102,53 @@ has_permission = {
     "QR Settings": "qr_suite.qr_suite.doctype.qr_settings.qr_settings.has_permission"
 }
 
+# Document events
+doc_events = {
+    "*": {
+        "after_insert": "qr_suite.utils.auto_generate.on_document_event",
+        "on_submit": "qr_suite.utils.auto_generate.on_document_event",
+        "on_update": "qr_suite.utils.image_refresh.on_document_update"
+    },
+    "DocType": {
+        "on_update": "qr_suite.utils.field_catalogue.on_meta_change",
+        "on_trash": "qr_suite.utils.field_catalogue.on_meta_change"
+    },
+    "Custom Field": {
+        "on_update": "qr_suite.utils.field_catalogue.on_meta_change",
+        "on_trash": "qr_suite.utils.field_catalogue.on_meta_change"
+    },
+    "Property Setter": {
+        "on_update": "qr_suite.utils.field_catalogue.on_meta_change",
+        "on_trash": "qr_suite.utils.field_catalogue.on_meta_change"
+    }
+}
+
 # Scheduled tasks
 scheduler_events = {
     "daily": [
-        "qr_suite.tasks.cleanup_expired_qr_codes"
+        "qr_suite.utils.scan_archive.archive_scan_logs"
+    ],
+    "weekly": [
+        "qr_suite.utils.expiry_scheduler.rebuild_expiry_schedule",
+        "qr_suite.utils.orphan_gc.collect_garbage"
+    ],
+    "cron": {
+        "* * * * *": [
+            "qr_suite.utils.expiry_scheduler.process_due_expiries",
+            "qr_suite.utils.auto_generate.process_auto_generate_queue",
+            "qr_suite.utils.image_refresh.process_image_refreshes"
+        ],
+        "*/5 * * * *": [
+            "qr_suite.qr_suite.doctype.qr_scan_rollup.qr_scan_rollup.update_scan_rollups"
+        ]
+    }
+}
+
+# Jinja methods for print formats
+jinja = {
+    "methods": [
+        "qr_suite.utils.inline_qr.qr_svg",
+        "qr_suite.utils.inline_qr.qr_data_uri"
     ]
 }
 
@@ -114,6 +157,9 @@ website_route_rules = [
     {"from_route": "/qr/<path:token>", "to_route": "qr_suite.www.qr.index"}
 ]
 
+# Content-addressed QR images: /qr-image/<hash>.png
+page_renderer = ["qr_suite.utils.image_route.QRImageRenderer"]
+
 # App configuration
 app_color = "blue"
 app_email = "brighton@example.com"
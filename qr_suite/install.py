@@ -15,6 +15,9 @@ def after_migrate():
     ensure_qr_settings_exists()
     inject_qr_js_dynamically()
     frappe.clear_cache()
+    build_qr_field_catalogue()
+    rebuild_qr_expiry_schedule()
+    add_qr_image_index()
 
 def inject_qr_js_dynamically():
     """Inject QR JS for all enabled doctypes"""
@@ -50,6 +53,32 @@ frappe.ready(function() {
     except Exception as e:
         print(f"QR Suite: Could not inject JS dynamically: {e}")
 
+def build_qr_field_catalogue():
+    """Warm the Value QR field catalogue for enabled doctypes"""
+    try:
+        from qr_suite.utils.field_catalogue import build_field_catalogue
+        rebuilt = build_field_catalogue()
+        print(f"QR Suite: Field catalogue rebuilt for {rebuilt} doctypes")
+    except Exception as e:
+        print(f"QR Suite: Could not build field catalogue: {e}")
+
+def rebuild_qr_expiry_schedule():
+    """Reload the Redis expiry schedule from QR Link"""
+    try:
+        from qr_suite.utils.expiry_scheduler import rebuild_expiry_schedule
+        rebuild_expiry_schedule()
+        print("QR Suite: Expiry schedule rebuilt")
+    except Exception as e:
+        print(f"QR Suite: Could not rebuild expiry schedule: {e}")
+
+def add_qr_image_index():
+    """Index File.content_hash for the /qr-image route"""
+    try:
+        from qr_suite.utils.image_route import ensure_content_hash_index
+        ensure_content_hash_index()
+    except Exception as e:
+        print(f"QR Suite: Could not add File content_hash index: {e}")
+
 def create_qr_roles():
     """Create QR Suite specific roles"""
     roles = [
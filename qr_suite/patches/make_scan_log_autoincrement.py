@@ -0,0 +1,50 @@
+import frappe
+
+
+def execute():
+    """
+    Convert QR Scan Log to autoincrement ids
+    Logs written before the DocType set autoname have hash names in a varchar column.
+    They are renumbered in scan order, the column becomes bigint and the id sequence
+    starts after the last log. This runs before model sync, because the DocType
+    refuses to switch to autoincrement while the table has data.
+
+    The scan rollups are rebuilt from the renumbered logs, since their watermark was
+    kept against the old names. Logs already moved to the scan archive are not in the
+    table any more and drop out of the rebuilt rollups.
+    """
+    if not frappe.db.table_exists("QR Scan Log"):
+        return
+
+    column_type = frappe.db.sql("""
+        SELECT data_type FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = 'tabQR Scan Log' AND column_name = 'name'
+    """)[0][0]
+
+    if column_type != "bigint":
+        frappe.db.sql("ALTER TABLE `tabQR Scan Log` ADD COLUMN `_autoincrement_id` bigint")
+        frappe.db.sql("SET @qr_scan_log_id := 0")
+        frappe.db.sql("""
+            UPDATE `tabQR Scan Log`
+            SET `_autoincrement_id` = (@qr_scan_log_id := @qr_scan_log_id + 1)
+            ORDER BY creation, scan_timestamp, name
+        """)
+        frappe.db.sql("""
+            ALTER TABLE `tabQR Scan Log`
+                DROP PRIMARY KEY,
+                DROP COLUMN name,
+                CHANGE `_autoincrement_id` name bigint NOT NULL FIRST,
+                ADD PRIMARY KEY (name)
+        """)
+
+    last_id = frappe.db.sql("SELECT COALESCE(MAX(name), 0) FROM `tabQR Scan Log`")[0][0]
+    frappe.db.sql(f"CREATE SEQUENCE IF NOT EXISTS `qr_scan_log_id_seq` START WITH {int(last_id) + 1}")
+    frappe.db.set_value("DocType", "QR Scan Log", {"autoname": "autoincrement", "naming_rule": "Autoincrement"},
+        update_modified=False)
+
+    if column_type != "bigint" and frappe.db.table_exists("QR Scan Rollup"):
+        from qr_suite.qr_suite.doctype.qr_scan_rollup.qr_scan_rollup import update_scan_rollups
+
+        frappe.db.delete("QR Scan Rollup")
+        frappe.db.set_single_value("QR Settings", "scan_rollup_watermark", 0)
+        update_scan_rollups()
@@ -0,0 +1,11 @@
+import frappe
+
+from qr_suite.utils.tokens import DEFAULT_ALPHABET, DEFAULT_LENGTH
+
+
+def execute():
+    """Store the default token format on QR Settings saved before it was configurable"""
+    if not frappe.db.get_single_value("QR Settings", "token_alphabet"):
+        frappe.db.set_single_value("QR Settings", "token_alphabet", DEFAULT_ALPHABET)
+    if not frappe.db.get_single_value("QR Settings", "token_length"):
+        frappe.db.set_single_value("QR Settings", "token_length", DEFAULT_LENGTH)
@@ -196,24 +196,7 @@ function show_qr_dialog(frm) {
                 label: __('Field'),
                 fieldname: 'value_field',
                 fieldtype: 'Select',
-                hidden: 1,
-                get_query: function() {
-                    // Get fields from current doctype
-                    frappe.call({
-                        method: 'qr_suite.api.get_doctype_fields',
-                        args: { doctype: frm.doctype },
-                        callback: function(r) {
-                            if (r.message) {
-                                let options = [''];
-                                r.message.forEach(field => {
-                                    options.push(field.fieldname);
-                                });
-                                d.fields_dict.value_field.df.options = options.join('\n');
-                                d.refresh();
-                            }
-                        }
-                    });
-                }
+                hidden: 1
             },
             {
                 label: __('Custom Value'),
@@ -365,27 +348,43 @@ function show_qr_dialog(frm) {
         secondary_action_label: __('Cancel')
     });
     
-    // Load fields if Value QR is selected
-    if (d.get_value('qr_type') === 'Value QR') {
-        frappe.call({
-            method: 'qr_suite.api.get_doctype_fields',
-            args: { doctype: frm.doctype },
-            callback: function(r) {
-                if (r.message) {
-                    let options = [''];
-                    r.message.forEach(field => {
-                        options.push(field.fieldname);
-                    });
-                    d.fields_dict.value_field.df.options = options.join('\n');
-                    d.refresh();
-                }
-            }
+    // Populate the Field options from the cached field catalogue
+    load_value_fields(frm.doctype).then(fields => {
+        let options = [''];
+        fields.forEach(field => {
+            options.push(field.fieldname);
         });
-    }
+        d.fields_dict.value_field.df.options = options.join('\n');
+        d.refresh();
+    });
     
     d.show();
 }
 
+// Fetch the field catalogue for all enabled doctypes once per page load
+function load_value_fields(doctype) {
+    if (!frappe.qr_suite_field_catalogue) {
+        frappe.qr_suite_field_catalogue = frappe.call({
+            method: 'qr_suite.api.get_field_catalogue'
+        }).then(r => r.message || {});
+    }
+    
+    return frappe.qr_suite_field_catalogue.then(catalogue => {
+        if (catalogue[doctype]) {
+            return catalogue[doctype];
+        }
+        
+        // Doctype not in the bulk catalogue (e.g. enabled after page load)
+        return frappe.call({
+            method: 'qr_suite.api.get_doctype_fields',
+            args: { doctype: doctype }
+        }).then(r => {
+            catalogue[doctype] = r.message || [];
+            return catalogue[doctype];
+        });
+    });
+}
+
 // Save current settings as a new template
 function save_as_template(frm, values) {
     let template_data = {
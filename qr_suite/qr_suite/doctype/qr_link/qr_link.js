@@ -88,6 +88,15 @@ frappe.ui.form.on('QR Link', {
                 `<span class="indicator ${color}">${frm.doc.status} QR Code</span>`
             );
         }
+        
+        // Approximate unique scanners (HyperLogLog)
+        let unique_counts = frm.doc.__onload && frm.doc.__onload.unique_counts;
+        if (unique_counts && frm.doc.scan_count) {
+            frm.dashboard.add_comment(
+                __('~{0} unique scanners, ~{1} unique IPs', [unique_counts.unique_users, unique_counts.unique_ips]),
+                'blue', true
+            );
+        }
     },
     
     qr_template: function(frm) {
@@ -1,8 +1,16 @@
 import frappe
-import secrets
+import hashlib
 from frappe.model.document import Document
 from frappe.utils import now, add_days, get_url
 
+from qr_suite.utils.expiry_scheduler import sync_expiry_schedule, unschedule_expiry
+from qr_suite.utils.field_values import get_field_value
+from qr_suite.utils.hyperloglog import get_link_unique_counts, record_unique_scan
+from qr_suite.utils.image_refresh import clear_watched_fields
+from qr_suite.utils.resolution_cache import invalidate_tokens
+from qr_suite.utils.template_options import get_template_options
+from qr_suite.utils.tokens import mint_token
+
 class QRLink(Document):
     def before_insert(self):
         """Set defaults before inserting"""
@@ -15,7 +23,8 @@ class QRLink(Document):
                 self.url_mode = "token"
             
             if self.url_mode == "token":
-                self.token = secrets.token_urlsafe(32)
+                # Bulk callers pre-mint tokens with mint_tokens
+                self.token = self.token or mint_token()
                 self.qr_url = f"{get_url()}/qr?token={self.token}"
             else:  # direct mode
                 # Build direct URL
@@ -36,26 +45,21 @@ class QRLink(Document):
             
             # Set expiry if specified in template but not overridden
             if not self.expires_on and self.qr_template:
-                try:
-                    template = frappe.get_cached_doc("QR Template", self.qr_template)
-                    if hasattr(template, 'token_expiry_days') and template.token_expiry_days and template.token_expiry_days > 0:
-                        self.expires_on = add_days(now(), template.token_expiry_days)
-                except:
-                    pass
+                template = get_template_options(self.qr_template)
+                if template and template.token_expiry_days > 0:
+                    self.expires_on = add_days(now(), template.token_expiry_days)
         
         elif self.qr_type == "Value QR":
             # For Value QR, ensure qr_content is set
             if not self.qr_content:
                 # Try to get from template
-                if self.qr_template:
+                template = get_template_options(self.qr_template)
+                if template and template.value_field:
                     try:
-                        template = frappe.get_cached_doc("QR Template", self.qr_template)
-                        if hasattr(template, 'value_field') and template.value_field:
-                            # Get value from the specified field
-                            doc = frappe.get_doc(self.target_doctype, self.target_name)
-                            field_value = doc.get(template.value_field)
-                            if field_value:
-                                self.qr_content = str(field_value)
+                        # Get value from the specified field
+                        field_value = get_field_value(self.target_doctype, self.target_name, template.value_field)
+                        if field_value:
+                            self.qr_content = str(field_value)
                     except:
                         pass
                 
@@ -67,6 +71,13 @@ class QRLink(Document):
         if not self.status:
             self.status = "Active"
     
+    def onload(self):
+        """Approximate unique scanner counts for the form"""
+        try:
+            self.set_onload("unique_counts", get_link_unique_counts(self.name))
+        except Exception:
+            pass
+    
     def get_action_route(self):
         """Get the route based on action"""
         # Map actions to routes
@@ -106,6 +117,39 @@ class QRLink(Document):
         # Set default label text if not provided
         if self.include_label and not self.label_text:
             self.label_text = self.target_name
+        
+        # Only active links take part in get-or-create
+        if self.status != "Active":
+            self.idempotency_key = None
+        elif self.flags.idempotent or self.idempotency_key:
+            self.set_idempotency_key()
+    
+    def set_idempotency_key(self):
+        """
+        The one place the get-or-create key is set, once all defaults are in. New links
+        opt in with flags.idempotent (the unique index rejects a duplicate); an edit that
+        makes a link encode what another active link already does takes it out of reuse.
+        """
+        key = make_idempotency_key(self)
+        if key != self.idempotency_key and not self.is_new():
+            if frappe.db.exists("QR Link", {"idempotency_key": key, "status": "Active", "name": ["!=", self.name]}):
+                key = None
+        self.idempotency_key = key
+    
+    def after_insert(self):
+        """A template new to this DocType may add a field to watch for image refreshes"""
+        if self.qr_type == "Value QR" and self.qr_template:
+            clear_watched_fields(self.target_doctype)
+    
+    def on_update(self):
+        """Drop cached token resolutions so the scan path sees the change"""
+        previous = self.get_doc_before_save()
+        invalidate_tokens([self.token, previous and previous.token])
+        sync_expiry_schedule(self)
+    
+    def on_trash(self):
+        invalidate_tokens([self.token])
+        unschedule_expiry([self.name])
     
     @frappe.whitelist()
     def generate_qr_code(self):
@@ -130,6 +174,7 @@ class QRLink(Document):
             
         if self.expires_on and self.expires_on < now():
             self.status = "Expired"
+            self.idempotency_key = None
             self.save()
             return False
             
@@ -162,6 +207,11 @@ class QRLink(Document):
             "target_name": self.target_name
         }).insert(ignore_permissions=True)
         
+        try:
+            record_unique_scan(self.name, self.target_doctype, self.action, frappe.session.user, self.last_scan_ip)
+        except Exception:
+            frappe.log_error(f"Unique scan sketch update failed for {self.name}", "QR Link")
+        
         return {"status": "success", "message": "Scan recorded"}
     
     @frappe.whitelist()
@@ -171,6 +221,7 @@ class QRLink(Document):
             frappe.throw("This QR code is already revoked")
         
         self.status = "Revoked"
+        self.idempotency_key = None
         self.save()
         
         frappe.msgprint("QR Code has been revoked", indicator="red")
@@ -180,3 +231,30 @@ class QRLink(Document):
     def generate_qr_image(self):
         """Generate QR code image (alias for generate_qr_code)"""
         return self.generate_qr_code()
+
+def make_idempotency_key(qr_link):
+    """
+    Hash of the options that determine what a QR Link encodes
+    Expiry is not part of it: a template fills expires_on in only at insert, and callers
+    that ask for a specific expiry decide themselves whether an existing link will do.
+    """
+    parts = [
+        qr_link.target_doctype,
+        qr_link.target_name,
+        qr_link.qr_type,
+        qr_link.qr_template
+    ]
+    if qr_link.qr_type == "Document QR":
+        # Same defaults as validate, so unsaved and saved links hash alike
+        parts += [qr_link.action or "view", qr_link.url_mode or "token",
+            qr_link.get("custom_url_prefix"), qr_link.get("extra_params")]
+    else:
+        parts += [qr_link.qr_content]
+    
+    return hashlib.sha256("\x1f".join(str(p or "") for p in parts).encode()).hexdigest()
+
+def on_doctype_update():
+    """Indexes for keyset pagination and summaries in QR Usage Report"""
+    frappe.db.add_index("QR Link", ["scan_count", "created_on"])
+    frappe.db.add_index("QR Link", ["target_doctype", "status"])
+    frappe.db.add_index("QR Link", ["status", "expires_on"])
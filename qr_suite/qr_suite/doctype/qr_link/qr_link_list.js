@@ -0,0 +1,33 @@
+frappe.listview_settings['QR Link'] = {
+    onload: function(listview) {
+        // Bulk operations apply to every Active link matching the current filters
+        const operations = [
+            [__('Revoke Filtered Links'), 'qr_suite.api.bulk_revoke_qr_links'],
+            [__('Reissue Filtered Links'), 'qr_suite.api.bulk_reissue_qr_links'],
+            [__('Rotate Tokens of Filtered Links'), 'qr_suite.api.bulk_rotate_qr_tokens']
+        ];
+        
+        if (!frappe.user.has_role(['System Manager', 'QR Manager'])) {
+            return;
+        }
+        
+        operations.forEach(([label, method]) => {
+            listview.page.add_menu_item(label, function() {
+                frappe.confirm(
+                    __('{0} for all Active QR Links matching the current filters? This cannot be undone.', [label]),
+                    function() {
+                        frappe.call({
+                            method: method,
+                            args: { filters: listview.get_filters_for_args() },
+                            callback: function(r) {
+                                if (r.message) {
+                                    frappe.show_alert(__('{0} queued for {1} QR Links', [label, r.message.total]));
+                                }
+                            }
+                        });
+                    }
+                );
+            });
+        });
+    }
+};
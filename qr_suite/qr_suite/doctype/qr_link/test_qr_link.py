@@ -1,9 +1,84 @@
 # Copyright (c) 2025, Brighton and Contributors
 # See license.txt
 
-# import frappe
+import frappe
 from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from qr_suite.api import generate_qr_code, get_or_insert_qr_link
+from qr_suite.qr_suite.doctype.qr_link.qr_link import make_idempotency_key
 
 
 class TestQRLink(FrappeTestCase):
-	pass
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.todo = frappe.get_doc({"doctype": "ToDo", "description": "QR Link test"}).insert()
+
+    def tearDown(self):
+        frappe.db.delete("QR Link", {"target_doctype": "ToDo", "target_name": self.todo.name})
+        self.todo.delete()
+        frappe.db.commit()
+
+    def new_link(self, **kwargs):
+        qr_link = frappe.new_doc("QR Link")
+        qr_link.update({
+            "qr_type": "Document QR",
+            "target_doctype": "ToDo",
+            "target_name": self.todo.name,
+            "action": "view",
+            "url_mode": "token",
+            **kwargs
+        })
+        return qr_link
+
+    def test_get_or_insert_reuses_active_link(self):
+        first = get_or_insert_qr_link(self.new_link())
+        second = get_or_insert_qr_link(self.new_link())
+
+        self.assertEqual(first.name, second.name)
+        self.assertEqual(first.idempotency_key, make_idempotency_key(self.new_link()))
+
+    def test_key_ignores_defaults_and_expiry(self):
+        plain = self.new_link(action=None, url_mode=None)
+        expiring = self.new_link(expires_on=add_days(now_datetime(), 7))
+
+        self.assertEqual(make_idempotency_key(plain), make_idempotency_key(expiring))
+
+    def test_link_without_opt_in_has_no_key(self):
+        qr_link = self.new_link().insert(ignore_permissions=True)
+
+        self.assertFalse(qr_link.idempotency_key)
+
+    def test_revoked_link_is_not_reused(self):
+        first = get_or_insert_qr_link(self.new_link())
+        first.revoke()
+        second = get_or_insert_qr_link(self.new_link())
+
+        self.assertNotEqual(first.name, second.name)
+        self.assertFalse(frappe.db.get_value("QR Link", first.name, "idempotency_key"))
+
+    def test_api_after_reissue_returns_reissued_link(self):
+        from qr_suite.utils.bulk_operations import run_bulk_operation
+
+        created = generate_qr_code("ToDo", self.todo.name, action="view")
+        run_bulk_operation("Reissue", {"name": created["qr_link"]})
+        reissued = frappe.db.get_value("QR Link",
+            {"target_doctype": "ToDo", "target_name": self.todo.name, "status": "Active"}, "name")
+
+        result = generate_qr_code("ToDo", self.todo.name, action="view")
+
+        self.assertTrue(result["success"])
+        self.assertNotEqual(reissued, created["qr_link"])
+        self.assertEqual(result["qr_link"], reissued)
+        self.assertTrue(result["existing"])
+
+    def test_api_with_other_expiry_creates_new_link(self):
+        created = generate_qr_code("ToDo", self.todo.name, action="view")
+        expires_on = add_days(now_datetime(), 3).replace(microsecond=0)
+
+        result = generate_qr_code("ToDo", self.todo.name, action="view", expires_on=expires_on)
+
+        self.assertTrue(result["success"])
+        self.assertNotEqual(result["qr_link"], created["qr_link"])
+        self.assertFalse(result["existing"])
+        self.assertFalse(frappe.db.get_value("QR Link", result["qr_link"], "idempotency_key"))
@@ -8,3 +8,7 @@ class QRScanLog(Document):
             self.scan_timestamp = frappe.utils.now()
         if not self.scanned_by:
             self.scanned_by = frappe.session.user
+
+def on_doctype_update():
+    """Index for retention sweeps and date-range reads"""
+    frappe.db.add_index("QR Scan Log", ["scan_timestamp"])
@@ -0,0 +1,82 @@
+# Copyright (c) 2026, Brighton and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, cint, now_datetime
+
+from qr_suite.qr_suite.doctype.qr_scan_rollup.qr_scan_rollup import SETTLE_SECONDS, update_scan_rollups
+
+SCAN_TIMESTAMP = "2026-01-05 10:15:00"
+
+
+class TestQRScanRollup(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.qr_link = frappe.get_doc({
+            "doctype": "QR Link",
+            "qr_type": "Value QR",
+            "target_doctype": "User",
+            "target_name": "Administrator",
+            "qr_content": "rollup test"
+        }).insert(ignore_permissions=True)
+
+    def tearDown(self):
+        frappe.db.delete("QR Scan Rollup", {"qr_link": self.qr_link.name})
+        frappe.db.delete("QR Scan Log", {"qr_link": self.qr_link.name})
+        frappe.db.delete("QR Link", self.qr_link.name)
+        frappe.db.commit()
+
+    def add_scans(self, count, settled=True):
+        names = []
+        for _i in range(count):
+            log = frappe.get_doc({
+                "doctype": "QR Scan Log",
+                "qr_link": self.qr_link.name,
+                "scan_timestamp": SCAN_TIMESTAMP,
+                "scanned_by": "Administrator",
+                "action_taken": "view"
+            }).insert(ignore_permissions=True)
+            names.append(log.name)
+        if settled:
+            self.settle(names)
+        frappe.db.commit()
+        return names
+
+    def settle(self, names):
+        frappe.db.sql("UPDATE `tabQR Scan Log` SET creation = %s WHERE name IN %s",
+            (add_to_date(now_datetime(), seconds=-2 * SETTLE_SECONDS), tuple(names)))
+
+    def rollup_counts(self):
+        return dict(frappe.get_all("QR Scan Rollup",
+            filters={"qr_link": self.qr_link.name},
+            fields=["period_type", "scan_count"],
+            as_list=True
+        ))
+
+    def watermark(self):
+        return cint(frappe.db.get_single_value("QR Settings", "scan_rollup_watermark"))
+
+    def test_logs_are_folded_once(self):
+        names = self.add_scans(3)
+        update_scan_rollups()
+
+        self.assertEqual(self.rollup_counts(), {"Hour": 3, "Day": 3})
+        self.assertGreaterEqual(self.watermark(), max(names))
+
+        update_scan_rollups()
+        self.assertEqual(self.rollup_counts(), {"Hour": 3, "Day": 3})
+
+    def test_unsettled_logs_wait_for_the_next_run(self):
+        self.add_scans(2)
+        update_scan_rollups()
+        pending = self.add_scans(1, settled=False)
+        update_scan_rollups()
+
+        self.assertEqual(self.rollup_counts(), {"Hour": 2, "Day": 2})
+        self.assertLess(self.watermark(), pending[0])
+
+        self.settle(pending)
+        update_scan_rollups()
+        self.assertEqual(self.rollup_counts(), {"Hour": 3, "Day": 3})
+        self.assertGreaterEqual(self.watermark(), pending[0])
@@ -15,6 +15,11 @@ frappe.ui.form.on('QR Settings', {
             );
         }, __('Actions'));
         
+        // Large sites: run the sync as a background job
+        frm.add_custom_button(__('Sync in Background'), function() {
+            frm.call('sync_doctypes', { background: 1 });
+        }, __('Actions'));
+        
         // Add button to enable all
         frm.add_custom_button(__('Enable All'), function() {
             frm.doc.doctype_settings.forEach(row => {
@@ -62,6 +67,16 @@ frappe.ui.form.on('QR Settings', {
         });
     },
     
+    find_orphans_button: function(frm) {
+        frappe.call({
+            method: 'qr_suite.api.collect_qr_garbage',
+            args: { dry_run: 1, background: 1 },
+            callback: function() {
+                frappe.show_alert(__('Looking for orphaned QR Links. The report will appear when it is ready.'));
+            }
+        });
+    },
+    
     sync_now: function(frm) {
         frm.call('sync_doctypes').then(r => {
             frm.reload_doc();
@@ -4,7 +4,11 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
-from frappe.utils import now_datetime
+from frappe.utils import cint, now_datetime
+
+from qr_suite.utils.auto_generate import clear_auto_generate_rules
+from qr_suite.utils.image_refresh import clear_watched_fields
+from qr_suite.utils.tokens import DEFAULT_ALPHABET, DEFAULT_LENGTH, MAX_TOKEN_LENGTH, min_token_length
 
 # Hardcoded doctypes that must always be available
 HARDCODED_DOCTYPES = [
@@ -33,15 +37,36 @@ class QRSettings(Document):
         
         # Update counts
         self.update_counts()
+        self.validate_token_format()
+    
+    def validate_token_format(self):
+        """New tokens must keep at least MIN_TOKEN_BITS of randomness"""
+        # Settings saved before token_length existed have no stored value
+        if not cint(self.token_length):
+            self.token_length = DEFAULT_LENGTH
+        alphabet = self.token_alphabet or DEFAULT_ALPHABET
+        minimum = min_token_length(alphabet)
+        if cint(self.token_length) < minimum or cint(self.token_length) > MAX_TOKEN_LENGTH:
+            frappe.throw(_("Token Length for {0} tokens must be between {1} and {2}").format(
+                alphabet, minimum, MAX_TOKEN_LENGTH))
     
     def on_update(self):
         """Clear cache when settings are updated"""
         # Clear the doctype_js cache
         frappe.cache().delete_value("qr_suite_enabled_doctypes_js")
+        clear_auto_generate_rules()
+        clear_watched_fields()
         
         # Clear general cache to ensure hooks are reloaded
         frappe.clear_cache()
         
+        # Rebuild the Value QR field catalogue for the new set of enabled doctypes
+        frappe.enqueue(
+            "qr_suite.utils.field_catalogue.build_field_catalogue",
+            queue="short",
+            enqueue_after_commit=True
+        )
+        
         # Show message to user
         frappe.msgprint(_("QR Settings updated. Changes will take effect after page refresh."), indicator="green")
     
@@ -51,72 +76,22 @@ class QRSettings(Document):
         self.enabled_count = len([d for d in self.doctype_settings if d.is_enabled])
     
     @frappe.whitelist()
-    def sync_doctypes(self):
+    def sync_doctypes(self, background=0):
         """Sync only relevant doctypes that make sense for QR codes"""
-        # Define modules and doctypes that typically need QR codes
-        relevant_modules = [
-            "Stock", "Buying", "Selling", "Assets", "Manufacturing", 
-            "Projects", "CRM", "Support", "HR", "Quality Management"
-        ]
-        
-        # Additional specific doctypes that might be useful
-        additional_doctypes = [
-            "Payment Entry", "Journal Entry", "Expense Claim",
-            "Vehicle", "Location", "Bin", "Package",
-            "Maintenance Visit", "Maintenance Schedule"
-        ]
-        
-        # Get relevant doctypes
-        relevant_doctypes = frappe.get_list("DocType", 
-            filters=[
-                ["istable", "=", 0],
-                ["issingle", "=", 0],
-                ["is_virtual", "=", 0],
-                ["custom", "=", 0],  # Exclude custom doctypes by default
-                [
-                    [
-                        ["module", "in", relevant_modules]
-                    ],
-                    "or",
-                    [
-                        ["name", "in", HARDCODED_DOCTYPES + additional_doctypes]
-                    ]
-                ]
-            ],
-            fields=["name", "module"],
-            order_by="module, name"
-        )
-        
-        # Get existing doctype names in settings
-        existing_doctypes = {d.doctype_name for d in self.doctype_settings}
-        
-        # Add missing relevant doctypes
-        added = 0
-        for dt in relevant_doctypes:
-            if dt.name not in existing_doctypes:
-                # Check if it's a hardcoded doctype
-                is_hardcoded = dt.name in HARDCODED_DOCTYPES
-                
-                # Get default action based on doctype
-                default_action = self.get_default_action(dt.name)
-                
-                self.append("doctype_settings", {
-                    "doctype_name": dt.name,
-                    "is_enabled": is_hardcoded,  # Enable by default if hardcoded
-                    "is_hardcoded": is_hardcoded,
-                    "qr_type_default": "Document QR",
-                    "default_action": default_action,
-                    "min_role": "QR User"
-                })
-                added += 1
-        
-        # Update sync time
-        self.last_sync = now_datetime()
-        
-        # Save (this will trigger on_update and clear cache)
-        self.save()
+        if cint(background):
+            frappe.enqueue(
+                "qr_suite.qr_suite.doctype.qr_settings.qr_settings.run_doctype_sync",
+                queue="long",
+                job_id="qr_suite_doctype_sync",
+                deduplicate=True,
+                notify_user=frappe.session.user
+            )
+            frappe.msgprint(_("DocType sync queued. You will be notified when it completes."))
+            return
         
-        frappe.msgprint(_("Synced relevant DocTypes for QR generation. Added {0} new doctypes.").format(added))
+        summary = sync_doctype_settings()
+        frappe.msgprint(format_sync_summary(summary))
+        return summary
     
     @frappe.whitelist()
     def add_custom_doctype(self, doctype_name):
@@ -147,22 +122,161 @@ class QRSettings(Document):
     
     def get_default_action(self, doctype):
         """Get default action for a doctype"""
-        action_map = {
-            "Asset": "view",
-            "Stock Entry": "view", 
-            "Serial No": "view",
-            "Batch": "view",
-            "Item": "stock_balance",
-            "Warehouse": "stock_balance",
-            "Purchase Order": "view",
-            "Sales Order": "view",
-            "Purchase Receipt": "view",
-            "Delivery Note": "view",
-            "Customer": "view",
-            "Supplier": "view",
-            "Employee": "view"
-        }
-        return action_map.get(doctype, "view")
+        return get_default_action(doctype)
+
+# Modules and doctypes that typically need QR codes
+RELEVANT_MODULES = [
+    "Stock", "Buying", "Selling", "Assets", "Manufacturing", 
+    "Projects", "CRM", "Support", "HR", "Quality Management"
+]
+
+ADDITIONAL_DOCTYPES = [
+    "Payment Entry", "Journal Entry", "Expense Claim",
+    "Vehicle", "Location", "Bin", "Package",
+    "Maintenance Visit", "Maintenance Schedule"
+]
+
+def sync_doctype_settings(include_custom=None, modules=None):
+    """
+    Diff the candidate DocTypes against the QR Settings Detail rows and apply
+    only the changes, as bulk child-row inserts and deletes.
+    
+    Rows are removed when they are not hardcoded and either their DocType no
+    longer exists, or they are disabled and no longer match the sync filters.
+    Enabled rows added by hand are always kept.
+    """
+    if include_custom is None:
+        include_custom = frappe.db.get_single_value("QR Settings", "include_custom_doctypes")
+    if modules is None:
+        modules = frappe.db.get_single_value("QR Settings", "sync_modules")
+    if isinstance(modules, str):
+        modules = [m.strip() for m in modules.splitlines() if m.strip()]
+    modules = modules or RELEVANT_MODULES
+    
+    filters = {"istable": 0, "issingle": 0, "is_virtual": 0}
+    if not cint(include_custom):
+        filters["custom"] = 0  # Exclude custom doctypes by default
+    
+    candidates = set(frappe.get_all("DocType",
+        filters=filters,
+        or_filters={
+            "module": ["in", modules],
+            "name": ["in", HARDCODED_DOCTYPES + ADDITIONAL_DOCTYPES]
+        },
+        pluck="name"
+    ))
+    
+    existing = frappe.get_all("QR Settings Detail",
+        filters={"parent": "QR Settings", "parenttype": "QR Settings", "parentfield": "doctype_settings"},
+        fields=["name", "doctype_name", "is_enabled", "is_hardcoded", "idx"]
+    )
+    existing_names = {row.doctype_name for row in existing}
+    still_exists = set(frappe.get_all("DocType",
+        filters={"name": ["in", list(existing_names) or [""]]},
+        pluck="name"
+    ))
+    
+    to_remove = [
+        row for row in existing
+        if not row.is_hardcoded and (
+            row.doctype_name not in still_exists
+            or (not row.is_enabled and row.doctype_name not in candidates)
+        )
+    ]
+    to_add = sorted(candidates - existing_names)
+    
+    if to_remove:
+        frappe.db.delete("QR Settings Detail", {"name": ["in", [row.name for row in to_remove]]})
+    
+    if to_add:
+        now = now_datetime()
+        user = frappe.session.user
+        next_idx = max([row.idx or 0 for row in existing] or [0]) + 1
+        values = []
+        for i, doctype in enumerate(to_add):
+            is_hardcoded = cint(doctype in HARDCODED_DOCTYPES)
+            values.append((
+                frappe.generate_hash(length=10), "QR Settings", "QR Settings", "doctype_settings",
+                next_idx + i, now, now, user, user, 0,
+                doctype, is_hardcoded, is_hardcoded,  # Enable by default if hardcoded
+                "Document QR", get_default_action(doctype), "QR User"
+            ))
+        frappe.db.bulk_insert("QR Settings Detail", [
+            "name", "parent", "parenttype", "parentfield",
+            "idx", "creation", "modified", "owner", "modified_by", "docstatus",
+            "doctype_name", "is_enabled", "is_hardcoded",
+            "qr_type_default", "default_action", "min_role"
+        ], values)
+    
+    removed_enabled = len([row for row in to_remove if row.is_enabled])
+    added_enabled = len([d for d in to_add if d in HARDCODED_DOCTYPES])
+    total = len(existing) - len(to_remove) + len(to_add)
+    enabled = len([row for row in existing if row.is_enabled]) - removed_enabled + added_enabled
+    
+    summary = {
+        "added": to_add,
+        "removed": [row.doctype_name for row in to_remove],
+        "unchanged": len(existing) - len(to_remove),
+        "total": total,
+        "enabled": enabled
+    }
+    
+    frappe.db.set_value("QR Settings", "QR Settings", {
+        "last_sync": now_datetime(),
+        "last_sync_summary": format_sync_summary(summary),
+        "total_doctypes": total,
+        "enabled_count": enabled
+    }, update_modified=False)
+    
+    # Only enabled rows affect hooks; otherwise skip the site-wide cache clear
+    frappe.clear_document_cache("QR Settings", "QR Settings")
+    if removed_enabled or added_enabled:
+        frappe.cache().delete_value("qr_suite_enabled_doctypes_js")
+        clear_auto_generate_rules()
+        clear_watched_fields()
+        frappe.clear_cache()
+        frappe.enqueue(
+            "qr_suite.utils.field_catalogue.build_field_catalogue",
+            queue="short",
+            enqueue_after_commit=True
+        )
+    
+    return summary
+
+def run_doctype_sync(notify_user=None):
+    """Background job entry point for the DocType sync"""
+    summary = sync_doctype_settings()
+    frappe.db.commit()
+    
+    if notify_user:
+        frappe.publish_realtime("msgprint", format_sync_summary(summary), user=notify_user)
+    
+    return summary
+
+def format_sync_summary(summary):
+    """Human readable one-line summary of a DocType sync"""
+    return _("Synced relevant DocTypes for QR generation. Added {0}, removed {1}, unchanged {2}.").format(
+        len(summary["added"]), len(summary["removed"]), summary["unchanged"]
+    )
+
+def get_default_action(doctype):
+    """Get default action for a doctype"""
+    action_map = {
+        "Asset": "view",
+        "Stock Entry": "view", 
+        "Serial No": "view",
+        "Batch": "view",
+        "Item": "stock_balance",
+        "Warehouse": "stock_balance",
+        "Purchase Order": "view",
+        "Sales Order": "view",
+        "Purchase Receipt": "view",
+        "Delivery Note": "view",
+        "Customer": "view",
+        "Supplier": "view",
+        "Employee": "view"
+    }
+    return action_map.get(doctype, "view")
 
 @frappe.whitelist()
 def get_enabled_doctypes():
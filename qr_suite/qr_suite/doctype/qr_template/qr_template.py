@@ -1,6 +1,9 @@
 import frappe
 from frappe.model.document import Document
 
+from qr_suite.utils.image_refresh import clear_watched_fields
+from qr_suite.utils.template_options import ERROR_LEVELS, SIZE_PIXELS, clear_template_options
+
 class QRTemplate(Document):
     def validate(self):
         """Validate QR Template"""
@@ -21,22 +24,23 @@ class QRTemplate(Document):
             if not meta.has_field(self.value_field):
                 frappe.throw(f"Field '{self.value_field}' does not exist in DocType '{self.target_doctype}'")
     
+    def on_update(self):
+        """Invalidate compiled template options"""
+        clear_template_options(self.name)
+        clear_watched_fields()
+    
+    def on_trash(self):
+        clear_template_options(self.name)
+        clear_watched_fields()
+    
+    def after_rename(self, old_name, new_name, merge=False):
+        clear_template_options(old_name)
+        clear_template_options(new_name)
+    
     def get_qr_size_pixels(self):
         """Get QR code size in pixels"""
-        size_map = {
-            "Small": 150,
-            "Medium": 250,
-            "Large": 400
-        }
-        return size_map.get(self.qr_size, 250)
+        return SIZE_PIXELS.get(self.qr_size, 250)
     
     def get_error_correction_level(self):
         """Get QR error correction level"""
-        import qrcode
-        level_map = {
-            "L": qrcode.constants.ERROR_CORRECT_L,
-            "M": qrcode.constants.ERROR_CORRECT_M,
-            "Q": qrcode.constants.ERROR_CORRECT_Q,
-            "H": qrcode.constants.ERROR_CORRECT_H
-        }
-        return level_map.get(self.error_correction, qrcode.constants.ERROR_CORRECT_M)
+        return ERROR_LEVELS.get(self.error_correction, ERROR_LEVELS["M"])
@@ -0,0 +1,75 @@
+// Copyright (c) 2026, Brighton and contributors
+// For license information, please see license.txt
+
+frappe.pages['qr-hot-links'].on_page_load = function(wrapper) {
+    let page = frappe.ui.make_app_page({
+        parent: wrapper,
+        title: __('QR Hot Links'),
+        single_column: true
+    });
+    
+    let window_field = page.add_field({
+        fieldname: 'window',
+        label: __('Window'),
+        fieldtype: 'Select',
+        options: [
+            { value: '5m', label: __('Last 5 minutes') },
+            { value: '1h', label: __('Last hour') },
+            { value: '24h', label: __('Last 24 hours') }
+        ],
+        default: '5m',
+        change: () => refresh()
+    });
+    
+    page.set_primary_action(__('Refresh'), () => refresh(), 'refresh');
+    
+    let $body = $('<div class="qr-hot-links"></div>').appendTo(page.main);
+    
+    function refresh() {
+        frappe.call({
+            method: 'qr_suite.api.get_hot_qr_links',
+            args: { window: window_field.get_value() || '5m', limit: 50 },
+            callback: function(r) {
+                render(r.message || []);
+            }
+        });
+    }
+    
+    function render(rows) {
+        if (!rows.length) {
+            $body.html(`<div class="text-muted text-center" style="padding: 40px;">${__('No scans in this window')}</div>`);
+            return;
+        }
+        
+        let html = `<table class="table table-bordered">
+            <thead><tr>
+                <th>#</th>
+                <th>${__('QR Link')}</th>
+                <th>${__('Target')}</th>
+                <th>${__('Status')}</th>
+                <th class="text-right">${__('Scans (approx.)')}</th>
+                <th class="text-right">${__('All-time Scans')}</th>
+            </tr></thead><tbody>`;
+        rows.forEach((row, i) => {
+            html += `<tr>
+                <td>${i + 1}</td>
+                <td><a href="/app/qr-link/${encodeURIComponent(row.qr_link)}">${frappe.utils.escape_html(row.qr_link)}</a></td>
+                <td>${frappe.utils.escape_html(row.target_doctype || '')} ${frappe.utils.escape_html(row.target_name || '')}</td>
+                <td>${frappe.utils.escape_html(row.status || '')}</td>
+                <td class="text-right">${row.scans}</td>
+                <td class="text-right">${row.total_scans || 0}</td>
+            </tr>`;
+        });
+        html += '</tbody></table>';
+        $body.html(html);
+    }
+    
+    refresh();
+    
+    // Keep the view live while the page is open
+    setInterval(() => {
+        if (frappe.get_route_str() === 'qr-hot-links') {
+            refresh();
+        }
+    }, 30000);
+};
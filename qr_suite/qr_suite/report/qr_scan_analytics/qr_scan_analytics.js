@@ -0,0 +1,40 @@
+// Copyright (c) 2026, Brighton and contributors
+// For license information, please see license.txt
+
+frappe.query_reports['QR Scan Analytics'] = {
+    filters: [
+        {
+            fieldname: 'from_date',
+            label: __('From Date'),
+            fieldtype: 'Date',
+            default: frappe.datetime.add_days(frappe.datetime.get_today(), -30),
+            reqd: 1
+        },
+        {
+            fieldname: 'to_date',
+            label: __('To Date'),
+            fieldtype: 'Date',
+            default: frappe.datetime.get_today(),
+            reqd: 1
+        },
+        {
+            fieldname: 'period_type',
+            label: __('Period'),
+            fieldtype: 'Select',
+            options: 'Day\nHour',
+            default: 'Day'
+        },
+        {
+            fieldname: 'target_doctype',
+            label: __('DocType'),
+            fieldtype: 'Link',
+            options: 'DocType'
+        },
+        {
+            fieldname: 'qr_link',
+            label: __('QR Link'),
+            fieldtype: 'Link',
+            options: 'QR Link'
+        }
+    ]
+};
@@ -0,0 +1,68 @@
+# Copyright (c) 2026, Brighton and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, getdate
+
+
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    data = get_data(filters)
+    if (filters.period_type or "Day") == "Day" and not filters.qr_link:
+        add_unique_counts(data)
+    return get_columns(filters), data
+
+def get_columns(filters):
+    columns = [
+        {"label": _("Period"), "fieldname": "period_start", "fieldtype": "Datetime", "width": 160},
+        {"label": _("DocType"), "fieldname": "target_doctype", "fieldtype": "Data", "width": 150},
+        {"label": _("Action"), "fieldname": "action_taken", "fieldtype": "Data", "width": 150},
+        {"label": _("Scan Count"), "fieldname": "scan_count", "fieldtype": "Int", "width": 110}
+    ]
+    if (filters.period_type or "Day") == "Day" and not filters.qr_link:
+        columns += [
+            {"label": _("Unique Users (approx.)"), "fieldname": "unique_users", "fieldtype": "Int", "width": 150},
+            {"label": _("Unique IPs (approx.)"), "fieldname": "unique_ips", "fieldtype": "Int", "width": 140}
+        ]
+    return columns
+
+def add_unique_counts(data):
+    """Fill unique users/IPs per day, DocType and action from the HyperLogLog sketches"""
+    from qr_suite.utils.hyperloglog import count_unique, day_key
+    
+    for row in data:
+        day = str(getdate(row.period_start))
+        row.unique_users = count_unique([day_key(day, row.target_doctype, row.action_taken, "users")])
+        row.unique_ips = count_unique([day_key(day, row.target_doctype, row.action_taken, "ips")])
+
+def get_data(filters):
+    """Sum rollup rows over the date range; reads QR Scan Rollup, never the raw scan log"""
+    from_date = getdate(filters.from_date or add_days(getdate(), -30))
+    to_date = getdate(filters.to_date or getdate())
+    
+    conditions = [
+        "period_type = %(period_type)s",
+        "period_start >= %(from_date)s",
+        "period_start < %(to_date)s"
+    ]
+    values = {
+        "period_type": filters.period_type or "Day",
+        "from_date": from_date,
+        "to_date": add_days(to_date, 1)
+    }
+    
+    if filters.target_doctype:
+        conditions.append("target_doctype = %(target_doctype)s")
+        values["target_doctype"] = filters.target_doctype
+    if filters.qr_link:
+        conditions.append("qr_link = %(qr_link)s")
+        values["qr_link"] = filters.qr_link
+    
+    return frappe.db.sql(f"""
+        SELECT period_start, target_doctype, action_taken, SUM(scan_count) AS scan_count
+        FROM `tabQR Scan Rollup`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY period_start, target_doctype, action_taken
+        ORDER BY period_start DESC, scan_count DESC
+    """, values, as_dict=True)
@@ -0,0 +1,35 @@
+// Copyright (c) 2026, Brighton and contributors
+// For license information, please see license.txt
+
+frappe.query_reports['QR Scan Patterns'] = {
+    filters: [
+        {
+            fieldname: 'view',
+            label: __('View'),
+            fieldtype: 'Select',
+            options: 'Heatmap\nScan Intervals\nDwell Time',
+            default: 'Heatmap',
+            reqd: 1
+        },
+        {
+            fieldname: 'from_date',
+            label: __('From Date'),
+            fieldtype: 'Date',
+            default: frappe.datetime.add_days(frappe.datetime.get_today(), -30),
+            reqd: 1
+        },
+        {
+            fieldname: 'to_date',
+            label: __('To Date'),
+            fieldtype: 'Date',
+            default: frappe.datetime.get_today(),
+            reqd: 1
+        },
+        {
+            fieldname: 'target_doctype',
+            label: __('DocType'),
+            fieldtype: 'Link',
+            options: 'DocType'
+        }
+    ]
+};
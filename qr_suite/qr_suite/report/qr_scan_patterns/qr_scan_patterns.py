@@ -0,0 +1,90 @@
+# Copyright (c) 2026, Brighton and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, getdate
+
+from qr_suite.utils.scan_analytics import INTERVAL_LABELS, WEEKDAYS, get_scan_patterns
+
+
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    view = filters.view or "Heatmap"
+    result = get_scan_patterns(
+        view,
+        filters.from_date or add_days(getdate(), -30),
+        filters.to_date or getdate(),
+        filters.target_doctype
+    )
+    
+    if view == "Heatmap":
+        return get_heatmap(result)
+    if view == "Scan Intervals":
+        return get_intervals(result)
+    return get_dwell_times(result)
+
+def get_heatmap(heatmap):
+    """One row per DocType and weekday, one column per hour"""
+    columns = [
+        {"label": _("DocType"), "fieldname": "target_doctype", "fieldtype": "Data", "width": 150},
+        {"label": _("Weekday"), "fieldname": "weekday", "fieldtype": "Data", "width": 100}
+    ] + [
+        {"label": f"{hour:02d}", "fieldname": f"h{hour:02d}", "fieldtype": "Int", "width": 55}
+        for hour in range(24)
+    ]
+    
+    data = []
+    by_hour = [0] * 24
+    for doctype, grid in heatmap.items():
+        for day, counts in enumerate(grid):
+            row = {"target_doctype": doctype, "weekday": _(WEEKDAYS[day])}
+            for hour, count in enumerate(counts):
+                row[f"h{hour:02d}"] = count
+                by_hour[hour] += count
+            data.append(row)
+    
+    chart = {
+        "data": {
+            "labels": [f"{hour:02d}:00" for hour in range(24)],
+            "datasets": [{"name": _("Scans"), "values": by_hour}]
+        },
+        "type": "bar"
+    }
+    return columns, data, None, chart
+
+def get_intervals(distribution):
+    """Histogram of time between consecutive scans of the same target, per DocType"""
+    columns = [{"label": _("DocType"), "fieldname": "target_doctype", "fieldtype": "Data", "width": 150}] + [
+        {"label": label, "fieldname": f"b{i}", "fieldtype": "Int", "width": 100}
+        for i, label in enumerate(INTERVAL_LABELS)
+    ]
+    
+    data = []
+    totals = [0] * len(INTERVAL_LABELS)
+    for doctype, counts in distribution.items():
+        row = {"target_doctype": doctype}
+        for i, count in enumerate(counts):
+            row[f"b{i}"] = count
+            totals[i] += count
+        data.append(row)
+    
+    chart = {
+        "data": {
+            "labels": INTERVAL_LABELS,
+            "datasets": [{"name": _("Intervals"), "values": totals}]
+        },
+        "type": "bar"
+    }
+    return columns, data, None, chart
+
+def get_dwell_times(dwell):
+    """Targets with the longest mean time between scans"""
+    columns = [
+        {"label": _("DocType"), "fieldname": "target_doctype", "fieldtype": "Data", "width": 150},
+        {"label": _("Document"), "fieldname": "target_name", "fieldtype": "Dynamic Link", "options": "target_doctype", "width": 180},
+        {"label": _("Scans"), "fieldname": "scans", "fieldtype": "Int", "width": 80},
+        {"label": _("Mean Dwell"), "fieldname": "mean_dwell", "fieldtype": "Duration", "width": 140},
+        {"label": _("Max Dwell"), "fieldname": "max_dwell", "fieldtype": "Duration", "width": 140}
+    ]
+    return columns, dwell
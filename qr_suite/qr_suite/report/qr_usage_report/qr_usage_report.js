@@ -0,0 +1,71 @@
+// Copyright (c) 2026, Brighton and contributors
+// For license information, please see license.txt
+
+frappe.query_reports['QR Usage Report'] = {
+    filters: [
+        {
+            fieldname: 'mode',
+            label: __('Mode'),
+            fieldtype: 'Select',
+            options: 'Detail\nSummary',
+            default: 'Detail'
+        },
+        {
+            fieldname: 'target_doctype',
+            label: __('DocType'),
+            fieldtype: 'Link',
+            options: 'DocType'
+        },
+        {
+            fieldname: 'status',
+            label: __('Status'),
+            fieldtype: 'Select',
+            options: '\nActive\nExpired\nRevoked\nInactive'
+        },
+        {
+            fieldname: 'qr_template',
+            label: __('QR Template'),
+            fieldtype: 'Link',
+            options: 'QR Template'
+        },
+        {
+            fieldname: 'from_date',
+            label: __('Created From'),
+            fieldtype: 'Date'
+        },
+        {
+            fieldname: 'to_date',
+            label: __('Created To'),
+            fieldtype: 'Date'
+        },
+        {
+            fieldname: 'page_size',
+            label: __('Page Size'),
+            fieldtype: 'Int',
+            default: 500,
+            depends_on: "eval:doc.mode !== 'Summary'"
+        },
+        {
+            // Keyset cursor: [scan_count, created_on, name] of the last row shown
+            fieldname: 'after',
+            label: __('After'),
+            fieldtype: 'Data',
+            hidden: 1
+        }
+    ],
+    
+    onload: function(report) {
+        report.page.add_inner_button(__('Next Page'), function() {
+            let data = report.data || [];
+            let last = data[data.length - 1];
+            if (!last || report.get_filter_value('mode') === 'Summary') {
+                return;
+            }
+            report.set_filter_value('after', JSON.stringify([last.scan_count, last.created_on, last.name]));
+        });
+        
+        report.page.add_inner_button(__('First Page'), function() {
+            report.set_filter_value('after', '');
+        });
+    }
+};
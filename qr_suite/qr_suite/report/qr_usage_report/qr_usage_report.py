@@ -0,0 +1,102 @@
+# Copyright (c) 2026, Brighton and contributors
+# For license information, please see license.txt
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, cint, getdate
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+def execute(filters=None):
+    filters = frappe._dict(filters or {})
+    if filters.mode == "Summary":
+        return get_summary_columns(), get_summary_data(filters)
+    return get_columns(), get_data(filters)
+
+def get_columns():
+    return [
+        {"label": _("QR Link"), "fieldname": "name", "fieldtype": "Link", "options": "QR Link", "width": 150},
+        {"label": _("DocType"), "fieldname": "target_doctype", "fieldtype": "Link", "options": "DocType", "width": 160},
+        {"label": _("Document"), "fieldname": "target_name", "fieldtype": "Dynamic Link", "options": "target_doctype", "width": 180},
+        {"label": _("QR Type"), "fieldname": "qr_type", "fieldtype": "Data", "width": 110},
+        {"label": _("Status"), "fieldname": "status", "fieldtype": "Data", "width": 90},
+        {"label": _("Scans"), "fieldname": "scan_count", "fieldtype": "Int", "width": 80},
+        {"label": _("Created"), "fieldname": "created_on", "fieldtype": "Datetime", "width": 150},
+        {"label": _("Last Scan"), "fieldname": "last_scanned", "fieldtype": "Datetime", "width": 150}
+    ]
+
+def get_summary_columns():
+    return [
+        {"label": _("DocType"), "fieldname": "target_doctype", "fieldtype": "Link", "options": "DocType", "width": 180},
+        {"label": _("Status"), "fieldname": "status", "fieldtype": "Data", "width": 100},
+        {"label": _("QR Links"), "fieldname": "link_count", "fieldtype": "Int", "width": 100},
+        {"label": _("Scans"), "fieldname": "scan_count", "fieldtype": "Int", "width": 100}
+    ]
+
+def get_data(filters):
+    """
+    One page of links ordered by (scan_count, created_on, name) descending.
+    The next page starts after the `after` cursor (the last row of the previous
+    page), so every page is an index range scan instead of a filesort + OFFSET.
+    """
+    conditions, values = get_conditions(filters)
+    
+    if filters.after:
+        scan_count, created_on, name = frappe.parse_json(filters.after)
+        conditions.append("""(
+            scan_count < %(after_scan_count)s
+            OR (scan_count = %(after_scan_count)s AND (
+                created_on < %(after_created_on)s
+                OR (created_on = %(after_created_on)s AND name < %(after_name)s)
+            ))
+        )""")
+        values.update({
+            "after_scan_count": cint(scan_count),
+            "after_created_on": created_on,
+            "after_name": name
+        })
+    
+    values["page_size"] = min(cint(filters.page_size) or DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    
+    return frappe.db.sql(f"""
+        SELECT name, target_doctype, target_name, qr_type, status, scan_count, created_on, last_scanned
+        FROM `tabQR Link`
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY scan_count DESC, created_on DESC, name DESC
+        LIMIT %(page_size)s
+    """, values, as_dict=True)
+
+def get_summary_data(filters):
+    """Link and scan counts per DocType and status"""
+    conditions, values = get_conditions(filters)
+    
+    return frappe.db.sql(f"""
+        SELECT target_doctype, status, COUNT(*) AS link_count, SUM(scan_count) AS scan_count
+        FROM `tabQR Link`
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        GROUP BY target_doctype, status
+        ORDER BY link_count DESC
+    """, values, as_dict=True)
+
+def get_conditions(filters):
+    conditions = []
+    values = {}
+    
+    if filters.target_doctype:
+        conditions.append("target_doctype = %(target_doctype)s")
+        values["target_doctype"] = filters.target_doctype
+    if filters.status:
+        conditions.append("status = %(status)s")
+        values["status"] = filters.status
+    if filters.qr_template:
+        conditions.append("qr_template = %(qr_template)s")
+        values["qr_template"] = filters.qr_template
+    if filters.from_date:
+        conditions.append("created_on >= %(from_date)s")
+        values["from_date"] = getdate(filters.from_date)
+    if filters.to_date:
+        conditions.append("created_on < %(to_date)s")
+        values["to_date"] = add_days(getdate(filters.to_date), 1)
+    
+    return conditions, values
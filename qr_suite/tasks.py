@@ -1,25 +1,71 @@
+import time
+
 import frappe
 from frappe.utils import now_datetime, add_days
 
+from qr_suite.utils.expiry_scheduler import unschedule_expiry
+from qr_suite.utils.resolution_cache import invalidate_tokens
+
+# Links expired per UPDATE / commit
+EXPIRY_CHUNK_SIZE = 1000
+
 def cleanup_expired_qr_codes():
-    """Mark expired QR codes as expired"""
+    """
+    Mark every Active link whose expires_on has passed as Expired
+    Not scheduled on its own: rebuild_expiry_schedule runs it after migrate and weekly,
+    to catch links missing from the Redis schedule that process_due_expiries reads.
+    """
+    lock = frappe.cache().lock(frappe.cache().make_key("qr_suite_expiry_sweep_lock"), timeout=3600)
+    if not lock.acquire(blocking=False):
+        return
+
     try:
-        # Get all active QR Links with expiry date passed
-        expired_qr_links = frappe.get_all("QR Link",
-            filters={
-                "status": "Active",
-                "expires_on": ["<", now_datetime()]
-            },
-            fields=["name"]
-        )
-        
-        # Update status
-        for qr_link in expired_qr_links:
-            frappe.db.set_value("QR Link", qr_link.name, "status", "Expired")
-        
-        if expired_qr_links:
-            frappe.db.commit()
-            print(f"Marked {len(expired_qr_links)} QR codes as expired")
-    
+        started = time.monotonic()
+        cutoff = now_datetime()
+        expired = chunks = 0
+
+        while True:
+            # Walks the (status, expires_on) index; each chunk is one UPDATE and one commit
+            rows = frappe.db.sql("""
+                SELECT name, token FROM `tabQR Link`
+                WHERE status = 'Active' AND expires_on < %s
+                LIMIT %s
+            """, (cutoff, EXPIRY_CHUNK_SIZE), as_dict=True)
+            if not rows:
+                break
+
+            expire_qr_links(rows, cutoff)
+
+            expired += len(rows)
+            chunks += 1
+
+        elapsed = time.monotonic() - started
+        metrics = {
+            "expired": expired,
+            "chunks": chunks,
+            "seconds": round(elapsed, 3),
+            "rows_per_sec": round(expired / elapsed, 1) if elapsed else expired
+        }
+        if expired:
+            frappe.logger("qr_suite").info(f"QR expiry sweep: {metrics}")
+        return metrics
+
     except Exception as e:
+        frappe.db.rollback()
         frappe.log_error(f"Error in QR cleanup: {str(e)}", "QR Cleanup Task")
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+def expire_qr_links(rows, now):
+    """Expire the given Active links (dicts with name and token) in one UPDATE and commit"""
+    frappe.db.sql("""
+        UPDATE `tabQR Link`
+        SET status = 'Expired', idempotency_key = NULL, modified = %s
+        WHERE name IN %s AND status = 'Active' AND expires_on <= %s
+    """, (now, tuple(row.name for row in rows), now))
+    frappe.db.commit()
+    invalidate_tokens([row.token for row in rows])
+    unschedule_expiry([row.name for row in rows])
@@ -0,0 +1,225 @@
+import frappe
+
+# Redis set of "<doctype>\x1f<name>" waiting for a QR Link; a set, so repeated
+# events for one document collapse into a single entry
+QUEUE_KEY = "qr_suite_auto_generate_queue"
+
+RULES_KEY = "qr_suite_auto_generate_rules"
+
+# Redis hash of failed attempts per queued member
+ATTEMPTS_KEY = "qr_suite_auto_generate_attempts"
+
+# Documents taken off the queue per batch
+BATCH_SIZE = 500
+
+# Runs a failing document is retried in before it is dropped from the queue
+MAX_ATTEMPTS = 5
+
+# Attempt counts are forgotten after a day without new failures
+ATTEMPTS_TTL = 24 * 3600
+
+SEPARATOR = "\x1f"
+
+def get_auto_generate_rules():
+    """{doctype: rule} for enabled QR Settings rows with Auto Generate set, cached until QR Settings changes"""
+    return frappe.cache().get_value(RULES_KEY, generator=_build_rules)
+
+def clear_auto_generate_rules():
+    frappe.cache().delete_value(RULES_KEY)
+
+def on_document_event(doc, method=None):
+    """doc_events handler for every DocType: queue the document if its rule matches the event"""
+    if frappe.flags.in_install or frappe.flags.in_migrate:
+        return
+
+    rule = get_auto_generate_rules().get(doc.doctype)
+    if not rule:
+        return
+    if rule["event"] != ("On Submit" if method == "on_submit" else "On Insert"):
+        return
+
+    queue_document(doc.doctype, doc.name)
+
+def queue_document(doctype, name):
+    """
+    Add a document to the queue once the current transaction commits
+    Members are buffered per transaction and pushed with a single SADD, and the worker
+    is enqueued at most once per transaction, so bulk imports stay cheap. A rollback
+    discards the buffer, so later events start a new one.
+    """
+    if frappe.flags.qr_auto_generate_pending is None:
+        frappe.flags.qr_auto_generate_pending = set()
+        frappe.db.after_commit.add(_flush_pending)
+        frappe.db.after_rollback.add(_discard_pending)
+    frappe.flags.qr_auto_generate_pending.add(f"{doctype}{SEPARATOR}{name}")
+
+def process_auto_generate_queue():
+    """Worker: create QR Links for queued documents in batches (also run every minute as a safety net)"""
+    lock = frappe.cache().lock(frappe.cache().make_key("qr_suite_auto_generate_lock"), timeout=3600)
+    if not lock.acquire(blocking=False):
+        return
+
+    failed = []
+    try:
+        rules = get_auto_generate_rules()
+        while True:
+            members = _raw().spop(_key(), BATCH_SIZE).execute()[0]
+            if not members:
+                break
+
+            by_doctype = {}
+            for member in members:
+                doctype, name = frappe.safe_decode(member).split(SEPARATOR, 1)
+                by_doctype.setdefault(doctype, []).append(name)
+
+            for doctype, names in by_doctype.items():
+                if doctype not in rules:
+                    continue
+                try:
+                    failed_names = generate_qr_links(doctype, names, rules[doctype])
+                    frappe.db.commit()
+                except Exception as e:
+                    frappe.db.rollback()
+                    frappe.log_error(f"Auto QR generation failed for {doctype}: {e!s}", "QR Auto Generate")
+                    failed_names = names
+                failed += [f"{doctype}{SEPARATOR}{name}" for name in failed_names]
+    finally:
+        # Put failures back after the loop, so a batch is not retried within one run
+        _requeue(failed)
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+def generate_qr_links(doctype, names, rule):
+    """
+    Create and render QR Links for names, skipping documents that already have an identical active link
+    Each document is inserted under a savepoint; returns the names that failed.
+    """
+    from qr_suite.qr_suite.doctype.qr_link.qr_link import make_idempotency_key
+    from qr_suite.utils.field_values import get_field_values
+    from qr_suite.utils.qr_code_generator import generate_qr_image
+    from qr_suite.utils.template_options import get_template_options
+    from qr_suite.utils.tokens import mint_tokens
+
+    # Documents rolled back or deleted since they were queued drop out here
+    names = frappe.get_all(doctype, filters={"name": ["in", names]}, pluck="name")
+    if not names:
+        return []
+
+    template = get_template_options(rule["qr_template"])
+    values, labels = {}, {}
+    if rule["qr_type"] == "Value QR" and template and template.value_field:
+        values = get_field_values(doctype, names, template.value_field)
+    if rule["label_field"]:
+        labels = get_field_values(doctype, names, rule["label_field"])
+
+    links = []
+    for name in names:
+        qr_link = frappe.new_doc("QR Link")
+        qr_link.update({
+            "target_doctype": doctype,
+            "target_name": name,
+            "qr_type": rule["qr_type"],
+            "qr_template": rule["qr_template"]
+        })
+        if rule["qr_type"] == "Document QR":
+            qr_link.action = rule["action"]
+            qr_link.url_mode = template.url_mode if template else "token"
+        else:
+            value = values.get(name)
+            qr_link.qr_content = str(value) if value else name
+        if labels.get(name):
+            qr_link.include_label = 1
+            qr_link.label_text = str(labels[name])
+        qr_link.flags.idempotent = True
+        links.append((make_idempotency_key(qr_link), qr_link))
+
+    # One query for the links that already exist
+    existing = set(frappe.get_all("QR Link",
+        filters={"idempotency_key": ["in", [key for key, link in links]], "status": "Active"},
+        pluck="idempotency_key"
+    ))
+
+    links = [link for key, link in links if key not in existing]
+    token_links = [link for link in links if link.qr_type == "Document QR" and link.url_mode == "token"]
+    for qr_link, token in zip(token_links, mint_tokens(len(token_links)), strict=True):
+        qr_link.token = token
+
+    failed = []
+    for qr_link in links:
+        frappe.db.savepoint("qr_auto_generate")
+        try:
+            qr_link.insert(ignore_permissions=True)
+            result = generate_qr_image(qr_link)
+            if result.get("file_url"):
+                frappe.db.set_value("QR Link", qr_link.name, "qr_code_image", result["file_url"], update_modified=False)
+        except Exception as e:
+            frappe.db.rollback(save_point="qr_auto_generate")
+            frappe.log_error(f"Auto QR generation failed for {doctype} {qr_link.target_name}: {e!s}", "QR Auto Generate")
+            failed.append(qr_link.target_name)
+    return failed
+
+def _flush_pending():
+    pending = frappe.flags.pop("qr_auto_generate_pending", None)
+    if not pending:
+        return
+    _raw().sadd(_key(), *pending).execute()
+    frappe.enqueue(
+        "qr_suite.utils.auto_generate.process_auto_generate_queue",
+        queue="long",
+        job_id="qr_suite_auto_generate",
+        deduplicate=True
+    )
+
+def _discard_pending():
+    frappe.flags.pop("qr_auto_generate_pending", None)
+
+def _requeue(members):
+    """Put failed members back on the queue until they have failed MAX_ATTEMPTS runs"""
+    if not members:
+        return
+    attempts_key = frappe.cache().make_key(ATTEMPTS_KEY)
+    pipe = _raw()
+    for member in members:
+        pipe.hincrby(attempts_key, member, 1)
+    pipe.expire(attempts_key, ATTEMPTS_TTL)
+    attempts = pipe.execute()[:-1]
+
+    retry = [member for member, count in zip(members, attempts, strict=True) if count < MAX_ATTEMPTS]
+    dropped = [member for member, count in zip(members, attempts, strict=True) if count >= MAX_ATTEMPTS]
+    pipe = _raw()
+    if retry:
+        pipe.sadd(_key(), *retry)
+    if dropped:
+        pipe.hdel(attempts_key, *dropped)
+    pipe.execute()
+    if dropped:
+        frappe.log_error(
+            f"Dropped after {MAX_ATTEMPTS} failed runs:\n"
+                + "\n".join(m.replace(SEPARATOR, " ") for m in dropped),
+            "QR Auto Generate"
+        )
+
+def _build_rules():
+    # A Single always loads; with no doctype_settings rows there are simply no rules
+    settings = frappe.get_cached_doc("QR Settings", "QR Settings")
+    return {
+        row.doctype_name: {
+            "event": row.auto_generate,
+            "qr_type": row.qr_type_default or "Document QR",
+            "action": row.default_action or "view",
+            "qr_template": row.auto_generate_template,
+            "label_field": row.get("label_field")
+        }
+        for row in settings.doctype_settings
+        if row.is_enabled and row.get("auto_generate")
+    }
+
+def _key():
+    return frappe.cache().make_key(QUEUE_KEY)
+
+def _raw():
+    # RedisWrapper's set and hash helpers prefix keys themselves (and its spop pops a
+    # single member), so commands on the prefixed keys go through a plain pipeline
+    return frappe.cache().pipeline()
@@ -0,0 +1,233 @@
+import csv
+import hashlib
+import io
+import os
+
+import frappe
+from frappe import _
+from frappe.utils import get_url, now_datetime
+from frappe.utils.background_jobs import is_job_enqueued
+from frappe.utils.file_manager import save_file
+
+from qr_suite.utils.expiry_scheduler import unschedule_expiry
+from qr_suite.utils.resolution_cache import invalidate_tokens
+from qr_suite.utils.tokens import mint_tokens
+
+OPERATIONS = ("Revoke", "Reissue", "Rotate Tokens")
+
+# Links per keyset page, set-based UPDATE and commit
+CHUNK_SIZE = 500
+
+# Options a reissued link inherits from the link it replaces; expiry is not one of
+# them, so a reissued link gets a fresh one from its template
+REISSUE_FIELDS = [
+    "qr_type", "qr_template", "target_doctype", "target_name", "action", "url_mode",
+    "qr_content", "custom_url_prefix", "extra_params", "include_label", "label_text"
+]
+
+# What drawing a link's image reads
+IMAGE_FIELDS = [
+    "name", "qr_type", "qr_template", "qr_url", "token", "target_doctype", "target_name",
+    "action", "qr_content", "include_label", "label_text"
+]
+
+MAPPING_COLUMNS = ["old_qr_link", "old_token", "new_qr_link", "new_token"]
+
+def enqueue_bulk_operation(operation, filters):
+    """Queue a bulk operation over the Active QR Links matching filters"""
+    if operation not in OPERATIONS:
+        frappe.throw(_("Operation must be one of {0}").format(", ".join(OPERATIONS)))
+
+    filters = frappe.parse_json(filters) if filters else {}
+    total = frappe.db.count("QR Link", _active(filters))
+
+    # One queued run per operation and filter set; a different filter set gets its own job
+    filters_hash = hashlib.sha1(frappe.as_json(filters).encode()).hexdigest()[:12]
+    job_id = f"qr_suite_bulk_{frappe.scrub(operation)}_{filters_hash}"
+    if is_job_enqueued(job_id):
+        frappe.throw(_("QR {0} is already queued or running for these filters").format(_(operation)))
+
+    frappe.enqueue(
+        "qr_suite.utils.bulk_operations.run_bulk_operation",
+        queue="long",
+        timeout=6 * 3600,
+        job_id=job_id,
+        operation=operation,
+        filters=filters,
+        notify_user=frappe.session.user
+    )
+    return {"queued": True, "operation": operation, "total": total}
+
+def run_bulk_operation(operation, filters, notify_user=None):
+    """
+    Background job: apply operation to the matching Active QR Links in chunks
+    Revoke and the revoke half of Reissue are set-based UPDATEs; Rotate Tokens mints a
+    chunk of tokens and writes them in one UPDATE. Each chunk is one transaction, and
+    Reissue and Rotate Tokens append that chunk's old-to-new token mapping to a private
+    CSV file before it commits, so the mapping covers every committed change even if
+    the run fails part-way.
+    """
+    # Links created from here on (reissued ones included) are out of scope
+    filters = [*_active(filters), ["creation", "<=", now_datetime()]]
+    total = frappe.db.count("QR Link", filters)
+    title = _("QR {0}").format(_(operation))
+    mapping_file = None
+    done = 0
+
+    try:
+        for rows in iter_qr_links(filters):
+            if operation == "Revoke":
+                revoke_links(rows)
+            elif operation == "Reissue":
+                revoke_links(rows)
+                mapping_file = save_mapping(operation, reissue_links(rows), mapping_file)
+            else:
+                mapping_file = save_mapping(operation, rotate_tokens(rows), mapping_file)
+            frappe.db.commit()
+
+            done += len(rows)
+            frappe.publish_progress(done * 100 / (total or 1), title=title,
+                description=_("{0} of {1} QR Links").format(done, total))
+    except Exception:
+        frappe.db.rollback()
+        if notify_user:
+            frappe.publish_realtime("msgprint",
+                _notification(_("{0} failed after {1} QR Links").format(title, done), mapping_file), user=notify_user)
+        raise
+
+    summary = {"operation": operation, "processed": done}
+    if mapping_file:
+        summary["mapping_file"] = mapping_file.file_url
+
+    if notify_user:
+        frappe.publish_realtime("msgprint",
+            _notification(_("{0}: {1} QR Links processed").format(title, done), mapping_file), user=notify_user)
+    return summary
+
+def _notification(message, mapping_file):
+    if mapping_file:
+        message += f'<br><a href="{mapping_file.file_url}">{_("Download old-to-new token mapping")}</a>'
+    return message
+
+def iter_qr_links(filters):
+    """Yield chunks of matching QR Links in name order"""
+    cursor = ""
+    while True:
+        rows = frappe.get_all("QR Link",
+            filters=[*filters, ["name", ">", cursor]],
+            fields=["name", "token", "qr_code_image", *REISSUE_FIELDS],
+            order_by="name asc",
+            limit_page_length=CHUNK_SIZE
+        )
+        if not rows:
+            break
+        cursor = rows[-1].name
+        yield rows
+
+def revoke_links(rows):
+    frappe.db.sql("""
+        UPDATE `tabQR Link`
+        SET status = 'Revoked', idempotency_key = NULL, modified = %s
+        WHERE name IN %s AND status = 'Active'
+    """, (now_datetime(), tuple(row.name for row in rows)))
+    tokens = [row.token for row in rows]
+    names = [row.name for row in rows]
+    frappe.db.after_commit.add(lambda: invalidate_tokens(tokens))
+    frappe.db.after_commit.add(lambda: unschedule_expiry(names))
+
+def reissue_links(rows):
+    """Create a fresh link (new name, token and image) for each revoked row"""
+    mapping = []
+    tokens = iter(mint_tokens(len(rows)))
+    for row in rows:
+        qr_link = frappe.new_doc("QR Link")
+        qr_link.update({field: row.get(field) for field in REISSUE_FIELDS})
+        if qr_link.qr_type == "Document QR" and qr_link.url_mode == "token":
+            qr_link.token = next(tokens)
+        qr_link.flags.idempotent = True
+        qr_link.insert(ignore_permissions=True)
+        if row.qr_code_image:
+            _attach_image(qr_link)
+        mapping.append([row.name, row.token, qr_link.name, qr_link.token])
+    return mapping
+
+def rotate_tokens(rows):
+    """Give token-mode links new tokens in one UPDATE; the links keep their names"""
+    rows = [row for row in rows if row.qr_type == "Document QR" and row.url_mode == "token"]
+    if not rows:
+        return []
+
+    tokens = dict(zip([row.name for row in rows], mint_tokens(len(rows)), strict=True))
+    names = tuple(tokens)
+    token_cases = " ".join(["WHEN %s THEN %s"] * len(names))
+    values = [v for name in names for v in (name, tokens[name])]
+    url_values = [v for name in names for v in (name, f"{get_url()}/qr?token={tokens[name]}")]
+    frappe.db.sql(f"""
+        UPDATE `tabQR Link`
+        SET token = CASE name {token_cases} END,
+            qr_url = CASE name {token_cases} END,
+            modified = %s
+        WHERE name IN %s
+    """, (*values, *url_values, now_datetime(), names))
+    old_tokens = [row.token for row in rows]
+    frappe.db.after_commit.add(lambda: invalidate_tokens(old_tokens))
+
+    # The token is part of the encoded URL, so existing images are redrawn, by one
+    # job per chunk once the new tokens are committed
+    redraw = [row.name for row in rows if row.qr_code_image]
+    if redraw:
+        frappe.enqueue(
+            "qr_suite.utils.bulk_operations.redraw_qr_images",
+            queue="long",
+            names=redraw,
+            enqueue_after_commit=True
+        )
+
+    return [[row.name, row.token, row.name, tokens[row.name]] for row in rows]
+
+def redraw_qr_images(names):
+    """Background job: redraw the images of a chunk of links, read in one query"""
+    for qr_link in frappe.get_all("QR Link", filters={"name": ["in", names]}, fields=IMAGE_FIELDS):
+        _attach_image(qr_link)
+
+def save_mapping(operation, mapping, file_doc=None):
+    """
+    Write mapping rows to the run's CSV file in the current transaction
+    The first chunk creates the private File; later chunks append to it.
+    """
+    if not mapping:
+        return file_doc
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    if not file_doc:
+        writer.writerow(MAPPING_COLUMNS)
+    writer.writerows(mapping)
+
+    if not file_doc:
+        filename = f"qr-{frappe.scrub(operation).replace('_', '-')}-{now_datetime().strftime('%Y%m%d%H%M%S')}.csv"
+        return save_file(filename, out.getvalue().encode(), "QR Settings", "QR Settings", is_private=1)
+
+    path = file_doc.get_full_path()
+    with open(path, "a", newline="") as f:
+        f.write(out.getvalue())
+    file_doc.db_set("file_size", os.path.getsize(path), update_modified=False)
+    return file_doc
+
+def _attach_image(qr_link):
+    from qr_suite.utils.qr_code_generator import generate_qr_image
+
+    try:
+        result = generate_qr_image(qr_link)
+        if result.get("file_url"):
+            frappe.db.set_value("QR Link", qr_link.name, "qr_code_image", result["file_url"], update_modified=False)
+    except Exception as e:
+        frappe.log_error(f"QR image generation failed for {qr_link.name}: {e!s}", "QR Bulk Operation")
+
+def _active(filters):
+    """Normalise dict or list filters to a list and restrict them to Active links"""
+    if isinstance(filters, dict):
+        filters = [[key, "=", value] if not isinstance(value, (list, tuple)) else [key, *value]
+            for key, value in filters.items()]
+    filters = [f[1:] if len(f) == 4 else f for f in (filters or [])]
+    return [f for f in filters if f[0] != "status"] + [["status", "=", "Active"]]
@@ -0,0 +1,97 @@
+import frappe
+from frappe.utils import get_datetime, now_datetime
+
+# Redis sorted set: QR Link name scored by its expires_on timestamp
+SCHEDULE_KEY = "qr_suite_expiry_schedule"
+
+# Links popped and expired per iteration
+BATCH_SIZE = 1000
+
+# Active links read per query when rebuilding the schedule
+REBUILD_CHUNK_SIZE = 10000
+
+def schedule_expiry(qr_link, expires_on):
+    """Add or move a link in the expiry schedule"""
+    frappe.cache().zadd(_key(), {qr_link: get_datetime(expires_on).timestamp()})
+
+def unschedule_expiry(qr_links):
+    if qr_links:
+        frappe.cache().zrem(_key(), *qr_links)
+
+def sync_expiry_schedule(doc):
+    """Keep a QR Link's schedule entry in line with its status and expires_on"""
+    if doc.status == "Active" and doc.expires_on:
+        schedule_expiry(doc.name, doc.expires_on)
+    else:
+        unschedule_expiry([doc.name])
+
+def process_due_expiries():
+    """
+    Every minute: expire the links whose expires_on has passed
+    Only due entries are read from the schedule, so a run with nothing
+    due is a single ZRANGEBYSCORE.
+    """
+    from qr_suite.tasks import expire_qr_links
+
+    # A run that overlaps a slow previous one would pop and expire the same batch
+    lock = frappe.cache().lock(frappe.cache().make_key("qr_suite_expiry_schedule_lock"), timeout=600)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        now = now_datetime()
+        while True:
+            due = frappe.cache().zrangebyscore(_key(), "-inf", now.timestamp(), start=0, num=BATCH_SIZE)
+            if not due:
+                break
+
+            names = [frappe.safe_decode(name) for name in due]
+            rows = frappe.get_all("QR Link",
+                filters={"name": ["in", names], "status": "Active"},
+                fields=["name", "token"]
+            )
+            if rows:
+                expire_qr_links(rows, now)
+
+            # Entries for links that are gone or no longer Active are simply dropped
+            unschedule_expiry(names)
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+def rebuild_expiry_schedule():
+    """
+    Reload the schedule from the database (after migrate and weekly), so entries
+    lost with a Redis flush are restored. Links already due are expired first.
+    The new schedule is built under a temporary key and renamed over the live one,
+    so process_due_expiries never reads a half-built schedule.
+    """
+    from qr_suite.tasks import cleanup_expired_qr_codes
+
+    cleanup_expired_qr_codes()
+
+    building = frappe.cache().make_key(f"{SCHEDULE_KEY}_rebuild")
+    frappe.cache().delete(building)
+    last_name = ""
+    while True:
+        rows = frappe.db.sql("""
+            SELECT name, expires_on FROM `tabQR Link`
+            WHERE status = 'Active' AND expires_on IS NOT NULL AND name > %s
+            ORDER BY name
+            LIMIT %s
+        """, (last_name, REBUILD_CHUNK_SIZE), as_dict=True)
+        if not rows:
+            break
+        frappe.cache().zadd(building, {row.name: get_datetime(row.expires_on).timestamp() for row in rows})
+        last_name = rows[-1].name
+
+    # RENAME needs the source key, which is never created when nothing expires
+    if last_name:
+        frappe.cache().rename(building, _key())
+    else:
+        frappe.cache().delete(_key())
+
+def _key():
+    return frappe.cache().make_key(SCHEDULE_KEY)
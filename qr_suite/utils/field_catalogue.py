@@ -0,0 +1,117 @@
+import frappe
+
+# Redis hash holding one catalogue entry per enabled doctype
+CATALOGUE_KEY = "qr_suite_field_catalogue"
+
+# Field types that make sense to encode in a Value QR
+SUITABLE_FIELDTYPES = ("Data", "Link", "Select", "Int", "Float", "Currency", "Barcode")
+
+def get_doctype_fields(doctype):
+    """Return QR-encodable fields for a doctype, served from the catalogue"""
+    entry = _get_entry(doctype)
+    if entry is None:
+        entry = _build_entry(doctype)
+        frappe.cache().hset(CATALOGUE_KEY, doctype, entry)
+    return entry["fields"]
+
+def get_field_catalogue(doctypes=None):
+    """
+    Return {doctype: fields} for the given doctypes (default: all enabled)
+    Missing or stale entries are rebuilt on the fly and written back
+    """
+    if doctypes is None:
+        doctypes = _get_enabled_doctype_names()
+
+    cached = _get_all_entries()
+    catalogue = {}
+    for doctype in doctypes:
+        entry = cached.get(doctype)
+        if entry is None:
+            entry = _build_entry(doctype)
+            frappe.cache().hset(CATALOGUE_KEY, doctype, entry)
+        catalogue[doctype] = entry["fields"]
+
+    return catalogue
+
+def build_field_catalogue(doctypes=None):
+    """
+    (Re)build catalogue entries for enabled doctypes
+    Entries whose DocType `modified` stamp is unchanged are kept as-is, so
+    running this after every migrate only pays for doctypes that changed.
+    """
+    try:
+        if doctypes is None:
+            doctypes = _get_enabled_doctype_names()
+        if not doctypes:
+            return 0
+
+        versions = dict(frappe.get_all("DocType",
+            filters={"name": ["in", doctypes]},
+            fields=["name", "modified"],
+            as_list=True
+        ))
+        cached = _get_all_entries()
+
+        rebuilt = 0
+        for doctype in doctypes:
+            version = str(versions.get(doctype) or "")
+            entry = cached.get(doctype)
+            if entry and entry.get("version") == version:
+                continue
+            frappe.cache().hset(CATALOGUE_KEY, doctype, _build_entry(doctype, version))
+            rebuilt += 1
+
+        # Drop entries for doctypes that are no longer enabled
+        for doctype in set(cached) - set(doctypes):
+            frappe.cache().hdel(CATALOGUE_KEY, doctype)
+
+        return rebuilt
+    except Exception as e:
+        frappe.log_error(f"Error building field catalogue: {e!s}", "QR Field Catalogue")
+        return 0
+
+def invalidate_field_catalogue(doctype=None):
+    """Drop one doctype's entry, or the whole catalogue"""
+    if doctype:
+        frappe.cache().hdel(CATALOGUE_KEY, doctype)
+    else:
+        frappe.cache().delete_value(CATALOGUE_KEY)
+
+def on_meta_change(doc, method=None):
+    """doc_events handler for DocType, Custom Field and Property Setter"""
+    if doc.doctype == "DocType":
+        doctype = doc.name
+    elif doc.doctype == "Custom Field":
+        doctype = doc.dt
+    else:
+        doctype = doc.doc_type
+
+    if doctype:
+        invalidate_field_catalogue(doctype)
+
+def _build_entry(doctype, version=None):
+    meta = frappe.get_meta(doctype)
+    fields = [
+        {
+            "label": field.label,
+            "fieldname": field.fieldname,
+            "fieldtype": field.fieldtype
+        }
+        for field in meta.fields
+        if field.fieldtype in SUITABLE_FIELDTYPES and not field.hidden
+    ]
+    return {
+        "version": version if version is not None else str(meta.modified or ""),
+        "fields": fields
+    }
+
+def _get_entry(doctype):
+    return frappe.cache().hget(CATALOGUE_KEY, doctype)
+
+def _get_all_entries():
+    entries = frappe.cache().hgetall(CATALOGUE_KEY) or {}
+    return {frappe.safe_decode(key): value for key, value in entries.items()}
+
+def _get_enabled_doctype_names():
+    from qr_suite.qr_suite.doctype.qr_settings.qr_settings import get_enabled_doctypes
+    return [dt["name"] for dt in get_enabled_doctypes()]
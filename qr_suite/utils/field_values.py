@@ -0,0 +1,41 @@
+import frappe
+from frappe.model import default_fields, no_value_fields
+
+# Upper bound on names per IN (...) query when fetching in bulk
+BATCH_SIZE = 5000
+
+def get_field_value(doctype, name, fieldname):
+    """Read a single column of a document without loading the document or its child tables"""
+    if fieldname == "name":
+        return name
+    if not is_column(doctype, fieldname):
+        return None
+    return frappe.db.get_value(doctype, name, fieldname)
+
+def get_field_values(doctype, names, fieldname):
+    """
+    Read one column for many documents
+    Returns {name: value}; names that do not exist are left out.
+    """
+    names = list(dict.fromkeys(names))
+    if fieldname == "name":
+        return {name: name for name in names}
+    if not names or not is_column(doctype, fieldname):
+        return {}
+
+    values = {}
+    for i in range(0, len(names), BATCH_SIZE):
+        rows = frappe.get_all(doctype,
+            filters={"name": ["in", names[i:i + BATCH_SIZE]]},
+            fields=["name", fieldname],
+            as_list=True
+        )
+        values.update(rows)
+    return values
+
+def is_column(doctype, fieldname):
+    """Whether fieldname is stored as a column on the doctype's own table"""
+    if fieldname in default_fields:
+        return True
+    field = frappe.get_meta(doctype).get_field(fieldname)
+    return bool(field) and field.fieldtype not in no_value_fields
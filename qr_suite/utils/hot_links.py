@@ -0,0 +1,75 @@
+from collections import Counter
+
+import frappe
+from frappe.utils import add_to_date, now_datetime
+
+KEY_PREFIX = "qr_suite_hot"
+
+# Links tracked per bucket; memory is bounded by this, whatever the scan volume
+CAPACITY = 200
+
+# window -> (bucket granularity, number of buckets)
+WINDOWS = {
+    "5m": ("minute", 5),
+    "1h": ("minute", 60),
+    "24h": ("hour", 24)
+}
+
+BUCKET_TTL = {
+    "minute": 65 * 60,
+    "hour": 25 * 3600
+}
+
+# Space-Saving update on one bucket (a sorted set of link -> count). When the
+# bucket is full, the least counted link is evicted and the newcomer inherits
+# its count + 1, so counts are upper bounds and true heavy hitters never drop out.
+SPACE_SAVING_LUA = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if score then
+    redis.call('ZINCRBY', KEYS[1], 1, ARGV[1])
+elseif redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], 1, ARGV[1])
+else
+    local lowest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    redis.call('ZREM', KEYS[1], lowest[1])
+    redis.call('ZADD', KEYS[1], tonumber(lowest[2]) + 1, ARGV[1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+"""
+
+_script = None
+
+def record_hot_scan(qr_link, when=None):
+    """Count a scan in the current minute and hour buckets"""
+    global _script
+    if _script is None:
+        _script = frappe.cache().register_script(SPACE_SAVING_LUA)
+
+    when = when or now_datetime()
+    pipe = frappe.cache().pipeline()
+    for granularity, ttl in BUCKET_TTL.items():
+        _script(keys=[bucket_key(granularity, when)], args=[qr_link, CAPACITY, ttl], client=pipe)
+    pipe.execute()
+
+def get_hot_links(window="5m", limit=20):
+    """Return [(qr_link, approx_scans)] for the most scanned links in the window"""
+    granularity, buckets = WINDOWS[window]
+    now = now_datetime()
+    step = {"minutes": -1} if granularity == "minute" else {"hours": -1}
+
+    pipe = frappe.cache().pipeline()
+    when = now
+    for _ in range(buckets):
+        pipe.zrange(bucket_key(granularity, when), 0, -1, withscores=True)
+        when = add_to_date(when, **step)
+
+    totals = Counter()
+    for bucket in pipe.execute():
+        for member, score in bucket:
+            totals[frappe.safe_decode(member)] += int(score)
+
+    return totals.most_common(limit)
+
+def bucket_key(granularity, when):
+    fmt = "%Y%m%d%H%M" if granularity == "minute" else "%Y%m%d%H"
+    return frappe.cache().make_key(f"{KEY_PREFIX}:{granularity}:{when.strftime(fmt)}")
@@ -0,0 +1,44 @@
+import frappe
+from frappe.utils import getdate
+
+KEY_PREFIX = "qr_suite_hll"
+
+# Per-day sketches are kept a little over a year
+DAY_TTL = 400 * 24 * 3600
+
+def record_unique_scan(qr_link, target_doctype, action, user, ip, when=None):
+    """Add a scan's user and IP to the per-link and per-day sketches"""
+    day = str(getdate(when))
+    updates = []
+    for kind, value in (("users", user), ("ips", ip)):
+        if not value:
+            continue
+        updates += [
+            (link_key(qr_link, kind), value, None),
+            (day_key(day, target_doctype, action, kind), value, DAY_TTL)
+        ]
+
+    pipe = frappe.cache().pipeline()
+    for key, value, ttl in updates:
+        pipe.pfadd(key, value)
+        if ttl:
+            pipe.expire(key, ttl)
+    pipe.execute()
+
+def count_unique(keys):
+    """Approximate number of distinct members across the union of sketches"""
+    if not keys:
+        return 0
+    return frappe.cache().pfcount(*keys)
+
+def get_link_unique_counts(qr_link):
+    return {
+        "unique_users": count_unique([link_key(qr_link, "users")]),
+        "unique_ips": count_unique([link_key(qr_link, "ips")])
+    }
+
+def link_key(qr_link, kind):
+    return frappe.cache().make_key(f"{KEY_PREFIX}:link:{qr_link}:{kind}")
+
+def day_key(day, target_doctype, action, kind):
+    return frappe.cache().make_key(f"{KEY_PREFIX}:day:{day}:{target_doctype or ''}:{action or ''}:{kind}")
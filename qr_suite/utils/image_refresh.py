@@ -0,0 +1,236 @@
+import time
+
+import frappe
+from frappe.utils.caching import site_cache
+
+# Redis sorted set of "<doctype>\x1f<name>" scored by when its QR images are due
+# for a redraw. Each change pushes the score back, so a burst of edits to one
+# document ends in a single render once it has been quiet for DEBOUNCE_SECONDS.
+SCHEDULE_KEY = "qr_suite_image_refresh"
+
+# Redis hash of doctype -> fields whose changes make its QR images stale
+WATCHED_FIELDS_KEY = "qr_suite_image_watched_fields"
+
+# Redis hash of failed attempts per scheduled member
+ATTEMPTS_KEY = "qr_suite_image_refresh_attempts"
+
+DEBOUNCE_SECONDS = 30
+
+# A failed redraw is scheduled again this much later, up to MAX_ATTEMPTS times
+RETRY_SECONDS = 300
+MAX_ATTEMPTS = 5
+
+# Attempt counts are forgotten after a day without new failures
+ATTEMPTS_TTL = 24 * 3600
+
+# Documents refreshed per batch
+BATCH_SIZE = 200
+
+# Seconds each worker keeps its copy of the enabled DocTypes before reading QR Settings again
+ENABLED_DOCTYPES_TTL = 60
+
+SEPARATOR = "\x1f"
+
+def get_watched_fields(doctype):
+    """Value fields of the templates used by the doctype's active Value QR links, plus its label field"""
+    return frappe.cache().hget(WATCHED_FIELDS_KEY, doctype, generator=lambda: _build_watched_fields(doctype))
+
+def clear_watched_fields(doctype=None):
+    if doctype:
+        frappe.cache().hdel(WATCHED_FIELDS_KEY, doctype)
+    else:
+        frappe.cache().delete_value(WATCHED_FIELDS_KEY)
+        _enabled_doctypes.clear_cache()
+
+@site_cache(ttl=ENABLED_DOCTYPES_TTL)
+def _enabled_doctypes():
+    """DocTypes enabled in QR Settings, kept in process so saves of other DocTypes skip Redis"""
+    return frozenset(frappe.get_all("QR Settings Detail",
+        filters={"parent": "QR Settings", "parenttype": "QR Settings", "is_enabled": 1},
+        pluck="doctype_name"
+    ))
+
+def on_document_update(doc, method=None):
+    """doc_events on_update handler for every DocType: schedule a redraw when a watched field changed"""
+    if frappe.flags.in_install or frappe.flags.in_migrate:
+        return
+    if doc.doctype not in _enabled_doctypes():
+        return
+
+    fields = get_watched_fields(doc.doctype)
+    if not fields:
+        return
+
+    previous = doc.get_doc_before_save()
+    if previous and any(doc.get(field) != previous.get(field) for field in fields):
+        schedule_refresh(doc.doctype, doc.name)
+
+def schedule_refresh(doctype, name):
+    """(Re)schedule a document's redraw once the current transaction commits; a rollback discards it"""
+    if frappe.flags.qr_image_refresh_pending is None:
+        frappe.flags.qr_image_refresh_pending = set()
+        frappe.db.after_commit.add(_flush_pending)
+        frappe.db.after_rollback.add(_discard_pending)
+    frappe.flags.qr_image_refresh_pending.add(f"{doctype}{SEPARATOR}{name}")
+
+def process_image_refreshes():
+    """Every minute: redraw the QR images of documents that have been quiet for DEBOUNCE_SECONDS"""
+    lock = frappe.cache().lock(frappe.cache().make_key("qr_suite_image_refresh_lock"), timeout=3600)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        while True:
+            due = frappe.cache().zrangebyscore(_key(), "-inf", time.time(), start=0, num=BATCH_SIZE)
+            if not due:
+                break
+
+            # Taken off the schedule first, so an edit made while rendering schedules another
+            # pass; failures are put back below
+            frappe.cache().zrem(_key(), *due)
+
+            by_doctype = {}
+            for member in due:
+                doctype, name = frappe.safe_decode(member).split(SEPARATOR, 1)
+                by_doctype.setdefault(doctype, []).append(name)
+
+            failed = []
+            for doctype, names in by_doctype.items():
+                try:
+                    failed_names = refresh_qr_images(doctype, names)
+                    frappe.db.commit()
+                except Exception as e:
+                    frappe.db.rollback()
+                    frappe.log_error(f"QR image refresh failed for {doctype}: {e!s}", "QR Image Refresh")
+                    failed_names = names
+                failed += [f"{doctype}{SEPARATOR}{name}" for name in failed_names]
+            _reschedule_failed(failed)
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+def refresh_qr_images(doctype, names):
+    """
+    Bring content and label of the documents' active QR Links up to date and redraw the changed ones
+    Each link is updated under a savepoint; returns the target names that failed.
+    """
+    from qr_suite.utils.field_values import get_field_values
+    from qr_suite.utils.qr_code_generator import generate_qr_image
+    from qr_suite.utils.template_options import get_template_options
+
+    links = frappe.get_all("QR Link",
+        filters={"target_doctype": doctype, "target_name": ["in", names], "status": "Active"},
+        fields=["name", "target_name", "qr_type", "qr_template", "include_label"]
+    )
+    if not links:
+        return []
+
+    # One query per watched field for the whole batch
+    label_field = get_label_field(doctype)
+    value_fields = {
+        link.qr_template: get_template_options(link.qr_template).value_field
+        for link in links
+        if link.qr_type == "Value QR" and get_template_options(link.qr_template)
+    }
+    columns = {field: get_field_values(doctype, names, field)
+        for field in {label_field, *value_fields.values()} if field}
+
+    failed = []
+    for link in links:
+        updates = {}
+        value_field = value_fields.get(link.qr_template)
+        if value_field and columns[value_field].get(link.target_name):
+            updates["qr_content"] = str(columns[value_field][link.target_name])
+        if label_field and link.include_label and columns[label_field].get(link.target_name):
+            updates["label_text"] = str(columns[label_field][link.target_name])
+
+        qr_link = frappe.get_doc("QR Link", link.name)
+        updates = {k: v for k, v in updates.items() if qr_link.get(k) != v}
+        if not updates:
+            continue
+
+        frappe.db.savepoint("qr_image_refresh")
+        try:
+            # QR Link.validate re-keys the link, or takes it out of reuse if another
+            # active link already encodes the new value
+            qr_link.update(updates)
+            qr_link.save(ignore_permissions=True)
+
+            result = generate_qr_image(qr_link)
+            if result.get("file_url"):
+                frappe.db.set_value("QR Link", qr_link.name, "qr_code_image", result["file_url"], update_modified=False)
+        except Exception as e:
+            frappe.db.rollback(save_point="qr_image_refresh")
+            frappe.log_error(f"QR image refresh failed for {qr_link.name}: {e!s}", "QR Image Refresh")
+            failed.append(link.target_name)
+    return sorted(set(failed))
+
+def get_label_field(doctype):
+    settings = frappe.get_cached_doc("QR Settings", "QR Settings")
+    for row in settings.doctype_settings:
+        if row.doctype_name == doctype and row.is_enabled:
+            return row.get("label_field")
+
+def _build_watched_fields(doctype):
+    from qr_suite.utils.template_options import get_template_options
+
+    settings = frappe.get_cached_doc("QR Settings", "QR Settings")
+    if not any(row.doctype_name == doctype and row.is_enabled for row in settings.doctype_settings):
+        return []
+
+    fields = set()
+    # Walks the (target_doctype, status) index
+    for template in frappe.get_all("QR Link",
+        filters={"target_doctype": doctype, "status": "Active", "qr_type": "Value QR", "qr_template": ["is", "set"]},
+        pluck="qr_template", distinct=True
+    ):
+        options = get_template_options(template)
+        if options and options.value_field:
+            fields.add(options.value_field)
+
+    label_field = get_label_field(doctype)
+    if label_field:
+        fields.add(label_field)
+    return sorted(fields)
+
+def _flush_pending():
+    pending = frappe.flags.pop("qr_image_refresh_pending", None)
+    if pending:
+        due = time.time() + DEBOUNCE_SECONDS
+        frappe.cache().zadd(_key(), {member: due for member in pending})
+
+def _discard_pending():
+    frappe.flags.pop("qr_image_refresh_pending", None)
+
+def _reschedule_failed(members):
+    """Put failed redraws back RETRY_SECONDS later until they have failed MAX_ATTEMPTS times"""
+    if not members:
+        return
+    attempts_key = frappe.cache().make_key(ATTEMPTS_KEY)
+    pipe = frappe.cache().pipeline()
+    for member in members:
+        pipe.hincrby(attempts_key, member, 1)
+    pipe.expire(attempts_key, ATTEMPTS_TTL)
+    attempts = pipe.execute()[:-1]
+
+    retry = [member for member, count in zip(members, attempts, strict=True) if count < MAX_ATTEMPTS]
+    dropped = [member for member, count in zip(members, attempts, strict=True) if count >= MAX_ATTEMPTS]
+    pipe = frappe.cache().pipeline()
+    if retry:
+        # nx keeps an edit made during the run on its own, earlier schedule
+        due = time.time() + RETRY_SECONDS
+        pipe.zadd(_key(), {member: due for member in retry}, nx=True)
+    if dropped:
+        pipe.hdel(attempts_key, *dropped)
+    pipe.execute()
+    if dropped:
+        frappe.log_error(
+            f"Dropped after {MAX_ATTEMPTS} failed redraws:\n"
+                + "\n".join(m.replace(SEPARATOR, " ") for m in dropped),
+            "QR Image Refresh"
+        )
+
+def _key():
+    return frappe.cache().make_key(SCHEDULE_KEY)
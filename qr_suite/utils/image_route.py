@@ -0,0 +1,110 @@
+import mimetypes
+import re
+from zoneinfo import ZoneInfo
+
+import frappe
+from frappe.utils import get_datetime, get_system_timezone
+from frappe.website.page_renderers.base_renderer import BaseRenderer
+from werkzeug.http import http_date, parse_date
+from werkzeug.utils import send_file
+from werkzeug.wrappers import Response
+
+# /qr-image/<File.content_hash>.<ext>: the URL names the bytes, so a response
+# can be cached forever and revalidated from the URL alone
+ROUTE = re.compile(r"^qr-image/([0-9a-f]{32})\.(png|jpe?g)$")
+
+# Redis hash of content hash -> (file_url, modified timestamp)
+FILES_KEY = "qr_suite_image_files"
+
+MAX_AGE = 365 * 24 * 3600
+
+def get_image_url(content_hash, file_url):
+    """Cache-friendly URL for a QR image File"""
+    extension = (file_url or "").rsplit(".", 1)[-1].lower()
+    return f"/qr-image/{content_hash}.{extension if extension in ('png', 'jpg', 'jpeg') else 'png'}"
+
+def get_image_url_for_file(file_url):
+    """Cache-friendly URL for a QR Link image given its file_url, or None if it is not a public QR image"""
+    if not file_url:
+        return None
+    content_hash = frappe.db.get_value("File",
+        {"file_url": file_url, "attached_to_doctype": "QR Link", "is_private": 0}, "content_hash")
+    return get_image_url(content_hash, file_url) if content_hash else None
+
+def ensure_content_hash_index():
+    """File lookups by content hash need an index; core File does not always have one"""
+    if not frappe.db.sql("SHOW INDEX FROM `tabFile` WHERE Column_name = 'content_hash'"):
+        frappe.db.add_index("File", ["content_hash"])
+
+class QRImageRenderer(BaseRenderer):
+    """page_renderer for /qr-image/<hash>.<ext>"""
+
+    def can_render(self):
+        return bool(ROUTE.match(self.path))
+
+    def render(self):
+        content_hash = ROUTE.match(self.path).group(1)
+        return serve_qr_image(content_hash, frappe.request)
+
+def serve_qr_image(content_hash, request):
+    """
+    Serve a public QR image File by content hash with immutable caching headers
+    If-None-Match and If-Modified-Since are answered from the URL and the cached file
+    entry without touching disk; Range requests are handled by send_file.
+    """
+    etag = f'"{content_hash}"'
+    if etag in (request.headers.get("If-None-Match") or ""):
+        return _not_modified(etag)
+
+    entry = get_image_file(content_hash)
+    if not entry:
+        return Response("Not Found", status=404, mimetype="text/plain")
+
+    file_url, modified = entry
+    # File.modified is in the system time zone; HTTP dates are UTC
+    last_modified = get_datetime(modified).replace(microsecond=0, tzinfo=ZoneInfo(get_system_timezone()))
+    since = parse_date(request.headers.get("If-Modified-Since"))
+    if since and last_modified <= since:
+        return _not_modified(etag, last_modified)
+
+    try:
+        response = send_file(
+            frappe.get_site_path("public", file_url.lstrip("/")),
+            request.environ,
+            mimetype=mimetypes.guess_type(file_url)[0] or "image/png",
+            conditional=True,
+            etag=content_hash,
+            last_modified=last_modified,
+            max_age=MAX_AGE
+        )
+    except FileNotFoundError:
+        frappe.cache().hdel(FILES_KEY, content_hash)
+        return Response("Not Found", status=404, mimetype="text/plain")
+
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+def get_image_file(content_hash):
+    """(file_url, modified) of a public QR Link image with this content hash, cached in Redis"""
+    def load():
+        row = frappe.db.get_value("File",
+            {"content_hash": content_hash, "attached_to_doctype": "QR Link", "is_private": 0},
+            ["file_url", "modified"]
+        )
+        return (row[0], str(row[1])) if row else None
+
+    entry = frappe.cache().hget(FILES_KEY, content_hash)
+    if entry is None:
+        entry = load()
+        if entry:
+            frappe.cache().hset(FILES_KEY, content_hash, entry)
+    return entry
+
+def _not_modified(etag, last_modified=None):
+    response = Response(status=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = f"public, max-age={MAX_AGE}, immutable"
+    if last_modified:
+        response.headers["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,195 @@
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, now_datetime
+
+from qr_suite.utils.expiry_scheduler import unschedule_expiry
+from qr_suite.utils.resolution_cache import invalidate_tokens
+
+# QR Links read per anti-join query, and revoked / deleted per transaction
+CHUNK_SIZE = 1000
+
+# Files younger than this are left alone; generate_qr_code saves the image before
+# it stores the URL on the link
+FILE_GRACE_HOURS = 1
+
+ORPHAN_ACTIONS = ("Report Only", "Revoke", "Delete")
+
+def collect_garbage(action=None, dry_run=False):
+    """
+    Find QR Links whose target document is gone and QR image Files no link points to,
+    then revoke or delete them in batches. Returns counts of rows and reclaimable bytes.
+    """
+    if action is None:
+        action = frappe.db.get_single_value("QR Settings", "orphan_link_action") or "Report Only"
+    if action not in ORPHAN_ACTIONS:
+        frappe.throw(_("Orphan action must be one of {0}").format(", ".join(ORPHAN_ACTIONS)))
+    dry_run = dry_run or action == "Report Only"
+
+    lock = frappe.cache().lock(frappe.cache().make_key("qr_suite_orphan_gc_lock"), timeout=6 * 3600)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        report = {
+            "action": action,
+            "dry_run": dry_run,
+            "orphaned_links": {},
+            "orphaned_link_bytes": 0,
+            "unreferenced_files": 0,
+            "unreferenced_file_bytes": 0
+        }
+
+        for target_doctype in get_target_doctypes():
+            count = 0
+            # Orphans that are already revoked are only picked up again to be deleted
+            for rows in iter_orphaned_links(target_doctype, include_revoked=action != "Revoke"):
+                count += len(rows)
+                report["orphaned_link_bytes"] += get_attached_bytes([row.name for row in rows])
+                if not dry_run:
+                    if action == "Revoke":
+                        revoke_links(rows)
+                    else:
+                        delete_links(rows)
+            if count:
+                report["orphaned_links"][target_doctype] = count
+
+        # Deleted links leave their images behind, so files are collected after links
+        for files in iter_unreferenced_files():
+            report["unreferenced_files"] += len(files)
+            report["unreferenced_file_bytes"] += sum(f.file_size or 0 for f in files)
+            if not dry_run:
+                delete_files([f.name for f in files])
+
+        report["orphaned_link_total"] = sum(report["orphaned_links"].values())
+        report["reclaimable_bytes"] = report["unreferenced_file_bytes"] + (
+            report["orphaned_link_bytes"] if action == "Delete" else 0)
+
+        if report["orphaned_link_total"] or report["unreferenced_files"]:
+            frappe.logger("qr_suite").info(f"QR orphan GC: {report}")
+        return report
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(f"Error collecting orphaned QR Links: {e!s}", "QR Orphan GC")
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+def run_garbage_collection(action=None, dry_run=False, notify_user=None):
+    """Background job entry point; the report is sent to the requesting user"""
+    report = collect_garbage(action, dry_run)
+    if notify_user and report:
+        frappe.publish_realtime("msgprint", format_gc_report(report), user=notify_user)
+    return report
+
+def format_gc_report(report):
+    lines = [
+        _("Orphaned QR Links: {0}").format(report["orphaned_link_total"]),
+        *(f"&nbsp;&nbsp;{_(doctype)}: {count}" for doctype, count in report["orphaned_links"].items()),
+        _("Unreferenced QR images: {0}").format(report["unreferenced_files"]),
+        _("Reclaimable: {0} MB").format(round(report["reclaimable_bytes"] / 1048576, 2))
+    ]
+    if report["dry_run"]:
+        lines.append(_("Dry run: nothing was changed"))
+    return "<br>".join(lines)
+
+def get_target_doctypes():
+    return frappe.db.sql_list("SELECT DISTINCT target_doctype FROM `tabQR Link` WHERE target_doctype IS NOT NULL")
+
+def iter_orphaned_links(target_doctype, include_revoked=True):
+    """Yield chunks of QR Links for target_doctype whose target row no longer exists"""
+    status_condition = "" if include_revoked else "AND link.status != 'Revoked'"
+    meta = frappe.db.get_value("DocType", target_doctype, ["issingle", "is_virtual"], as_dict=True)
+    if meta and (meta.issingle or meta.is_virtual):
+        return
+
+    if meta and frappe.db.table_exists(target_doctype):
+        # Anti-join against the target table
+        query = f"""
+            SELECT link.name, link.token FROM `tabQR Link` link
+            LEFT JOIN `tab{target_doctype}` target ON target.name = link.target_name
+            WHERE link.target_doctype = %(doctype)s AND target.name IS NULL AND link.name > %(cursor)s
+                {status_condition}
+            ORDER BY link.name
+            LIMIT %(limit)s
+        """
+    else:
+        # The DocType itself was removed: every link to it is orphaned
+        query = f"""
+            SELECT link.name, link.token FROM `tabQR Link` link
+            WHERE link.target_doctype = %(doctype)s AND link.name > %(cursor)s
+                {status_condition}
+            ORDER BY link.name
+            LIMIT %(limit)s
+        """
+
+    cursor = ""
+    while True:
+        rows = frappe.db.sql(query, {
+            "doctype": target_doctype,
+            "cursor": cursor,
+            "limit": CHUNK_SIZE
+        }, as_dict=True)
+        if not rows:
+            break
+        cursor = rows[-1].name
+        yield rows
+
+def iter_unreferenced_files():
+    """
+    Yield chunks of generated QR images attached to QR Link that are not the image of an
+    existing link. Only files named like generate_qr_image output are considered, so
+    attachments users added to QR Links are never collected.
+    """
+    cursor = ""
+    while True:
+        files = frappe.db.sql("""
+            SELECT f.name, f.file_size FROM `tabFile` f
+            LEFT JOIN `tabQR Link` link
+                ON link.name = f.attached_to_name AND link.qr_code_image = f.file_url
+            WHERE f.attached_to_doctype = 'QR Link' AND link.name IS NULL
+                AND f.file_name LIKE 'QR-%%.png'
+                AND f.creation < %(before)s AND f.name > %(cursor)s
+            ORDER BY f.name
+            LIMIT %(limit)s
+        """, {
+            "before": add_to_date(now_datetime(), hours=-FILE_GRACE_HOURS),
+            "cursor": cursor,
+            "limit": CHUNK_SIZE
+        }, as_dict=True)
+        if not files:
+            break
+        cursor = files[-1].name
+        yield files
+
+def get_attached_bytes(qr_links):
+    return frappe.db.sql("""
+        SELECT COALESCE(SUM(file_size), 0) FROM `tabFile`
+        WHERE attached_to_doctype = 'QR Link' AND attached_to_name IN %s
+    """, (tuple(qr_links),))[0][0] or 0
+
+def revoke_links(rows):
+    frappe.db.sql("""
+        UPDATE `tabQR Link`
+        SET status = 'Revoked', idempotency_key = NULL, modified = %s
+        WHERE name IN %s
+    """, (now_datetime(), tuple(row.name for row in rows)))
+    frappe.db.commit()
+    _forget(rows)
+
+def delete_links(rows):
+    # Scan logs are kept for analytics; their link column just stops resolving
+    frappe.db.delete("QR Link", {"name": ["in", [row.name for row in rows]]})
+    frappe.db.commit()
+    _forget(rows)
+
+def delete_files(names):
+    # delete_doc also removes the file from disk
+    for name in names:
+        frappe.delete_doc("File", name, ignore_permissions=True, force=True)
+    frappe.db.commit()
+
+def _forget(rows):
+    invalidate_tokens([row.token for row in rows])
+    unschedule_expiry([row.name for row in rows])
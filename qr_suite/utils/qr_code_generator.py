@@ -3,9 +3,14 @@ import qrcode
 import io
 import base64
 from PIL import Image, ImageDraw, ImageFont
+from frappe import _
 from frappe.utils import get_url
 from frappe.utils.file_manager import save_file
 
+from qr_suite.utils.image_route import get_image_url
+from qr_suite.utils.qr_matrix import get_matrix, matrix_version, render_image
+from qr_suite.utils.template_options import BOX_SIZES, ERROR_LEVELS, get_template_options
+
 def generate_qr_image(qr_link_doc, **kwargs):
     """
     Generate QR code image for a QR Link document
@@ -18,53 +23,17 @@ def generate_qr_image(qr_link_doc, **kwargs):
         if not content:
             frappe.throw("No content to encode in QR code")
         
-        # Get QR settings from kwargs or defaults
-        qr_size = kwargs.get('qr_size', 'Medium')
-        error_correction = kwargs.get('error_correction', 'M')
-        image_format = kwargs.get('image_format', 'PNG')
-        
-        # Map size to box_size
-        size_map = {
-            'Small': 8,
-            'Medium': 10,
-            'Large': 12
-        }
-        box_size = size_map.get(qr_size, 10)
-        
-        # Map error correction
-        error_map = {
-            'L': qrcode.constants.ERROR_CORRECT_L,
-            'M': qrcode.constants.ERROR_CORRECT_M,
-            'Q': qrcode.constants.ERROR_CORRECT_Q,
-            'H': qrcode.constants.ERROR_CORRECT_H
-        }
-        error_level = error_map.get(error_correction, qrcode.constants.ERROR_CORRECT_M)
-        
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=None,  # Auto-size
-            error_correction=error_level,
-            box_size=box_size,
-            border=4,
-        )
-        qr.add_data(content)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
+        # Get QR settings from kwargs, then the link's template, then defaults
+        template = get_template_options(getattr(qr_link_doc, 'qr_template', None))
+        qr_size = kwargs.get('qr_size') or (template.qr_size if template else 'Medium')
+        error_correction = kwargs.get('error_correction') or (template.error_correction if template else 'M')
+        image_format = kwargs.get('image_format') or (template.image_format if template else 'PNG')
         
-        # Convert to RGB if needed
-        if img.mode != 'RGB':
-            img = img.convert('RGB')
+        error_level = ERROR_LEVELS.get(error_correction, qrcode.constants.ERROR_CORRECT_M)
         
-        # Add label if requested
-        if hasattr(qr_link_doc, 'include_label') and qr_link_doc.include_label:
-            label_text = getattr(qr_link_doc, 'label_text', qr_link_doc.target_name)
-            img = add_label_to_qr(img, label_text)
-        elif qr_link_doc.qr_type == "Value QR":
-            # For Value QR, always add label showing what's encoded
-            label_text = qr_link_doc.qr_content or qr_link_doc.target_name
-            img = add_label_to_qr(img, label_text)
+        # Encoded once per content and error level; sizes, formats and labels reuse the matrix
+        matrix = get_qr_matrix(qr_link_doc, content, error_level)
+        img = render_qr_variants(qr_link_doc, [qr_size], matrix=matrix)[qr_size]
         
         # Convert to bytes
         img_byte_arr = io.BytesIO()
@@ -84,6 +53,8 @@ def generate_qr_image(qr_link_doc, **kwargs):
         return {
             "file_url": file_doc.file_url,
             "file_name": file_doc.file_name,
+            "image_url": get_image_url(file_doc.content_hash, file_doc.file_url),
+            "version": matrix_version(matrix),
             "base64": base64.b64encode(img_byte_arr).decode('utf-8')
         }
         
@@ -91,6 +62,55 @@ def generate_qr_image(qr_link_doc, **kwargs):
         frappe.log_error(f"Error generating QR image: {str(e)}", "QR Image Generation")
         frappe.throw(f"Error generating QR image: {str(e)}")
 
+def get_qr_matrix(qr_link_doc, content=None, error_level=qrcode.constants.ERROR_CORRECT_M):
+    """Cached module matrix for a QR Link; generated URLs get an uppercase scheme and host"""
+    return get_matrix(
+        content or get_qr_content(qr_link_doc),
+        error_level,
+        uppercase_host=qr_link_doc.qr_type == "Document QR"
+    )
+
+def render_qr_image(qr_link_doc, matrix, box_size):
+    """PIL image of a QR Link's matrix with its label, if any"""
+    img = render_image(matrix, box_size)
+    
+    # Add label if requested
+    if hasattr(qr_link_doc, 'include_label') and qr_link_doc.include_label:
+        label_text = getattr(qr_link_doc, 'label_text', qr_link_doc.target_name)
+        img = add_label_to_qr(img, label_text)
+    elif qr_link_doc.qr_type == "Value QR":
+        # For Value QR, always add label showing what's encoded
+        label_text = qr_link_doc.qr_content or qr_link_doc.target_name
+        img = add_label_to_qr(img, label_text)
+    
+    return img
+
+def render_qr_variants(qr_link_doc, qr_sizes=("Small", "Medium", "Large"), error_correction="M", matrix=None):
+    """{qr_size: PIL image} of a QR Link for several sizes from a single encode"""
+    if matrix is None:
+        matrix = get_qr_matrix(qr_link_doc, error_level=ERROR_LEVELS.get(error_correction, qrcode.constants.ERROR_CORRECT_M))
+    return {qr_size: render_qr_image(qr_link_doc, matrix, BOX_SIZES.get(qr_size, 10)) for qr_size in qr_sizes}
+
+def render_label_sheet(qr_link_docs, columns=3, qr_size="Medium", error_correction="M"):
+    """One PNG with the labelled QR codes of several links in a grid"""
+    images = [render_qr_variants(doc, [qr_size], error_correction)[qr_size] for doc in qr_link_docs]
+    if not images:
+        frappe.throw(_("No QR Links to print"))
+    
+    columns = max(1, min(columns, len(images)))
+    cell_width = max(img.width for img in images)
+    cell_height = max(img.height for img in images)
+    rows = -(-len(images) // columns)
+    sheet = Image.new('RGB', (cell_width * columns, cell_height * rows), 'white')
+    for i, img in enumerate(images):
+        x = (i % columns) * cell_width + (cell_width - img.width) // 2
+        y = (i // columns) * cell_height
+        sheet.paste(img, (x, y))
+    
+    buffer = io.BytesIO()
+    sheet.save(buffer, format='PNG')
+    return buffer.getvalue()
+
 def get_qr_content(qr_link_doc):
     """Get the content to encode in the QR code"""
     if qr_link_doc.qr_type == "Document QR":
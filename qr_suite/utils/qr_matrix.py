@@ -0,0 +1,87 @@
+import hashlib
+from functools import lru_cache
+
+import frappe
+import numpy as np
+from PIL import Image
+
+from qr_suite.utils.qr_segments import encode
+
+# Encoded module matrices (no quiet zone), bit-packed: one byte with the side
+# length followed by numpy.packbits of the modules. A version 10 symbol is 456 bytes.
+# Encoding (segmenting, Reed-Solomon, mask selection) happens once per content and
+# error correction level; every size, format and label variant is drawn from this.
+KEY_PREFIX = "qr_suite_matrix"
+
+CACHE_TTL = 30 * 24 * 3600
+
+# Matrices kept per worker process
+LOCAL_CACHE_SIZE = 2048
+
+def get_matrix(content, error_level, uppercase_host=False):
+    """Boolean numpy array (True = dark module) for content, from cache or freshly encoded"""
+    return _get_matrix(str(content), error_level, bool(uppercase_host))
+
+@lru_cache(maxsize=LOCAL_CACHE_SIZE)
+def _get_matrix(content, error_level, uppercase_host):
+    key = matrix_key(content, error_level, uppercase_host)
+    packed = _redis_get(key)
+    if packed:
+        matrix = unpack_matrix(packed)
+    else:
+        qr = encode(content, error_level, uppercase_host=uppercase_host, border=0)
+        matrix = np.array(qr.get_matrix(), dtype=bool)
+        _redis_set(key, pack_matrix(matrix))
+    matrix.flags.writeable = False
+    return matrix
+
+def matrix_key(content, error_level, uppercase_host):
+    digest = hashlib.sha1(f"{error_level}|{int(uppercase_host)}|{content}".encode()).hexdigest()
+    return f"{KEY_PREFIX}:{digest}"
+
+def pack_matrix(matrix):
+    return bytes([matrix.shape[0]]) + np.packbits(matrix).tobytes()
+
+def unpack_matrix(packed):
+    n = packed[0]
+    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8, offset=1), count=n * n)
+    return bits.reshape(n, n).astype(bool)
+
+def matrix_version(matrix):
+    return (matrix.shape[0] - 17) // 4
+
+def render_image(matrix, box_size, border=4):
+    """RGB PIL image, box_size pixels per module, black on white"""
+    modules = np.pad(matrix, border)
+    pixels = np.where(modules, 0, 255).astype(np.uint8)
+    pixels = pixels.repeat(box_size, axis=0).repeat(box_size, axis=1)
+    return Image.fromarray(pixels, "L").convert("RGB")
+
+def render_svg(matrix, size, border=4):
+    """SVG markup size CSS pixels wide; one path with a sub-path per horizontal run of dark modules"""
+    path = []
+    for y, row in enumerate(matrix):
+        # Run boundaries of dark modules in this row
+        edges = np.flatnonzero(np.diff(np.concatenate(([False], row, [False])).astype(np.int8)))
+        for start, end in zip(edges[::2], edges[1::2], strict=True):
+            path.append(f"M{start + border} {y + border}h{end - start}v1h-{end - start}z")
+
+    n = matrix.shape[0] + 2 * border
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {n} {n}" shape-rendering="crispEdges">'
+        f'<rect width="{n}" height="{n}" fill="#fff"/>'
+        f'<path d="{"".join(path)}" fill="#000"/></svg>'
+    )
+
+def _redis_get(key):
+    try:
+        return frappe.cache().get(frappe.cache().make_key(key))
+    except Exception:
+        return None
+
+def _redis_set(key, value):
+    try:
+        frappe.cache().set(frappe.cache().make_key(key), value, ex=CACHE_TTL)
+    except Exception:
+        pass
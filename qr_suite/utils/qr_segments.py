@@ -0,0 +1,140 @@
+from urllib.parse import urlsplit, urlunsplit
+
+import qrcode
+from qrcode import util
+
+# Content is split into numeric / alphanumeric / byte segments with the
+# least total bit length (dynamic programming over the characters, as in
+# ISO/IEC 18004 Annex J), instead of one byte-mode segment for everything.
+
+NUMERIC = util.MODE_NUMBER
+ALPHANUMERIC = util.MODE_ALPHA_NUM
+BYTE = util.MODE_8BIT_BYTE
+MODES = (NUMERIC, ALPHANUMERIC, BYTE)
+
+DIGITS = frozenset(b"0123456789")
+ALPHANUMERIC_CHARS = frozenset(util.ALPHA_NUM)
+
+# Character count indicator widths change at these versions; one representative each
+VERSION_CLASSES = ((1, 9), (10, 26), (27, 40))
+
+# Cost of one character in sixths of a bit: 10 bits / 3 digits, 11 bits / 2 chars, 8 bits / byte
+CHAR_COSTS = {NUMERIC: 20, ALPHANUMERIC: 33, BYTE: 48}
+
+def encode(content, error_level=qrcode.constants.ERROR_CORRECT_M, uppercase_host=False, **kwargs):
+    """
+    Return a made qrcode.QRCode for content using optimal segments
+    With uppercase_host, the scheme and host of an http(s) URL are uppercased so they
+    fit alphanumeric mode; both are case-insensitive, so the URL is unchanged.
+    kwargs (box_size, border, ...) go to qrcode.QRCode; qr.version is the version chosen.
+    """
+    if uppercase_host:
+        content = uppercase_url_host(content)
+
+    version, segments = optimal_segments(content, error_level)
+    qr = qrcode.QRCode(version=version, error_correction=error_level, **kwargs)
+    for mode, data in segments:
+        qr.add_data(util.QRData(data, mode=mode, check_data=False))
+    qr.make(fit=False)
+    return qr
+
+def uppercase_url_host(content):
+    """Uppercase scheme and host of an http(s) URL; anything else is returned as is"""
+    try:
+        parts = urlsplit(content)
+    except ValueError:
+        return content
+    if parts.scheme.lower() not in ("http", "https") or not parts.netloc or "@" in parts.netloc:
+        return content
+    return urlunsplit((parts.scheme.upper(), parts.netloc.upper(), parts.path, parts.query, parts.fragment))
+
+def optimal_segments(content, error_level=qrcode.constants.ERROR_CORRECT_M):
+    """(smallest version, [(mode, bytes)]) for content at the given error correction level"""
+    data = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+    best = None
+    for first, last in VERSION_CLASSES:
+        segments = split_segments(data, first)
+        bits = segments_bit_length(segments, first)
+        for version in range(first, last + 1):
+            if bits <= util.BIT_LIMIT_TABLE[error_level][version]:
+                if best is None or version < best[0]:
+                    best = (version, segments)
+                break
+    if best is None:
+        raise ValueError("Content is too long for a QR code")
+    return best
+
+def split_segments(data, version):
+    """Optimal [(mode, bytes)] split of data for the character count widths of version"""
+    if not data:
+        return [(BYTE, b"")]
+
+    sizes = util.mode_sizes_for_version(version)
+    head_costs = {mode: (4 + sizes[mode]) * 6 for mode in MODES}
+
+    # char_modes[i][m]: mode character i is encoded in, given the state after it is m
+    char_modes = []
+    costs = dict(head_costs)
+    for c in data:
+        current = {}
+        modes_here = {}
+        for mode in MODES:
+            if _allowed(c, mode):
+                current[mode] = costs[mode] + CHAR_COSTS[mode]
+                modes_here[mode] = mode
+
+        # Switching after this character starts a new segment: round up to whole bits, add a header
+        for mode in MODES:
+            for previous, cost in list(current.items()):
+                switched = (cost + 5) // 6 * 6 + head_costs[mode]
+                if modes_here.get(previous) == previous and switched < current.get(mode, float("inf")):
+                    current[mode] = switched
+                    modes_here[mode] = previous
+
+        char_modes.append(modes_here)
+        costs = {mode: current.get(mode, float("inf")) for mode in MODES}
+
+    mode = min(MODES, key=lambda m: costs[m])
+    per_char = [None] * len(data)
+    for i in range(len(data) - 1, -1, -1):
+        mode = char_modes[i][mode]
+        per_char[i] = mode
+
+    segments = []
+    start = 0
+    for i in range(1, len(data) + 1):
+        if i == len(data) or per_char[i] != per_char[start]:
+            segments.append((per_char[start], data[start:i]))
+            start = i
+    return segments
+
+def segments_bit_length(segments, version):
+    sizes = util.mode_sizes_for_version(version)
+    bits = 0
+    for mode, data in segments:
+        n = len(data)
+        if mode == NUMERIC:
+            payload = 10 * (n // 3) + (0, 4, 7)[n % 3]
+        elif mode == ALPHANUMERIC:
+            payload = 11 * (n // 2) + 6 * (n % 2)
+        else:
+            payload = 8 * n
+        bits += 4 + sizes[mode] + payload
+    return bits
+
+def byte_mode_version(content, error_level=qrcode.constants.ERROR_CORRECT_M):
+    """Version needed when content is encoded as a single byte-mode segment (for comparison)"""
+    data = content.encode("utf-8")
+    for first, last in VERSION_CLASSES:
+        bits = segments_bit_length([(BYTE, data)], first)
+        for version in range(first, last + 1):
+            if bits <= util.BIT_LIMIT_TABLE[error_level][version]:
+                return version, bits
+    raise ValueError("Content is too long for a QR code")
+
+def _allowed(c, mode):
+    if mode == NUMERIC:
+        return c in DIGITS
+    if mode == ALPHANUMERIC:
+        return c in ALPHANUMERIC_CHARS
+    return True
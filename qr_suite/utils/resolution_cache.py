@@ -0,0 +1,89 @@
+import pickle
+
+import frappe
+from frappe.utils import now_datetime
+
+KEY_PREFIX = "qr_suite_token"
+
+# Safety net only; entries are invalidated whenever their QR Link changes
+CACHE_TTL = 24 * 3600
+
+# QR Link columns the scan path needs to validate and redirect
+RESOLUTION_FIELDS = [
+    "name", "status", "expires_on", "target_doctype", "target_name",
+    "action", "url_mode", "qr_url", "qr_type"
+]
+
+def get_resolution(token):
+    """Return the QR Link fields for a token as a dict, or None if the token is unknown"""
+    key = token_key(token)
+    resolution = frappe.cache().get_value(key)
+    if resolution is None:
+        resolution = frappe.db.get_value("QR Link", {"token": token}, RESOLUTION_FIELDS, as_dict=True)
+        if not resolution:
+            return None
+        frappe.cache().set_value(key, resolution, expires_in_sec=CACHE_TTL)
+    return frappe._dict(resolution)
+
+def get_resolutions(tokens):
+    """
+    {token: resolution dict} for many tokens: one MGET for the cached ones and one
+    IN query on the token index for the rest. Unknown tokens are left out.
+    """
+    tokens = list(dict.fromkeys(t for t in tokens if t))
+    if not tokens:
+        return {}
+
+    cache = frappe.cache()
+    resolutions, missing = {}, []
+    for token, value in zip(tokens, cache.mget([cache.make_key(token_key(t)) for t in tokens]), strict=True):
+        if value is None:
+            missing.append(token)
+        else:
+            resolutions[token] = frappe._dict(pickle.loads(value))
+
+    if missing:
+        rows = frappe.get_all("QR Link",
+            filters={"token": ["in", missing]},
+            fields=[*RESOLUTION_FIELDS, "token"]
+        )
+        pipe = cache.pipeline()
+        for row in rows:
+            token = row.pop("token")
+            resolution = dict(row)
+            pipe.set(cache.make_key(token_key(token)), pickle.dumps(resolution), ex=CACHE_TTL)
+            resolutions[token] = frappe._dict(resolution)
+        pipe.execute()
+
+    return resolutions
+
+def check_link(link, now=None):
+    """
+    ("valid", None) or (state, message) for a resolved link; the single source of the
+    status and expiry rules used by /qr and resolve_tokens
+    """
+    status = (link.get("status") or "").lower()
+    if status in {"disabled", "cancelled", "inactive"}:
+        return "disabled", "This QR code is disabled."
+    if status == "revoked":
+        return "revoked", "This QR code has been revoked."
+    if status == "expired":
+        return "expired", "This QR code has expired."
+    # Status is kept current by the expiry scheduler; the date check covers the last minute
+    now = now or now_datetime()
+    expiry_dt = link.get("expiry_datetime") or link.get("expires_on") or None
+    expiry_date = link.get("expiry_date") or None
+    if expiry_dt and now > expiry_dt:
+        return "expired", "This QR code has expired."
+    if expiry_date and now.date() > expiry_date:
+        return "expired", "This QR code has expired."
+    return "valid", None
+
+def invalidate_tokens(tokens):
+    """Drop cached resolutions for the given tokens in a single round trip"""
+    keys = [token_key(t) for t in tokens if t]
+    if keys:
+        frappe.cache().delete_value(keys)
+
+def token_key(token):
+    return f"{KEY_PREFIX}:{token}"
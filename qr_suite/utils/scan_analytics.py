@@ -0,0 +1,195 @@
+import frappe
+import numpy as np
+from frappe.utils import add_days, cint, getdate
+
+# Scan data is loaded into flat NumPy arrays (seconds since epoch plus integer
+# codes for DocType and target) and every aggregate is an array operation.
+
+# Rows fetched per query while loading
+CHUNK_SIZE = 100000
+
+CACHE_TTL = 6 * 3600
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# Inter-scan interval histogram bucket edges, in seconds
+INTERVAL_EDGES = np.array([60, 600, 3600, 6 * 3600, 86400, 7 * 86400])
+INTERVAL_LABELS = ["< 1 min", "1-10 min", "10-60 min", "1-6 h", "6-24 h", "1-7 days", "> 7 days"]
+
+class ScanArrays:
+    """Column arrays for the scans in a date range"""
+    __slots__ = ("doctype", "doctypes", "target", "targets", "ts")
+
+    def __init__(self, ts, doctype, target, doctypes, targets):
+        self.ts = ts              # int64 seconds since 1970-01-01 (site local time)
+        self.doctype = doctype    # int32 index into doctypes
+        self.target = target      # int32 index into targets
+        self.doctypes = doctypes  # list of DocType names
+        self.targets = targets    # list of (doctype, name)
+
+def get_scan_patterns(view, from_date, to_date, target_doctype=None):
+    """Cached entry point used by the QR Scan Patterns report"""
+    from_date, to_date = getdate(from_date), getdate(to_date)
+    version = "final" if to_date < getdate() else cint(
+        frappe.db.get_single_value("QR Settings", "scan_rollup_watermark"))
+    key = f"qr_suite_scan_patterns:{view}:{from_date}:{to_date}:{target_doctype or ''}:{version}"
+
+    result = frappe.cache().get_value(key)
+    if result is None:
+        if view == "Heatmap":
+            result = hour_of_week_heatmap(from_date, to_date, target_doctype)
+        elif view == "Scan Intervals":
+            result = interval_distribution(load_scans(from_date, to_date, target_doctype))
+        else:
+            result = dwell_times(load_scans(from_date, to_date, target_doctype))
+        frappe.cache().set_value(key, result, expires_in_sec=CACHE_TTL)
+    return result
+
+def hour_of_week_heatmap(from_date, to_date, target_doctype=None):
+    """
+    {doctype: 7x24 list of scan counts} built from the hourly rollups
+    Reading QR Scan Rollup instead of the raw log keeps this cheap for any range.
+    """
+    conditions = ["period_type = 'Hour'", "period_start >= %(from_date)s", "period_start < %(to_date)s"]
+    values = {"from_date": from_date, "to_date": add_days(to_date, 1)}
+    if target_doctype:
+        conditions.append("target_doctype = %(target_doctype)s")
+        values["target_doctype"] = target_doctype
+
+    # One row per hour and DocType; the rollup's per-link rows are summed in SQL
+    rows = frappe.db.sql(f"""
+        SELECT TIMESTAMPDIFF(SECOND, '1970-01-01', period_start), target_doctype, SUM(scan_count)
+        FROM `tabQR Scan Rollup`
+        WHERE {" AND ".join(conditions)}
+        GROUP BY period_start, target_doctype
+    """, values)
+    if not rows:
+        return {}
+
+    doctypes, codes = [], {}
+    ts = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+    doctype = np.fromiter((_code(codes, doctypes, r[1] or "") for r in rows), dtype=np.int64, count=len(rows))
+    counts = np.fromiter((r[2] for r in rows), dtype=np.int64, count=len(rows))
+
+    cells = doctype * 168 + _hour_of_week(ts)
+    grid = np.bincount(cells, weights=counts, minlength=len(doctypes) * 168)
+    grid = grid.reshape(len(doctypes), 7, 24).astype(np.int64)
+    return {dt: grid[i].tolist() for i, dt in enumerate(doctypes)}
+
+def interval_distribution(scans):
+    """{doctype: counts per INTERVAL_LABELS bucket} of gaps between consecutive scans of the same target"""
+    gaps, gap_targets = _consecutive_gaps(scans)
+    if not len(gaps):
+        return {}
+
+    gap_doctypes = _target_doctype_codes(scans)[gap_targets]
+    buckets = np.digitize(gaps, INTERVAL_EDGES)
+    n_buckets = len(INTERVAL_LABELS)
+    hist = np.bincount(gap_doctypes.astype(np.int64) * n_buckets + buckets,
+        minlength=len(scans.doctypes) * n_buckets).reshape(len(scans.doctypes), n_buckets)
+    return {dt: hist[i].tolist() for i, dt in enumerate(scans.doctypes) if hist[i].any()}
+
+def dwell_times(scans, limit=500):
+    """
+    Per-target dwell estimates: the gaps between consecutive scans of one target
+    approximate how long it sat between scanning stations. Returns the targets with
+    the longest mean dwell, as dicts with scans, mean/max dwell in seconds.
+    """
+    gaps, gap_targets = _consecutive_gaps(scans)
+    if not len(gaps):
+        return []
+
+    n = len(scans.targets)
+    gap_count = np.bincount(gap_targets, minlength=n)
+    gap_sum = np.bincount(gap_targets, weights=gaps, minlength=n)
+    gap_max = np.zeros(n, dtype=np.int64)
+    np.maximum.at(gap_max, gap_targets, gaps)
+    scan_count = np.bincount(scans.target, minlength=n)
+
+    has_gaps = np.nonzero(gap_count)[0]
+    mean = gap_sum[has_gaps] / gap_count[has_gaps]
+    order = has_gaps[np.argsort(-mean)][:limit]
+
+    return [
+        {
+            "target_doctype": scans.targets[i][0],
+            "target_name": scans.targets[i][1],
+            "scans": int(scan_count[i]),
+            "mean_dwell": int(gap_sum[i] / gap_count[i]),
+            "max_dwell": int(gap_max[i])
+        }
+        for i in order
+    ]
+
+def load_scans(from_date, to_date, target_doctype=None):
+    """Load scan timestamps and target codes for a date range, in id-keyset chunks"""
+    conditions = ["log.scan_timestamp >= %(from_date)s", "log.scan_timestamp < %(to_date)s"]
+    values = {"from_date": from_date, "to_date": add_days(to_date, 1)}
+    if target_doctype:
+        conditions.append("COALESCE(log.target_doctype, link.target_doctype) = %(target_doctype)s")
+        values["target_doctype"] = target_doctype
+
+    # Map the date range to an id range through the scan_timestamp index, then walk the primary key
+    first_id, last_id = frappe.db.sql("""
+        SELECT MIN(name), MAX(name) FROM `tabQR Scan Log`
+        WHERE scan_timestamp >= %(from_date)s AND scan_timestamp < %(to_date)s
+    """, values)[0]
+    conditions.append("log.name <= %(last_id)s")
+    values["last_id"] = last_id or 0
+    cursor = (first_id or 1) - 1
+
+    doctypes, doctype_codes = [], {}
+    targets, target_codes = [], {}
+    ts_chunks, dt_chunks, target_chunks = [], [], []
+    while first_id is not None:
+        rows = frappe.db.sql(f"""
+            SELECT log.name,
+                TIMESTAMPDIFF(SECOND, '1970-01-01', log.scan_timestamp),
+                COALESCE(log.target_doctype, link.target_doctype, ''),
+                COALESCE(log.target_name, link.target_name, '')
+            FROM `tabQR Scan Log` log
+            LEFT JOIN `tabQR Link` link ON link.name = log.qr_link
+            WHERE {" AND ".join(conditions)} AND log.name > %(cursor)s
+            ORDER BY log.name
+            LIMIT {CHUNK_SIZE}
+        """, dict(values, cursor=cursor))
+        if not rows:
+            break
+        cursor = rows[-1][0]
+        ts_chunks.append(np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows)))
+        dt_chunks.append(np.fromiter((_code(doctype_codes, doctypes, r[2]) for r in rows), dtype=np.int32, count=len(rows)))
+        target_chunks.append(np.fromiter((_code(target_codes, targets, (r[2], r[3])) for r in rows), dtype=np.int32, count=len(rows)))
+
+    if not ts_chunks:
+        empty = np.array([], dtype=np.int64)
+        return ScanArrays(empty, empty.astype(np.int32), empty.astype(np.int32), [], [])
+
+    return ScanArrays(np.concatenate(ts_chunks), np.concatenate(dt_chunks), np.concatenate(target_chunks), doctypes, targets)
+
+def _consecutive_gaps(scans):
+    """Gaps in seconds between consecutive scans of the same target, and the target of each gap"""
+    if len(scans.ts) < 2:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    order = np.lexsort((scans.ts, scans.target))
+    ts = scans.ts[order]
+    target = scans.target[order]
+    same = target[1:] == target[:-1]
+    return np.diff(ts)[same], target[1:][same].astype(np.int64)
+
+def _target_doctype_codes(scans):
+    """DocType code for each target code"""
+    codes = np.zeros(len(scans.targets), dtype=np.int64)
+    codes[scans.target] = scans.doctype
+    return codes
+
+def _hour_of_week(ts):
+    # 1970-01-01 was a Thursday (weekday 3 with Monday = 0)
+    weekday = (ts // 86400 + 3) % 7
+    return weekday * 24 + (ts // 3600) % 24
+
+def _code(codes, values, value):
+    code = codes.get(value)
+    if code is None:
+        code = codes[value] = len(values)
+        values.append(value)
+    return code
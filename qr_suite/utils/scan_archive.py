@@ -0,0 +1,169 @@
+import csv
+import gzip
+import json
+import os
+
+import frappe
+from frappe import _
+from frappe.model import no_value_fields
+from frappe.utils import add_days, cint, getdate, nowdate
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Rows read, written to one part file per day, then deleted, per iteration
+CHUNK_SIZE = 20000
+
+# Rows per DELETE statement / transaction, to keep row locks short
+DELETE_BATCH_SIZE = 1000
+
+ARCHIVE_FOLDER = "qr_scan_archive"
+MANIFEST_NAME = "manifest.json"
+
+def archive_scan_logs():
+    """
+    Daily job: move QR Scan Logs older than the retention period out of the database
+    Rows are written to `private/files/qr_scan_archive/<date>/part-<first id>.<ext>`
+    and recorded in manifest.json before they are deleted. Only rows already folded
+    into QR Scan Rollup are touched, so analytics totals are unaffected.
+    """
+    retention_days = cint(frappe.db.get_single_value("QR Settings", "scan_log_retention_days"))
+    if retention_days <= 0:
+        return
+
+    lock = frappe.cache().lock(frappe.cache().make_key("qr_suite_scan_archive_lock"), timeout=6 * 3600)
+    if not lock.acquire(blocking=False):
+        return
+
+    try:
+        archive = cint(frappe.db.get_single_value("QR Settings", "archive_scan_logs"))
+        watermark = cint(frappe.db.get_single_value("QR Settings", "scan_rollup_watermark"))
+        cutoff = add_days(nowdate(), -retention_days)
+        columns = get_archive_columns()
+
+        moved = 0
+        while True:
+            rows = frappe.db.sql(f"""
+                SELECT {", ".join(f"`{c}`" for c in columns)}
+                FROM `tabQR Scan Log`
+                WHERE scan_timestamp < %(cutoff)s AND name <= %(watermark)s
+                ORDER BY scan_timestamp, name
+                LIMIT %(limit)s
+            """, {"cutoff": cutoff, "watermark": watermark, "limit": CHUNK_SIZE}, as_dict=True)
+            if not rows:
+                break
+
+            if archive:
+                write_archive_parts(rows, columns)
+            delete_scan_logs([row.name for row in rows])
+            moved += len(rows)
+
+        if moved:
+            frappe.logger("qr_suite").info(f"Moved {moved} QR Scan Logs older than {cutoff} out of the database")
+        return moved
+    except Exception as e:
+        frappe.db.rollback()
+        frappe.log_error(f"Error archiving scan logs: {e!s}", "QR Scan Archive")
+    finally:
+        try:
+            lock.release()
+        except Exception:
+            pass
+
+def write_archive_parts(rows, columns):
+    """Write rows as one compressed part file per scan date and add them to the manifest"""
+    by_date = {}
+    for row in rows:
+        by_date.setdefault(str(getdate(row.scan_timestamp)), []).append(row)
+
+    entries = []
+    for date, day_rows in sorted(by_date.items()):
+        first_id = min(cint(r.name) for r in day_rows)
+        folder = os.path.join(get_archive_path(), date)
+        os.makedirs(folder, exist_ok=True)
+
+        if pyarrow:
+            path = os.path.join(folder, f"part-{first_id:012d}.parquet")
+            table = pyarrow.table({c: [_to_text(r[c]) for r in day_rows] for c in columns})
+            pyarrow.parquet.write_table(table, path, compression="zstd")
+            fmt = "parquet"
+        else:
+            path = os.path.join(folder, f"part-{first_id:012d}.csv.gz")
+            with gzip.open(path, "wt", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(columns)
+                for r in day_rows:
+                    writer.writerow([_to_text(r[c]) for c in columns])
+            fmt = "csv.gz"
+
+        entries.append({
+            "date": date,
+            "path": os.path.relpath(path, get_archive_path()),
+            "format": fmt,
+            "rows": len(day_rows),
+            "min_id": first_id,
+            "max_id": max(cint(r.name) for r in day_rows),
+            "bytes": os.path.getsize(path),
+            "columns": columns
+        })
+
+    manifest = read_manifest()
+    manifest["parts"].extend(entries)
+    _write_manifest(manifest)
+
+def delete_scan_logs(names):
+    """Delete archived rows in small committed batches"""
+    for i in range(0, len(names), DELETE_BATCH_SIZE):
+        frappe.db.delete("QR Scan Log", {"name": ["in", names[i:i + DELETE_BATCH_SIZE]]})
+        frappe.db.commit()
+
+def iter_archived_scan_logs(from_date=None, to_date=None):
+    """
+    Yield archived scan log rows (as dicts of strings) between two dates, inclusive
+    Only the parts listed in the manifest for the requested dates are opened.
+    """
+    from_date = str(getdate(from_date)) if from_date else None
+    to_date = str(getdate(to_date)) if to_date else None
+
+    for part in read_manifest()["parts"]:
+        if (from_date and part["date"] < from_date) or (to_date and part["date"] > to_date):
+            continue
+
+        path = os.path.join(get_archive_path(), part["path"])
+        if part["format"] == "parquet":
+            if not pyarrow:
+                frappe.throw(_("pyarrow is required to read archived scan logs in {0}").format(part["path"]))
+            yield from pyarrow.parquet.read_table(path).to_pylist()
+        else:
+            with gzip.open(path, "rt", newline="", encoding="utf-8") as f:
+                yield from csv.DictReader(f)
+
+def read_manifest():
+    path = os.path.join(get_archive_path(), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"parts": []}
+    with open(path) as f:
+        return json.load(f)
+
+def get_archive_columns():
+    meta = frappe.get_meta("QR Scan Log")
+    return ["name", "creation"] + [
+        f.fieldname for f in meta.fields if f.fieldtype not in no_value_fields
+    ]
+
+def get_archive_path():
+    return frappe.get_site_path("private", "files", ARCHIVE_FOLDER)
+
+def _write_manifest(manifest):
+    # Write-then-rename so a crash never leaves a truncated manifest
+    path = os.path.join(get_archive_path(), MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, path)
+
+def _to_text(value):
+    return "" if value is None else str(value)
@@ -0,0 +1,166 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import zlib
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, getdate, now_datetime
+from frappe.utils.background_jobs import is_job_enqueued
+
+# Bytes buffered before a chunk is written out
+FLUSH_SIZE = 64 * 1024
+
+EXPORT_COLUMNS = [
+    "name", "qr_link", "scan_timestamp", "scanned_by", "ip_address",
+    "action_taken", "target_doctype", "target_name", "scan_result"
+]
+
+def enqueue_scan_export(from_date, to_date, qr_link=None, target_doctype=None, fmt="csv", compress=False):
+    """Queue an export; the user is sent a link to the finished file"""
+    params = {
+        "from_date": str(getdate(from_date)),
+        "to_date": str(getdate(to_date)),
+        "qr_link": qr_link,
+        "target_doctype": target_doctype,
+        "fmt": fmt,
+        "compress": bool(compress)
+    }
+
+    # One queued run per user and export; a different range or format gets its own job
+    params_hash = hashlib.sha1(frappe.as_json({**params, "user": frappe.session.user}).encode()).hexdigest()[:12]
+    job_id = f"qr_suite_scan_export_{params_hash}"
+    if is_job_enqueued(job_id):
+        frappe.throw(_("This scan log export is already queued or running"))
+
+    frappe.enqueue(
+        "qr_suite.utils.scan_export.export_scan_logs",
+        queue="long",
+        timeout=6 * 3600,
+        job_id=job_id,
+        notify_user=frappe.session.user,
+        **params
+    )
+    return {"queued": True}
+
+def export_scan_logs(from_date, to_date, qr_link=None, target_doctype=None, fmt="csv", compress=False, notify_user=None):
+    """
+    Background job: write the export to a private File and send the user its link
+    Chunks are written to disk as they are encoded, so memory stays constant
+    however many rows match.
+    """
+    filename = (f"qr-scan-logs-{getdate(from_date)}-{getdate(to_date)}-{now_datetime().strftime('%Y%m%d%H%M%S')}"
+        f".{fmt}" + (".gz" if compress else ""))
+    path = frappe.get_site_path("private", "files", filename)
+
+    try:
+        with open(path, "wb") as f:
+            for chunk in encode_scan_logs(from_date, to_date, qr_link, target_doctype, fmt, compress):
+                f.write(chunk)
+
+        file_doc = frappe.get_doc({
+            "doctype": "File",
+            "file_name": filename,
+            "file_url": f"/private/files/{filename}",
+            "is_private": 1,
+            "attached_to_doctype": "QR Settings",
+            "attached_to_name": "QR Settings",
+            "file_size": os.path.getsize(path)
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+    except Exception:
+        frappe.db.rollback()
+        if os.path.exists(path):
+            os.remove(path)
+        if notify_user:
+            frappe.publish_realtime("msgprint", _("QR scan log export failed"), user=notify_user)
+        raise
+
+    if notify_user:
+        frappe.publish_realtime("msgprint",
+            _("QR scan log export is ready: {0}").format(f'<a href="{file_doc.file_url}">{filename}</a>'),
+            user=notify_user)
+    return file_doc.file_url
+
+def encode_scan_logs(from_date, to_date, qr_link=None, target_doctype=None, fmt="csv", compress=False):
+    """Generator of encoded export chunks of about FLUSH_SIZE bytes"""
+    encoder = CSVEncoder() if fmt == "csv" else JSONLEncoder()
+    compressor = zlib.compressobj(wbits=31) if compress else None  # gzip container
+
+    buffer = [encoder.header()]
+    size = len(buffer[0])
+    for row in iter_scan_logs(from_date, to_date, qr_link, target_doctype):
+        line = encoder.encode(row)
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_SIZE:
+            chunk = b"".join(buffer)
+            yield compressor.compress(chunk) if compressor else chunk
+            buffer, size = [], 0
+
+    chunk = b"".join(buffer)
+    if compressor:
+        yield compressor.compress(chunk) + compressor.flush()
+    elif chunk:
+        yield chunk
+
+def iter_scan_logs(from_date, to_date, qr_link=None, target_doctype=None):
+    """
+    Rows in id (keyset) order for a date range
+    The date range is first mapped to an id range through the scan_timestamp
+    index, so the main read is a primary key range scan without a filesort.
+    """
+    values = {"from_date": getdate(from_date), "to_date": add_days(getdate(to_date), 1)}
+    first_id, last_id = frappe.db.sql("""
+        SELECT MIN(name), MAX(name) FROM `tabQR Scan Log`
+        WHERE scan_timestamp >= %(from_date)s AND scan_timestamp < %(to_date)s
+    """, values)[0]
+    if first_id is None:
+        return
+
+    conditions = [
+        "name BETWEEN %(first_id)s AND %(last_id)s",
+        "scan_timestamp >= %(from_date)s",
+        "scan_timestamp < %(to_date)s"
+    ]
+    values.update({"first_id": first_id, "last_id": last_id})
+    if qr_link:
+        conditions.append("qr_link = %(qr_link)s")
+        values["qr_link"] = qr_link
+    if target_doctype:
+        conditions.append("qr_link IN (SELECT name FROM `tabQR Link` WHERE target_doctype = %(target_doctype)s)")
+        values["target_doctype"] = target_doctype
+
+    with frappe.db.unbuffered_cursor():
+        yield from frappe.db.sql(f"""
+            SELECT {", ".join(f"`{c}`" for c in EXPORT_COLUMNS)}
+            FROM `tabQR Scan Log`
+            WHERE {" AND ".join(conditions)}
+            ORDER BY name
+        """, values, as_dict=True, as_iterator=True)
+
+class CSVEncoder:
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def header(self):
+        return self._line(EXPORT_COLUMNS)
+
+    def encode(self, row):
+        return self._line(["" if row[c] is None else row[c] for c in EXPORT_COLUMNS])
+
+    def _line(self, values):
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(values)
+        return self._buffer.getvalue().encode("utf-8")
+
+class JSONLEncoder:
+    def header(self):
+        return b""
+
+    def encode(self, row):
+        return (json.dumps(row, default=str) + "\n").encode("utf-8")
@@ -0,0 +1,211 @@
+import base64
+import json
+import zlib
+from zoneinfo import ZoneInfo
+
+import frappe
+from frappe import _
+from frappe.utils import add_to_date, get_datetime, get_system_timezone, now_datetime
+
+# Records accepted per call
+MAX_BATCH_SIZE = 5000
+
+# Upper bound on a decompressed batch, in bytes
+MAX_PAYLOAD_BYTES = 16 * 1024 * 1024
+
+# Scans stamped further than this in the future are rejected (device clock skew)
+MAX_CLOCK_SKEW_MINUTES = 10
+
+LOG_FIELDS = [
+    "name", "creation", "modified", "owner", "modified_by", "docstatus",
+    "qr_link", "scan_timestamp", "scanned_by", "ip_address", "action_taken",
+    "target_doctype", "target_name", "scan_result", "client_event_id", "device_id"
+]
+
+def ingest_scans(batch):
+    """
+    Record a batch of offline scans
+    batch is a JSON list of {event_id, token, timestamp, user, device}, or the same
+    JSON gzip/zlib-compressed and base64-encoded. Tokens are resolved in one query,
+    event ids already seen are skipped, accepted scans are written with one bulk
+    insert and QR Link counters are folded with one UPDATE.
+    Returns totals and a result per record, in input order.
+    """
+    records = parse_batch(batch)
+    if len(records) > MAX_BATCH_SIZE:
+        frappe.throw(_("A batch can hold at most {0} scans").format(MAX_BATCH_SIZE))
+
+    links = resolve_tokens({r.get("token") for r in records if r.get("token")})
+    seen = get_seen_event_ids({r.get("event_id") for r in records if r.get("event_id")})
+    users = get_known_users({r.get("user") for r in records if r.get("user")})
+
+    now = now_datetime()
+    latest_allowed = add_to_date(now, minutes=MAX_CLOCK_SKEW_MINUTES)
+    ip = getattr(frappe.local, "request_ip", None)
+    results, rows, accepted = [], [], {}
+
+    for record in records:
+        event_id = record.get("event_id")
+        status = "accepted"
+        link = links.get(record.get("token"))
+        timestamp = parse_timestamp(record.get("timestamp"))
+
+        if not event_id or not timestamp or timestamp > latest_allowed:
+            status = "invalid"
+        elif event_id in seen:
+            status = "duplicate"
+        elif not link:
+            status = "unknown_token"
+        elif link.status == "Revoked":
+            status = "revoked"
+        elif link.status not in ("Active", "Expired"):
+            status = "inactive"
+        elif link.expires_on and timestamp > link.expires_on:
+            # A link that expired after the scan was taken still counts it
+            status = "expired"
+
+        result = {"event_id": event_id, "status": status}
+        results.append(result)
+        if status != "accepted":
+            continue
+
+        seen.add(event_id)
+        user = record.get("user") if record.get("user") in users else frappe.session.user
+        rows.append((
+            now, now, frappe.session.user, frappe.session.user, 0,
+            link.name, timestamp, user, ip, link.action,
+            link.target_doctype, link.target_name, "Success", event_id, record.get("device")
+        ))
+        accepted[event_id] = (result, (link, timestamp, user))
+
+    if rows:
+        # The autoincrement name column has no database default, so ids come from its sequence
+        ids = next_log_ids(len(rows))
+        rows = [(log_id, *row) for log_id, row in zip(ids, rows, strict=True)]
+
+        # A concurrent upload of the same events is absorbed by the unique client_event_id;
+        # only the rows this call actually inserted are counted
+        frappe.db.bulk_insert("QR Scan Log", LOG_FIELDS, rows, ignore_duplicates=True)
+        inserted = get_inserted_event_ids(ids)
+        for event_id, (result, _scan) in accepted.items():
+            if event_id not in inserted:
+                result["status"] = "duplicate"
+        scans = [scan for event_id, (result, scan) in accepted.items() if event_id in inserted]
+        if scans:
+            fold_link_counters(scans)
+        frappe.db.commit()
+        record_unique_scans(scans)
+
+    totals = {}
+    for result in results:
+        totals[result["status"]] = totals.get(result["status"], 0) + 1
+    return {"total": len(records), "counts": totals, "results": results}
+
+def parse_timestamp(value):
+    """Naive system-timezone datetime for a scan timestamp, or None if missing or unparseable"""
+    if not value:
+        return None
+    try:
+        timestamp = get_datetime(value)
+    except Exception:
+        return None
+    if timestamp and timestamp.tzinfo:
+        # ISO strings with Z or an offset parse as aware; stored datetimes are naive system time
+        timestamp = timestamp.astimezone(ZoneInfo(get_system_timezone())).replace(tzinfo=None)
+    return timestamp
+
+def parse_batch(batch):
+    """Decode a JSON list, or base64 of gzip/zlib-compressed JSON"""
+    if isinstance(batch, (list, tuple)):
+        records = batch
+    else:
+        batch = batch.strip() if isinstance(batch, str) else batch
+        if isinstance(batch, str) and batch[:1] in ("[", "{"):
+            records = json.loads(batch)
+        else:
+            try:
+                compressed = base64.b64decode(batch)
+                # wbits=47 accepts both gzip and zlib headers
+                decompressor = zlib.decompressobj(47)
+                payload = decompressor.decompress(compressed, MAX_PAYLOAD_BYTES)
+                if decompressor.unconsumed_tail:
+                    frappe.throw(_("Batch is larger than {0} bytes once decompressed").format(MAX_PAYLOAD_BYTES))
+                records = json.loads(payload)
+            except (ValueError, zlib.error):
+                frappe.throw(_("Batch must be a JSON list or base64-encoded gzip of one"))
+
+    if isinstance(records, dict):
+        records = records.get("scans") or []
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        frappe.throw(_("Batch must be a list of scan records"))
+    return records
+
+def resolve_tokens(tokens):
+    """{token: QR Link fields} for the given tokens in a single query"""
+    if not tokens:
+        return {}
+    return {
+        row.token: row for row in frappe.get_all("QR Link",
+            filters={"token": ["in", list(tokens)]},
+            fields=["name", "token", "status", "expires_on", "target_doctype", "target_name", "action"]
+        )
+    }
+
+def get_seen_event_ids(event_ids):
+    if not event_ids:
+        return set()
+    return set(frappe.get_all("QR Scan Log",
+        filters={"client_event_id": ["in", list(event_ids)]},
+        pluck="client_event_id"
+    ))
+
+def next_log_ids(count):
+    """count new QR Scan Log ids from the DocType's sequence"""
+    if frappe.db.db_type == "mariadb":
+        # One query for the whole batch instead of a round trip per id
+        return [row[0] for row in frappe.db.sql(f"""
+            WITH RECURSIVE n (i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < {int(count)})
+            SELECT NEXTVAL(`qr_scan_log_id_seq`) FROM n
+        """)]
+    return [frappe.db.get_next_sequence_val("QR Scan Log") for _i in range(count)]
+
+def get_inserted_event_ids(log_ids):
+    """Event ids whose QR Scan Log row was written under one of log_ids, i.e. by this call"""
+    return set(frappe.get_all("QR Scan Log",
+        filters={"name": ["in", log_ids]},
+        pluck="client_event_id"
+    ))
+
+def get_known_users(users):
+    if not users:
+        return set()
+    return set(frappe.get_all("User", filters={"name": ["in", list(users)], "enabled": 1}, pluck="name"))
+
+def fold_link_counters(accepted):
+    """Add the accepted scans to each link's scan_count and last_scanned in one UPDATE"""
+    per_link = {}
+    for link, timestamp, user in accepted:
+        count, last, last_user = per_link.get(link.name, (0, None, None))
+        if last is None or timestamp > last:
+            last, last_user = timestamp, user
+        per_link[link.name] = (count + 1, last, last_user)
+
+    derived = " UNION ALL ".join(["SELECT %s AS name, %s AS scans, %s AS last_scanned, %s AS last_scanned_by"] * len(per_link))
+    values = [v for name, (count, last, user) in per_link.items() for v in (name, count, last, user)]
+    frappe.db.sql(f"""
+        UPDATE `tabQR Link` link
+        JOIN ({derived}) batch ON batch.name = link.name
+        SET link.scan_count = COALESCE(link.scan_count, 0) + batch.scans,
+            link.last_scanned_by = IF(link.last_scanned IS NULL OR batch.last_scanned > link.last_scanned,
+                batch.last_scanned_by, link.last_scanned_by),
+            link.last_scanned = GREATEST(COALESCE(link.last_scanned, batch.last_scanned), batch.last_scanned)
+    """, values)
+
+def record_unique_scans(accepted):
+    from qr_suite.utils.hyperloglog import record_unique_scan
+
+    try:
+        for link, timestamp, user in accepted:
+            record_unique_scan(link.name, link.target_doctype, link.action, user, None, when=timestamp)
+    except Exception:
+        frappe.log_error("QR Suite: unique scan sketch update failed during ingest", frappe.get_traceback())
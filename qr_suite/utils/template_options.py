@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+
+import frappe
+import qrcode
+from frappe.utils import cint
+
+# Redis hash of template name -> modified timestamp, cleared by QRTemplate hooks
+TEMPLATE_VERSIONS_KEY = "qr_suite_template_modified"
+
+# Rendered size in pixels per QR Size option
+SIZE_PIXELS = {
+    "Small": 150,
+    "Medium": 250,
+    "Large": 400
+}
+
+# qrcode box_size per QR Size option
+BOX_SIZES = {
+    "Small": 8,
+    "Medium": 10,
+    "Large": 12
+}
+
+ERROR_LEVELS = {
+    "L": qrcode.constants.ERROR_CORRECT_L,
+    "M": qrcode.constants.ERROR_CORRECT_M,
+    "Q": qrcode.constants.ERROR_CORRECT_Q,
+    "H": qrcode.constants.ERROR_CORRECT_H
+}
+
+# Compiled options per (site, template, modified); stale versions are evicted on recompile
+_compiled = {}
+
+@dataclass(frozen=True, slots=True)
+class QRTemplateOptions:
+    """Resolved, read-only view of a QR Template"""
+    name: str
+    modified: str
+    is_active: bool
+    qr_type: str
+    target_doctype: str | None
+    value_field: str | None
+    default_action: str | None
+    url_mode: str
+    token_expiry_days: int
+    custom_url_prefix: str | None
+    extra_params: str | None
+    qr_size: str
+    size_pixels: int
+    box_size: int
+    error_correction: str
+    error_level: int
+    image_format: str
+    include_label: bool
+
+def get_template_options(template_name):
+    """Return compiled options for a QR Template, or None if it does not exist"""
+    if not template_name:
+        return None
+
+    modified = frappe.cache().hget(TEMPLATE_VERSIONS_KEY, template_name,
+        generator=lambda: str(frappe.db.get_value("QR Template", template_name, "modified") or ""))
+    if not modified:
+        return None
+
+    key = (frappe.local.site, template_name)
+    cached = _compiled.get(key)
+    if cached and cached.modified == modified:
+        return cached
+
+    options = compile_template(frappe.get_doc("QR Template", template_name), modified)
+    _compiled[key] = options
+    return options
+
+def compile_template(template, modified=None):
+    """Build QRTemplateOptions from a QR Template document"""
+    qr_size = template.get("qr_size") or "Medium"
+    error_correction = template.get("error_correction") or "M"
+    return QRTemplateOptions(
+        name=template.name,
+        modified=modified or str(template.modified or ""),
+        is_active=bool(cint(template.get("is_active"))),
+        qr_type=template.get("qr_type") or "Document QR",
+        target_doctype=template.get("target_doctype"),
+        value_field=template.get("value_field"),
+        default_action=template.get("default_action"),
+        url_mode=template.get("url_mode") or "token",
+        token_expiry_days=cint(template.get("token_expiry_days")),
+        custom_url_prefix=template.get("custom_url_prefix"),
+        extra_params=template.get("extra_params"),
+        qr_size=qr_size,
+        size_pixels=SIZE_PIXELS.get(qr_size, 250),
+        box_size=BOX_SIZES.get(qr_size, 10),
+        error_correction=error_correction,
+        error_level=ERROR_LEVELS.get(error_correction, qrcode.constants.ERROR_CORRECT_M),
+        image_format=template.get("image_format") or "PNG",
+        include_label=bool(cint(template.get("include_readable_text")))
+    )
+
+def clear_template_options(template_name):
+    """Forget the cached version of a template so the next lookup recompiles it"""
+    frappe.cache().hdel(TEMPLATE_VERSIONS_KEY, template_name)
+    _compiled.pop((frappe.local.site, template_name), None)
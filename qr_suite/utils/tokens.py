@@ -0,0 +1,63 @@
+import secrets
+import string
+
+import frappe
+from frappe import _
+from frappe.utils import cint
+
+ALPHABETS = {
+    "URL-safe Base64": string.ascii_letters + string.digits + "-_",
+    # Uppercase letters and digits only, so a token URL fits QR alphanumeric mode
+    "Base32 (Uppercase)": "ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+}
+
+DEFAULT_ALPHABET = "URL-safe Base64"
+DEFAULT_LENGTH = 43
+
+# Shortest token allowed for an alphabet, in bits of randomness
+MIN_TOKEN_BITS = 64
+MAX_TOKEN_LENGTH = 64
+
+# New candidates drawn when a token is already taken
+MAX_ATTEMPTS = 5
+
+def get_token_format():
+    """(alphabet, length) from QR Settings"""
+    alphabet = frappe.db.get_single_value("QR Settings", "token_alphabet", cache=True) or DEFAULT_ALPHABET
+    length = cint(frappe.db.get_single_value("QR Settings", "token_length", cache=True)) or DEFAULT_LENGTH
+    return ALPHABETS.get(alphabet, ALPHABETS[DEFAULT_ALPHABET]), length
+
+def min_token_length(alphabet_name):
+    bits_per_char = len(ALPHABETS[alphabet_name]).bit_length() - 1
+    return -(-MIN_TOKEN_BITS // bits_per_char)
+
+def make_token(alphabet, length):
+    return "".join(secrets.choice(alphabet) for _i in range(length))
+
+def mint_token():
+    """A new token in the configured format that no QR Link uses yet"""
+    return mint_tokens(1)[0]
+
+def mint_tokens(count):
+    """
+    count distinct new tokens, checked against existing QR Links with one query per round
+    The unique index on QR Link.token still guards against a concurrent insert.
+    """
+    if count <= 0:
+        return []
+
+    alphabet, length = get_token_format()
+    tokens = set()
+    for _attempt in range(MAX_ATTEMPTS):
+        candidates = set()
+        while len(candidates) < count - len(tokens):
+            candidate = make_token(alphabet, length)
+            if candidate not in tokens:
+                candidates.add(candidate)
+
+        taken = set(frappe.get_all("QR Link", filters={"token": ["in", list(candidates)]}, pluck="token"))
+        tokens |= candidates - taken
+        if len(tokens) == count:
+            return list(tokens)
+
+    frappe.throw(_("Could not mint unique QR tokens; increase the token length in QR Settings"))
@@ -3,6 +3,10 @@ from __future__ import annotations
 import frappe
 from frappe.utils import now_datetime, get_url_to_form
 
+from qr_suite.utils.hot_links import record_hot_scan
+from qr_suite.utils.hyperloglog import record_unique_scan
+from qr_suite.utils.resolution_cache import check_link, get_resolution
+
 try:
     from qr_suite.utils.router import get_redirect_url as _router_redirect  # optional
 except Exception:
@@ -32,9 +36,9 @@ def get_context(context):
 def _resolve_qr_link(params):
     token = params.get("token") or params.get("t")
     if token:
-        row = frappe.get_all("QR Link", filters={"token": token}, fields=["name"], limit=1)
-        if row:
-            return frappe.get_doc("QR Link", row[0].name)
+        link = get_resolution(token)
+        if link:
+            return link
         if frappe.db.exists("QR Link", token):
             return frappe.get_doc("QR Link", token)
         raise QRNotFound("Invalid or unknown QR token.")
@@ -51,16 +55,9 @@ def _resolve_qr_link(params):
     raise QRNotFound("Missing token or document reference.")
 
 def _validate_qr_link(link):
-    status = (link.get("status") or "").lower()
-    if status in {"disabled", "cancelled", "inactive"}:
-        raise QRExpired("This QR code is disabled.")
-    now = now_datetime()
-    expiry_dt = link.get("expiry_datetime") or link.get("expires_on") or None
-    expiry_date = link.get("expiry_date") or None
-    if expiry_dt and now > expiry_dt:
-        raise QRExpired("This QR code has expired.")
-    if expiry_date and now.date() > expiry_date:
-        raise QRExpired("This QR code has expired.")
+    state, message = check_link(link)
+    if state != "valid":
+        raise QRExpired(message)
 
 def _compute_redirect_url(link, params):
     if callable(_router_redirect):
@@ -106,6 +103,13 @@ def _safe_log_scan(link):
         except Exception:
             pass
         frappe.log_error("QR Suite: scan log insert failed", frappe.get_traceback())
+        return
+
+    try:
+        record_unique_scan(link.name, link.get("target_doctype"), link.get("action"), frappe.session.user, ip)
+        record_hot_scan(link.name)
+    except Exception:
+        frappe.log_error("QR Suite: scan counter update failed", frappe.get_traceback())
 
 def _set_error(context, http_status: int, message: str):
     frappe.local.response["http_status_code"] = http_status
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark: QR versions with optimal segment encoding vs one byte-mode segment
+
+Against a site's QR Links, from `bench --site <site> console`:
+    exec(open("../apps/qr_suite/tests/benchmark_qr_segments.py").read()); benchmark_site()
+Standalone, with a synthetic corpus of token URLs:
+    python tests/benchmark_qr_segments.py
+"""
+
+import base64
+import os
+import secrets
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from qr_suite.utils.qr_segments import (
+    byte_mode_version,
+    encode,
+    optimal_segments,
+    segments_bit_length,
+    uppercase_url_host,
+)
+
+HOSTS = ["https://erp.example.com", "https://inventory.warehouse-01.acme-industries.co.uk:8443"]
+
+
+def synthetic_corpus(count=500):
+    corpus = []
+    for i in range(count):
+        host = HOSTS[i % len(HOSTS)]
+        if i % 3 == 2:
+            token = base64.b32encode(secrets.token_bytes(10)).decode().rstrip("=")
+        else:
+            token = secrets.token_urlsafe(32)
+        corpus.append((f"{host}/qr?token={token}", True))
+    corpus += [(f"SN-{i:08d}", False) for i in range(100)]
+    return corpus
+
+
+def benchmark(corpus):
+    """corpus: [(content, is_url)]; prints version and data size savings"""
+    saved_versions = Counter()
+    byte_bits = optimal_bits = 0
+    byte_modules = optimal_modules = 0
+
+    started = time.perf_counter()
+    for content, is_url in corpus:
+        before, bits = byte_mode_version(content)
+        encoded = uppercase_url_host(content) if is_url else content
+        after, segments = optimal_segments(encoded)
+        byte_bits += bits
+        optimal_bits += segments_bit_length(segments, after)
+        byte_modules += (17 + 4 * before) ** 2
+        optimal_modules += (17 + 4 * after) ** 2
+        saved_versions[before - after] += 1
+    elapsed = time.perf_counter() - started
+
+    n = len(corpus)
+    print(f"Contents:            {n}")
+    print(f"Data bits:           {byte_bits} -> {optimal_bits} ({100 * (1 - optimal_bits / byte_bits):.1f}% smaller)")
+    print(f"Symbol modules:      {byte_modules} -> {optimal_modules} ({100 * (1 - optimal_modules / byte_modules):.1f}% fewer)")
+    for saved, count in sorted(saved_versions.items()):
+        print(f"Versions saved: {saved:2d}  {count} ({100 * count / n:.1f}%)")
+    print(f"Segmentation time:   {1e6 * elapsed / n:.0f} us per content")
+
+    started = time.perf_counter()
+    for content, is_url in corpus[:100]:
+        encode(content, uppercase_host=is_url)
+    print(f"Full encode:         {1e3 * (time.perf_counter() - started) / min(n, 100):.2f} ms per symbol")
+
+
+def benchmark_site():
+    import frappe
+
+    corpus = [
+        (row.qr_url or row.qr_content, row.qr_type == "Document QR")
+        for row in frappe.get_all("QR Link", fields=["qr_type", "qr_url", "qr_content"], limit_page_length=0)
+        if row.qr_url or row.qr_content
+    ]
+    benchmark(corpus)
+
+
+if __name__ == "__main__":
+    benchmark(synthetic_corpus())
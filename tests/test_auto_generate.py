@@ -0,0 +1,84 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from qr_suite.utils.auto_generate import (
+    ATTEMPTS_KEY,
+    MAX_ATTEMPTS,
+    SEPARATOR,
+    _key,
+    _raw,
+    _requeue,
+    generate_qr_links,
+    queue_document,
+)
+
+RULE = {
+    "event": "On Insert",
+    "qr_type": "Document QR",
+    "action": "view",
+    "qr_template": None,
+    "label_field": "description"
+}
+
+
+class TestAutoGenerate(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.todos = [
+            frappe.get_doc({"doctype": "ToDo", "description": f"QR auto generate test {i}"}).insert()
+            for i in range(3)
+        ]
+        self.names = [todo.name for todo in self.todos]
+        self.member = f"ToDo{SEPARATOR}{self.names[0]}"
+        frappe.db.commit()
+        self.clear_queue()
+
+    def tearDown(self):
+        frappe.db.delete("QR Link", {"target_doctype": "ToDo", "target_name": ["in", self.names]})
+        for todo in self.todos:
+            todo.delete()
+        frappe.db.commit()
+        self.clear_queue()
+
+    def clear_queue(self):
+        _raw().srem(_key(), self.member).hdel(frappe.cache().make_key(ATTEMPTS_KEY), self.member).execute()
+
+    def queued(self):
+        return _raw().sismember(_key(), self.member).execute()[0]
+
+    def links(self):
+        return frappe.get_all("QR Link",
+            filters={"target_doctype": "ToDo", "target_name": ["in", self.names], "status": "Active"},
+            fields=["target_name", "label_text", "idempotency_key"]
+        )
+
+    def test_creates_one_link_per_document(self):
+        failed = generate_qr_links("ToDo", self.names, RULE)
+        failed += generate_qr_links("ToDo", self.names, RULE)
+
+        links = self.links()
+        self.assertEqual(failed, [])
+        self.assertEqual(sorted(link.target_name for link in links), sorted(self.names))
+        self.assertTrue(all(link.idempotency_key for link in links))
+        self.assertEqual({link.label_text for link in links}, {todo.description for todo in self.todos})
+
+    def test_deleted_documents_are_skipped(self):
+        self.assertEqual(generate_qr_links("ToDo", ["does-not-exist"], RULE), [])
+
+    def test_queue_is_pushed_on_commit_and_dropped_on_rollback(self):
+        queue_document("ToDo", self.names[0])
+        frappe.db.rollback()
+        self.assertFalse(self.queued())
+
+        queue_document("ToDo", self.names[0])
+        frappe.db.commit()
+        self.assertTrue(self.queued())
+
+    def test_failed_documents_are_retried_then_dropped(self):
+        for _attempt in range(MAX_ATTEMPTS - 1):
+            _requeue([self.member])
+            self.assertTrue(self.queued())
+            _raw().srem(_key(), self.member).execute()
+
+        _requeue([self.member])
+        self.assertFalse(self.queued())
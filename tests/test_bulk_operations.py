@@ -0,0 +1,92 @@
+import csv
+import io
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from qr_suite.utils.bulk_operations import run_bulk_operation
+
+
+class TestBulkOperations(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.todo = frappe.get_doc({"doctype": "ToDo", "description": "QR bulk operation test"}).insert()
+        self.links = [self.new_link(action) for action in ("view", "edit")]
+        self.mapping_files = []
+        frappe.db.commit()
+
+    def tearDown(self):
+        for file_url in self.mapping_files:
+            frappe.delete_doc("File", frappe.db.get_value("File", {"file_url": file_url}), force=True)
+        frappe.db.delete("QR Link", {"target_doctype": "ToDo", "target_name": self.todo.name})
+        self.todo.delete()
+        frappe.db.commit()
+
+    def new_link(self, action):
+        qr_link = frappe.new_doc("QR Link")
+        qr_link.update({
+            "qr_type": "Document QR",
+            "target_doctype": "ToDo",
+            "target_name": self.todo.name,
+            "action": action,
+            "url_mode": "token",
+            "expires_on": add_days(now_datetime(), 30)
+        })
+        qr_link.flags.idempotent = True
+        return qr_link.insert(ignore_permissions=True)
+
+    def run(self, operation):
+        summary = run_bulk_operation(operation, {"target_doctype": "ToDo", "target_name": self.todo.name})
+        if summary.get("mapping_file"):
+            self.mapping_files.append(summary["mapping_file"])
+        return summary
+
+    def read_mapping(self, file_url):
+        file_doc = frappe.get_doc("File", {"file_url": file_url})
+        return list(csv.DictReader(io.StringIO(file_doc.get_content().decode())))
+
+    def active_links(self):
+        return frappe.get_all("QR Link",
+            filters={"target_doctype": "ToDo", "target_name": self.todo.name, "status": "Active"},
+            fields=["name", "token", "action", "expires_on", "idempotency_key"]
+        )
+
+    def test_revoke(self):
+        summary = self.run("Revoke")
+
+        self.assertEqual(summary["processed"], 2)
+        self.assertEqual(self.active_links(), [])
+        for link in self.links:
+            self.assertFalse(frappe.db.get_value("QR Link", link.name, "idempotency_key"))
+
+    def test_reissue_makes_new_links_without_the_old_expiry(self):
+        summary = self.run("Reissue")
+
+        reissued = {link.action: link for link in self.active_links()}
+        self.assertEqual(summary["processed"], 2)
+        self.assertEqual(set(reissued), {"view", "edit"})
+        for old in self.links:
+            new = reissued[old.action]
+            self.assertEqual(frappe.db.get_value("QR Link", old.name, "status"), "Revoked")
+            self.assertNotEqual(new.name, old.name)
+            self.assertNotEqual(new.token, old.token)
+            self.assertIsNone(new.expires_on)
+            self.assertEqual(new.idempotency_key, old.idempotency_key)
+
+        mapping = self.read_mapping(summary["mapping_file"])
+        self.assertEqual({row["old_qr_link"] for row in mapping}, {link.name for link in self.links})
+        self.assertEqual({row["new_qr_link"] for row in mapping}, {link.name for link in reissued.values()})
+
+    def test_rotate_tokens_keeps_names(self):
+        summary = self.run("Rotate Tokens")
+
+        rotated = {link.name: link for link in self.active_links()}
+        self.assertEqual(set(rotated), {link.name for link in self.links})
+        for old in self.links:
+            self.assertNotEqual(rotated[old.name].token, old.token)
+            self.assertIn(rotated[old.name].token, frappe.db.get_value("QR Link", old.name, "qr_url"))
+
+        mapping = self.read_mapping(summary["mapping_file"])
+        self.assertEqual({(row["old_token"], row["new_token"]) for row in mapping},
+            {(old.token, rotated[old.name].token) for old in self.links})
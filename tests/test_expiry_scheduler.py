@@ -0,0 +1,64 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_to_date, now_datetime
+
+from qr_suite.utils.expiry_scheduler import _key, process_due_expiries, rebuild_expiry_schedule
+
+
+class TestExpiryScheduler(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.links = []
+
+    def tearDown(self):
+        for name in self.links:
+            frappe.delete_doc("QR Link", name, force=True, ignore_permissions=True)
+        frappe.db.commit()
+
+    def new_link(self, expires_on):
+        qr_link = frappe.get_doc({
+            "doctype": "QR Link",
+            "qr_type": "Value QR",
+            "target_doctype": "User",
+            "target_name": "Administrator",
+            "qr_content": "expiry test",
+            "expires_on": expires_on
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+        self.links.append(qr_link.name)
+        return qr_link.name
+
+    def scheduled(self, name):
+        return frappe.cache().zscore(_key(), name)
+
+    def status(self, name):
+        return frappe.db.get_value("QR Link", name, "status")
+
+    def test_active_link_is_scheduled_and_revoked_link_is_not(self):
+        name = self.new_link(add_days(now_datetime(), 1))
+        self.assertIsNotNone(self.scheduled(name))
+
+        frappe.get_doc("QR Link", name).revoke()
+        self.assertIsNone(self.scheduled(name))
+
+    def test_due_link_is_expired_and_unscheduled(self):
+        due = self.new_link(add_to_date(now_datetime(), seconds=-5))
+        later = self.new_link(add_days(now_datetime(), 1))
+
+        process_due_expiries()
+
+        self.assertEqual(self.status(due), "Expired")
+        self.assertIsNone(self.scheduled(due))
+        self.assertEqual(self.status(later), "Active")
+        self.assertIsNotNone(self.scheduled(later))
+
+    def test_rebuild_restores_a_flushed_schedule(self):
+        due = self.new_link(add_to_date(now_datetime(), seconds=-5))
+        later = self.new_link(add_days(now_datetime(), 1))
+        frappe.cache().delete(_key())
+
+        rebuild_expiry_schedule()
+
+        self.assertEqual(self.status(due), "Expired")
+        self.assertIsNone(self.scheduled(due))
+        self.assertIsNotNone(self.scheduled(later))
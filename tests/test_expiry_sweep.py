@@ -0,0 +1,57 @@
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, add_to_date, now_datetime
+
+from qr_suite.tasks import cleanup_expired_qr_codes
+
+
+class TestExpirySweep(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.links = []
+
+    def tearDown(self):
+        for name in self.links:
+            frappe.delete_doc("QR Link", name, force=True, ignore_permissions=True)
+        frappe.db.commit()
+
+    def new_link(self, expires_on):
+        qr_link = frappe.get_doc({
+            "doctype": "QR Link",
+            "qr_type": "Value QR",
+            "target_doctype": "User",
+            "target_name": "Administrator",
+            "qr_content": "expiry sweep test",
+            "expires_on": expires_on
+        }).insert(ignore_permissions=True)
+        self.links.append(qr_link.name)
+        return qr_link.name
+
+    def status(self, name):
+        return frappe.db.get_value("QR Link", name, "status")
+
+    def test_sweep_expires_only_due_links(self):
+        due = self.new_link(add_to_date(now_datetime(), seconds=-5))
+        later = self.new_link(add_days(now_datetime(), 1))
+        frappe.db.commit()
+
+        metrics = cleanup_expired_qr_codes()
+
+        self.assertEqual(self.status(due), "Expired")
+        self.assertFalse(frappe.db.get_value("QR Link", due, "idempotency_key"))
+        self.assertEqual(self.status(later), "Active")
+        self.assertGreaterEqual(metrics["expired"], 1)
+
+    def test_sweep_runs_in_chunks(self):
+        past = add_to_date(now_datetime(), seconds=-5)
+        for _i in range(3):
+            self.new_link(past)
+        frappe.db.commit()
+
+        with patch("qr_suite.tasks.EXPIRY_CHUNK_SIZE", 2):
+            metrics = cleanup_expired_qr_codes()
+
+        self.assertGreaterEqual(metrics["chunks"], 2)
+        self.assertEqual({self.status(name) for name in self.links}, {"Expired"})
@@ -0,0 +1,49 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from qr_suite.utils.hyperloglog import (
+    count_unique,
+    day_key,
+    get_link_unique_counts,
+    link_key,
+    record_unique_scan,
+)
+
+QR_LINK = "QRL-TEST-HLL"
+
+# Redis HyperLogLog standard error is 0.81%; allow about three of them
+TOLERANCE = 0.025
+
+
+class TestHyperLogLog(FrappeTestCase):
+    def setUp(self):
+        self.keys = [link_key(QR_LINK, kind) for kind in ("users", "ips")]
+        self.keys += [day_key("2026-03-01", "ToDo", "view", kind) for kind in ("users", "ips")]
+        self.clear()
+
+    def tearDown(self):
+        self.clear()
+
+    def clear(self):
+        frappe.cache().delete(*self.keys)
+
+    def record(self, user, ip):
+        record_unique_scan(QR_LINK, "ToDo", "view", user, ip, when="2026-03-01 08:00:00")
+
+    def test_repeat_scans_are_counted_once(self):
+        for _repeat in range(3):
+            for i in range(2000):
+                self.record(f"user-{i % 500}@example.com", f"10.0.{i // 256}.{i % 256}")
+
+        counts = get_link_unique_counts(QR_LINK)
+        self.assertAlmostEqual(counts["unique_users"], 500, delta=500 * TOLERANCE)
+        self.assertAlmostEqual(counts["unique_ips"], 2000, delta=2000 * TOLERANCE)
+        self.assertEqual(count_unique([day_key("2026-03-01", "ToDo", "view", "users")]), counts["unique_users"])
+
+    def test_missing_values_are_skipped(self):
+        self.record(None, "10.0.0.1")
+
+        self.assertEqual(get_link_unique_counts(QR_LINK), {"unique_users": 0, "unique_ips": 1})
+
+    def test_count_unique_of_no_keys(self):
+        self.assertEqual(count_unique([]), 0)
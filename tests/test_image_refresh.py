@@ -0,0 +1,91 @@
+import time
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from qr_suite.utils.image_refresh import (
+    ATTEMPTS_KEY,
+    DEBOUNCE_SECONDS,
+    MAX_ATTEMPTS,
+    RETRY_SECONDS,
+    SEPARATOR,
+    _key,
+    _reschedule_failed,
+    on_document_update,
+    process_image_refreshes,
+    schedule_refresh,
+)
+
+
+class TestImageRefresh(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.todo = frappe.get_doc({"doctype": "ToDo", "description": "QR image refresh test"}).insert()
+        frappe.db.commit()
+        self.member = f"ToDo{SEPARATOR}{self.todo.name}"
+        self.clear()
+
+    def tearDown(self):
+        self.todo.delete()
+        frappe.db.commit()
+        self.clear()
+
+    def clear(self):
+        frappe.cache().zrem(_key(), self.member)
+        frappe.cache().pipeline().hdel(frappe.cache().make_key(ATTEMPTS_KEY), self.member).execute()
+
+    def due_at(self):
+        return frappe.cache().zscore(_key(), self.member)
+
+    def test_refresh_is_scheduled_on_commit_and_dropped_on_rollback(self):
+        schedule_refresh("ToDo", self.todo.name)
+        frappe.db.rollback()
+        self.assertIsNone(self.due_at())
+
+        schedule_refresh("ToDo", self.todo.name)
+        frappe.db.commit()
+        self.assertAlmostEqual(self.due_at(), time.time() + DEBOUNCE_SECONDS, delta=5)
+
+    def test_repeated_edits_push_the_redraw_back(self):
+        schedule_refresh("ToDo", self.todo.name)
+        frappe.db.commit()
+        first = self.due_at()
+
+        time.sleep(1)
+        schedule_refresh("ToDo", self.todo.name)
+        frappe.db.commit()
+        self.assertGreater(self.due_at(), first)
+
+    def test_saves_during_migrate_are_ignored(self):
+        frappe.flags.in_migrate = True
+        try:
+            self.todo.description = "changed during migrate"
+            on_document_update(self.todo)
+        finally:
+            frappe.flags.in_migrate = False
+        frappe.db.commit()
+
+        self.assertIsNone(self.due_at())
+
+    def test_saves_of_doctypes_not_enabled_are_ignored(self):
+        self.todo.description = "changed"
+        on_document_update(self.todo)
+        frappe.db.commit()
+
+        self.assertIsNone(self.due_at())
+
+    def test_due_redraws_are_taken_off_the_schedule(self):
+        frappe.cache().zadd(_key(), {self.member: time.time() - 1})
+
+        process_image_refreshes()
+
+        self.assertIsNone(self.due_at())
+
+    def test_failed_redraws_are_retried_then_dropped(self):
+        for _attempt in range(MAX_ATTEMPTS - 1):
+            _reschedule_failed([self.member])
+            self.assertAlmostEqual(self.due_at(), time.time() + RETRY_SECONDS, delta=5)
+            frappe.cache().zrem(_key(), self.member)
+
+        _reschedule_failed([self.member])
+        self.assertIsNone(self.due_at())
@@ -0,0 +1,35 @@
+# Copyright (c) 2026, Brighton and Contributors
+# See license.txt
+
+import numpy as np
+from frappe.tests.utils import FrappeTestCase
+
+from qr_suite.utils.qr_matrix import matrix_version, pack_matrix, render_image, unpack_matrix
+from qr_suite.utils.qr_segments import encode
+
+
+class TestQRMatrix(FrappeTestCase):
+    def test_pack_unpack_round_trip(self):
+        rng = np.random.default_rng(49)
+        for version in (1, 2, 10, 27, 40):
+            n = 17 + 4 * version
+            matrix = rng.random((n, n)) < 0.5
+            packed = pack_matrix(matrix)
+            self.assertEqual(len(packed), 1 + -(-n * n // 8))
+            unpacked = unpack_matrix(packed)
+            self.assertEqual(unpacked.dtype, bool)
+            self.assertTrue(np.array_equal(unpacked, matrix))
+            self.assertEqual(matrix_version(unpacked), version)
+
+    def test_encoded_matrix_round_trip(self):
+        qr = encode("https://erp.example.com/qr?token=abc", border=0)
+        matrix = np.array(qr.get_matrix(), dtype=bool)
+        self.assertTrue(np.array_equal(unpack_matrix(pack_matrix(matrix)), matrix))
+        self.assertEqual(matrix_version(matrix), qr.version)
+
+    def test_render_matches_qrcode(self):
+        qr = encode("SN-00042", box_size=5, border=4)
+        expected = np.array(qr.make_image().convert("L"))
+        matrix = np.array(encode("SN-00042", border=0).get_matrix(), dtype=bool)
+        rendered = np.array(render_image(matrix, 5, border=4).convert("L"))
+        self.assertTrue(np.array_equal(rendered, expected))
@@ -0,0 +1,112 @@
+# Copyright (c) 2026, Brighton and Contributors
+# See license.txt
+
+import random
+
+import qrcode
+from frappe.tests.utils import FrappeTestCase
+from qrcode import base, util
+
+from qr_suite.utils.qr_segments import byte_mode_version, encode, optimal_segments, uppercase_url_host
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+ERROR_LEVELS = (
+    qrcode.constants.ERROR_CORRECT_L,
+    qrcode.constants.ERROR_CORRECT_M,
+    qrcode.constants.ERROR_CORRECT_Q,
+    qrcode.constants.ERROR_CORRECT_H,
+)
+
+SAMPLES = [
+    "0123456789012345",
+    "SN-00042-ALPHA",
+    "https://erp.example.com/qr?token=Zx3_k9-QwErTyUiOp1234567890abcdefGHIJ",
+    "HTTPS://ERP.EXAMPLE.COM/QR?TOKEN=ABCDEFGHIJ234567ABCDEFGHIJ234567",
+    "Item 12345 / Lot 2026-10-19 / ชิ้นส่วน",
+    "a",
+    "",
+]
+
+
+def decode_data(qr):
+    """Text encoded in qr's data codewords, read back from the mode / count / payload bit stream"""
+    codewords = util.create_data(qr.version, qr.error_correction, qr.data_list)
+    blocks = [[] for _ in base.rs_blocks(qr.version, qr.error_correction)]
+    counts = [block.data_count for block in base.rs_blocks(qr.version, qr.error_correction)]
+    position = 0
+    # Data codewords are interleaved across blocks; the EC codewords follow
+    for i in range(max(counts)):
+        for b, count in enumerate(counts):
+            if i < count:
+                blocks[b].append(codewords[position])
+                position += 1
+    bits = "".join(f"{byte:08b}" for block in blocks for byte in block)
+
+    out = bytearray()
+    i = 0
+
+    def read(n):
+        nonlocal i
+        value = int(bits[i:i + n], 2)
+        i += n
+        return value
+
+    while i + 4 <= len(bits):
+        mode = read(4)
+        if mode == 0:
+            break
+        count = read(util.length_in_bits(mode, qr.version))
+        if mode == util.MODE_NUMBER:
+            digits = ""
+            for _ in range(count // 3):
+                digits += f"{read(10):03d}"
+            if count % 3:
+                digits += f"{read((4, 7)[count % 3 - 1]):0{count % 3}d}"
+            out += digits.encode()
+        elif mode == util.MODE_ALPHA_NUM:
+            for _ in range(count // 2):
+                pair = read(11)
+                out += bytes([util.ALPHA_NUM[pair // 45], util.ALPHA_NUM[pair % 45]])
+            if count % 2:
+                out += bytes([util.ALPHA_NUM[read(6)]])
+        else:
+            out += bytes(read(8) for _ in range(count))
+    return out.decode("utf-8")
+
+
+class TestQRSegments(FrappeTestCase):
+    def test_encoded_data_decodes_to_content(self):
+        for content in SAMPLES:
+            for error_level in ERROR_LEVELS:
+                qr = encode(content, error_level)
+                self.assertEqual(decode_data(qr), content)
+
+    def test_uppercase_host_keeps_the_url(self):
+        url = "https://erp.example.com/app/item/Item-0001?x=a"
+        qr = encode(url, uppercase_host=True)
+        self.assertEqual(decode_data(qr), "HTTPS://ERP.EXAMPLE.COM/app/item/Item-0001?x=a")
+        self.assertEqual(uppercase_url_host("SN-0001"), "SN-0001")
+
+    def test_never_larger_than_byte_mode(self):
+        rng = random.Random(47)
+        alphabet = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:abcdefghijklmnopqrstuvwxyz_?=&é"
+        for _ in range(300):
+            content = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 400)))
+            for error_level in ERROR_LEVELS:
+                version, _segments = optimal_segments(content, error_level)
+                self.assertLessEqual(version, byte_mode_version(content, error_level)[0], content)
+
+    def test_symbol_decodes_with_opencv(self):
+        if cv2 is None:
+            self.skipTest("opencv is not installed")
+        for content in SAMPLES:
+            if not content:
+                continue
+            image = np.array(encode(content, box_size=8).make_image().convert("L"))
+            decoded, _points, _straight = cv2.QRCodeDetector().detectAndDecode(image)
+            self.assertEqual(decoded, content)
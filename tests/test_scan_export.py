@@ -0,0 +1,56 @@
+import csv
+import gzip
+import io
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from qr_suite.utils.scan_export import EXPORT_COLUMNS, export_scan_logs
+
+
+class TestScanExport(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.qr_link = frappe.get_doc({
+            "doctype": "QR Link",
+            "qr_type": "Value QR",
+            "target_doctype": "User",
+            "target_name": "Administrator",
+            "qr_content": "export test"
+        }).insert(ignore_permissions=True)
+        for hour in (9, 10, 11):
+            frappe.get_doc({
+                "doctype": "QR Scan Log",
+                "qr_link": self.qr_link.name,
+                "scan_timestamp": f"2026-02-03 {hour:02d}:00:00",
+                "scanned_by": "Administrator"
+            }).insert(ignore_permissions=True)
+        self.files = []
+
+    def tearDown(self):
+        for file_url in self.files:
+            frappe.delete_doc("File", frappe.db.get_value("File", {"file_url": file_url}), force=True)
+        frappe.db.delete("QR Scan Log", {"qr_link": self.qr_link.name})
+        frappe.db.delete("QR Link", self.qr_link.name)
+        frappe.db.commit()
+
+    def export(self, **kwargs):
+        file_url = export_scan_logs("2026-02-03", "2026-02-03", qr_link=self.qr_link.name, **kwargs)
+        self.files.append(file_url)
+        with open(frappe.get_site_path(file_url.lstrip("/")), "rb") as f:
+            return f.read()
+
+    def test_csv_export_writes_private_file(self):
+        rows = list(csv.reader(io.StringIO(self.export().decode())))
+
+        self.assertEqual(rows[0], EXPORT_COLUMNS)
+        self.assertEqual([row[2] for row in rows[1:]],
+            ["2026-02-03 09:00:00", "2026-02-03 10:00:00", "2026-02-03 11:00:00"])
+        self.assertTrue(frappe.db.get_value("File", {"file_url": self.files[0]}, "is_private"))
+
+    def test_gzipped_jsonl_export(self):
+        lines = gzip.decompress(self.export(fmt="jsonl", compress=True)).decode().splitlines()
+
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])["qr_link"], self.qr_link.name)
@@ -0,0 +1,87 @@
+import base64
+import gzip
+import json
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_days, now_datetime
+
+from qr_suite.utils.scan_ingest import ingest_scans, next_log_ids
+
+EVENT_PREFIX = "qr-ingest-test-"
+
+
+class TestScanIngest(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.qr_link = frappe.get_doc({
+            "doctype": "QR Link",
+            "qr_type": "Document QR",
+            "target_doctype": "User",
+            "target_name": "Administrator",
+            "action": "view",
+            "url_mode": "token"
+        }).insert(ignore_permissions=True)
+        frappe.db.commit()
+
+    def tearDown(self):
+        frappe.db.delete("QR Scan Log", {"qr_link": self.qr_link.name})
+        frappe.db.delete("QR Link", self.qr_link.name)
+        frappe.db.commit()
+
+    def scan(self, event, **kwargs):
+        return {
+            "event_id": f"{EVENT_PREFIX}{event}",
+            "token": self.qr_link.token,
+            "timestamp": "2026-04-01T08:30:00Z",
+            "user": "Administrator",
+            "device": "test-device",
+            **kwargs
+        }
+
+    def statuses(self, result):
+        return [r["status"] for r in result["results"]]
+
+    def test_next_log_ids_come_from_the_sequence(self):
+        first = next_log_ids(3)
+        second = next_log_ids(2)
+
+        self.assertEqual(len(set(first)), 3)
+        self.assertEqual(first, sorted(first))
+        self.assertGreater(min(second), max(first))
+        name = frappe.get_doc({
+            "doctype": "QR Scan Log",
+            "qr_link": self.qr_link.name,
+            "scanned_by": "Administrator"
+        }).insert(ignore_permissions=True).name
+        self.assertGreater(name, max(second))
+
+    def test_batch_is_recorded_once(self):
+        batch = [self.scan(1), self.scan(2), self.scan(2)]
+
+        result = ingest_scans(batch)
+        again = ingest_scans(batch)
+
+        self.assertEqual(self.statuses(result), ["accepted", "accepted", "duplicate"])
+        self.assertEqual(self.statuses(again), ["duplicate"] * 3)
+        logs = frappe.get_all("QR Scan Log", filters={"qr_link": self.qr_link.name},
+            fields=["name", "scan_timestamp"])
+        self.assertEqual(len(logs), 2)
+        self.assertTrue(all(isinstance(log.name, int) for log in logs))
+        self.assertEqual(frappe.db.get_value("QR Link", self.qr_link.name, "scan_count"), 2)
+
+    def test_invalid_records_are_rejected(self):
+        future = add_days(now_datetime(), 1).isoformat()
+        batch = [
+            self.scan(1, timestamp=None),
+            self.scan(2, timestamp=future),
+            self.scan(3, token="no-such-token"),
+            self.scan(4, event_id=None)
+        ]
+
+        self.assertEqual(self.statuses(ingest_scans(batch)), ["invalid", "invalid", "unknown_token", "invalid"])
+
+    def test_compressed_batch(self):
+        payload = base64.b64encode(gzip.compress(json.dumps([self.scan(1)]).encode())).decode()
+
+        self.assertEqual(self.statuses(ingest_scans(payload)), ["accepted"])
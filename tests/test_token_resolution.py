@@ -0,0 +1,68 @@
+import frappe
+from frappe.tests.utils import FrappeTestCase
+from frappe.utils import add_to_date, now_datetime
+
+from qr_suite.api import resolve_tokens
+from qr_suite.utils.resolution_cache import get_resolutions, invalidate_tokens
+
+
+class TestTokenResolution(FrappeTestCase):
+    def setUp(self):
+        frappe.set_user("Administrator")
+        self.links = [self.new_link(action) for action in ("view", "edit", "print")]
+        self.tokens = [link.token for link in self.links]
+        frappe.db.commit()
+        invalidate_tokens(self.tokens)
+
+    def tearDown(self):
+        invalidate_tokens(self.tokens)
+        frappe.db.delete("QR Link", {"name": ["in", [link.name for link in self.links]]})
+        frappe.db.commit()
+
+    def new_link(self, action):
+        return frappe.get_doc({
+            "doctype": "QR Link",
+            "qr_type": "Document QR",
+            "target_doctype": "User",
+            "target_name": "Administrator",
+            "action": action,
+            "url_mode": "token"
+        }).insert(ignore_permissions=True)
+
+    def states(self, tokens):
+        return [result["state"] for result in resolve_tokens(tokens)]
+
+    def test_results_follow_input_order(self):
+        tokens = [self.tokens[1], "no-such-token", self.tokens[0]]
+
+        results = resolve_tokens(tokens)
+
+        self.assertEqual([r["token"] for r in results], tokens)
+        self.assertEqual([r["state"] for r in results], ["valid", "not_found", "valid"])
+        self.assertEqual(results[0]["qr_link"], self.links[1].name)
+        self.assertEqual(results[0]["action"], "edit")
+
+    def test_cached_and_uncached_resolutions_agree(self):
+        uncached = get_resolutions(self.tokens)
+        cached = get_resolutions(self.tokens)
+
+        self.assertEqual(uncached, cached)
+        self.assertEqual({token: link.name for token, link in cached.items()},
+            {link.token: link.name for link in self.links})
+
+    def test_status_changes_reach_cached_resolutions(self):
+        self.assertEqual(self.states(self.tokens), ["valid"] * 3)
+
+        self.links[0].revoke()
+        self.links[1].db_set("expires_on", add_to_date(now_datetime(), seconds=-5))
+        invalidate_tokens([self.tokens[1]])
+        frappe.db.commit()
+
+        self.assertEqual(self.states(self.tokens), ["revoked", "expired", "valid"])
+
+    def test_guest_cannot_resolve(self):
+        frappe.set_user("Guest")
+        try:
+            self.assertRaises(frappe.PermissionError, resolve_tokens, self.tokens)
+        finally:
+            frappe.set_user("Administrator")
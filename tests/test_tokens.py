@@ -0,0 +1,39 @@
+# Copyright (c) 2026, Brighton and Contributors
+# See license.txt
+
+from frappe.tests.utils import FrappeTestCase
+
+from qr_suite.utils.tokens import (
+    ALPHABETS,
+    DEFAULT_ALPHABET,
+    DEFAULT_LENGTH,
+    MAX_TOKEN_LENGTH,
+    MIN_TOKEN_BITS,
+    make_token,
+    min_token_length,
+)
+
+
+class TestTokens(FrappeTestCase):
+    def test_min_token_length(self):
+        # 6 bits per Base64 character, 5 per Base32 character
+        self.assertEqual(min_token_length("URL-safe Base64"), 11)
+        self.assertEqual(min_token_length("Base32 (Uppercase)"), 13)
+
+    def test_min_length_keeps_min_bits(self):
+        for name, alphabet in ALPHABETS.items():
+            length = min_token_length(name)
+            bits_per_char = len(alphabet).bit_length() - 1
+            self.assertGreaterEqual(length * bits_per_char, MIN_TOKEN_BITS)
+            self.assertLess((length - 1) * bits_per_char, MIN_TOKEN_BITS)
+            self.assertLessEqual(length, MAX_TOKEN_LENGTH)
+
+    def test_default_format_is_valid(self):
+        self.assertGreaterEqual(DEFAULT_LENGTH, min_token_length(DEFAULT_ALPHABET))
+        self.assertLessEqual(DEFAULT_LENGTH, MAX_TOKEN_LENGTH)
+
+    def test_make_token(self):
+        for alphabet in ALPHABETS.values():
+            token = make_token(alphabet, 20)
+            self.assertEqual(len(token), 20)
+            self.assertTrue(set(token) <= set(alphabet))